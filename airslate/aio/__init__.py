@@ -0,0 +1,25 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""The top-level module for the asynchronous airSlate API client.
+
+This package provides :class:`airslate.aio.client.AsyncClient` built on top
+of the ``httpx`` library, which has to be installed separately:
+
+.. code-block:: console
+
+   $ pip install airslate[async]
+
+"""
+
+try:
+    import httpx  # noqa: F401 pylint: disable=unused-import
+except ImportError as import_exc:  # pragma: no cover
+    raise ImportError(
+        'The airslate.aio package requires httpx to be installed. '
+        'Install it using: pip install airslate[async]'
+    ) from import_exc
@@ -0,0 +1,206 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Asynchronous client module for airslate package."""
+
+import asyncio
+import warnings
+
+import httpx
+from urllib3.exceptions import MaxRetryError
+
+from . import sessions
+from .. import exceptions
+from ..client import BaseClient
+from ..concurrency import AsyncSingleFlight
+from ..ratelimit import pacing
+from ..resources.organizations import AsyncOrganizations
+
+
+class AsyncClient(BaseClient):
+    """Asynchronous airSlate API client class.
+
+    Accepts the same options as :class:`airslate.client.Client`, except for
+    the response cache and background calls ones, see
+    :attr:`IGNORED_OPTIONS`. All the requests are sent through one shared
+    connection pool, so a single :class:`AsyncClient` may serve any number
+    of concurrent tasks.
+    """
+
+    # Options of the synchronous client which have no effect
+    IGNORED_OPTIONS = frozenset((
+        'cache_maxsize', 'cache_ttl', 'cache_dir', 'background_workers',
+    ))
+
+    def __init__(self, session=None, auth=None, **options):
+        """An :class:`AsyncClient` object for interacting with airSlate's
+        API."""
+        ignored = sorted(name for name in self.IGNORED_OPTIONS & set(options)
+                         if options[name] != self.DEFAULT_OPTIONS[name])
+        if ignored:
+            warnings.warn(
+                f"AsyncClient ignores the options: {', '.join(ignored)}",
+                stacklevel=2)
+
+        super().__init__(auth, **options)
+
+        self.session = session or sessions.AsyncRetrySession(
+            **self._session_options())
+
+        self.single_flight = AsyncSingleFlight()
+
+        # Initialize each resource facade and injecting client object into it
+        self.organizations = AsyncOrganizations(
+            self, api_version=self.options['version'])
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying session and release pooled connections."""
+        if self.hedging is not None:
+            self.hedging.shutdown()
+        await self.session.aclose()
+
+    async def request(self, method: str, path: str,
+                      **options) -> httpx.Response:
+        """Dispatches a request to the airSlate API."""
+        # Waiting for the rate limiter is not a slow call of the host
+        if self.rate_limiter is not None:
+            await asyncio.sleep(self.rate_limiter.reserve())
+
+        return await self._request(method, path, options)
+
+    async def _request(self, method: str, path: str,
+                       options: dict) -> httpx.Response:
+        """Dispatches a request which has waited for the rate limiter."""
+        if self.circuit_breakers is None:
+            return await self._send(method, path, options)
+
+        breaker = self.circuit_breakers.get(self._resolve_url(options, path))
+        return await breaker.call_async(self._send, method, path, options)
+
+    async def _send(self, method: str, path: str,
+                    options: dict) -> httpx.Response:
+        """Prepares a request and sends it, tracing it if the hooks have
+        subscribers."""
+        url = self._resolve_url(options, path)
+
+        # Select and formats options to be passed to the request
+        request_options = self._parse_request_options(options)
+        stream = request_options.pop('stream', False)
+
+        # TLS verification is a property of the connection pool in httpx,
+        # use AsyncRetrySession(verify=...) to configure it.
+        request_options.pop('verify', None)
+
+        if 'data' in request_options:
+            request_options['content'] = request_options.pop('data')
+
+        if not options.get('keep_alive', self._compile().keep_alive):
+            request_options['headers']['Connection'] = 'close'
+
+        send_options = {'stream': stream}
+        if self.auth is not None:
+            send_options['auth'] = self.auth
+
+        trace = self._start_trace(method, url, path,
+                                  request_options.get('content'))
+        if trace is None:
+            return await self._dispatch(
+                method, url, request_options, send_options)
+
+        request_options['extensions'] = {'trace': trace.on_httpcore}
+        with trace.sending():
+            response = await self._dispatch(
+                method, url, request_options, send_options)
+
+        trace.finish(response, stream)
+        return response
+
+    async def _dispatch(self, method: str, url: str, request_options: dict,
+                        send_options: dict) -> httpx.Response:
+        """Sends a prepared request mapping the errors to API errors."""
+        stream = send_options['stream']
+        try:
+            request = self.session.build_request(
+                method.upper(), url, **request_options)
+            with pacing(self.rate_limiter):
+                response = await self.session.send(request, **send_options)
+
+            # Error details are read from the response body
+            if stream and response.status_code >= 400:
+                await response.aread()
+
+            self._raise_for_status(response)
+
+            return response
+        except MaxRetryError as retry_exc:
+            raise exceptions.RetryApiError(
+                message=self._retry_error_message(retry_exc),
+                status=503,
+            ) from retry_exc
+        except (httpx.ConnectError, httpx.ConnectTimeout) as conn_exc:
+            raise exceptions.InternalServerError(
+                message=self.CONNECTION_ERROR_MESSAGE,
+            ) from conn_exc
+        except httpx.HTTPError as http_exc:
+            raise exceptions.InternalServerError() from http_exc
+
+    async def post(self, path, data, **options) -> httpx.Response:
+        """Parses POST request options and dispatches a request."""
+        return await self._create('post', path, data, **options)
+
+    async def patch(self, path, data, **options) -> httpx.Response:
+        """Parses PATCH request options and dispatches a request."""
+        return await self._create('patch', path, data, **options)
+
+    async def _create(self, method, path, data, **options) -> httpx.Response:
+        """Internal helper to send POST/PUT/PATCH requests."""
+        return await self.request(method, path,
+                                  **self._create_options(data, options))
+
+    async def get(self, path, query=None, **options) -> httpx.Response:
+        """Parses GET request options and dispatches a request."""
+        options = self._get_options(query, options)
+
+        if (not options.get('stream') and
+                options.get('coalesce', self.options['coalesce'])):
+            key = self._request_key('get', path, options)
+            return await self.single_flight.do(
+                key, self._fetch, path, options)
+
+        return await self._fetch(path, options)
+
+    async def _fetch(self, path, options: dict) -> httpx.Response:
+        """Dispatches a GET request hedging it if it is enabled."""
+        if not self._hedges(options):
+            return await self.request('get', path, **options)
+
+        paced = self._hedge_pacing()
+        if paced():
+            await asyncio.sleep(self.rate_limiter.reserve())
+
+        async def send():
+            if paced():
+                await asyncio.sleep(self.rate_limiter.reserve())
+            return await self._request('get', path, dict(options))
+
+        return await self.hedging.call_async(self._endpoint(path), send)
+
+    @classmethod
+    def jwt_session(cls, client_id, user_id, key, **kwargs):
+        """Create an airSlate AsyncClient instance with OAuth credentials.
+
+        Constructs an airSlate AsyncClient with OAuth Grant Type JWT Bearer
+        Flow using ``client_id``, ``user_id`` and ``key``. The access token is
+        requested on the first API call.
+        """
+        return cls(sessions.AsyncJWTSession(client_id, user_id, key, **kwargs))
@@ -0,0 +1,259 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Asynchronous session module for airslate package."""
+
+import asyncio
+import time
+
+import httpx
+from requests.adapters import DEFAULT_POOLSIZE
+from urllib3.exceptions import InvalidHeader, MaxRetryError
+
+from ..exceptions import ApiError
+from ..ratelimit import current_rate_limiter, observe_retried
+from ..sessions import JWTMixin, RetryBudgetExhausted, RetryMixin
+
+# Transport errors raised before the request has been sent
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Transport which applies the :class:`RetryMixin` retry policy.
+
+    The :class:`urllib3.util.retry.Retry` object created by
+    :meth:`RetryMixin.create_retry` drives the retries, so the asynchronous
+    sessions retry exactly the same statuses and methods, with the same
+    backoff and ``Retry-After`` handling, as the synchronous ones.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, retry):
+        """Initialize a new :class:`AsyncRetryTransport` object.
+
+        :param transport: The transport used to send the requests.
+        :param retry: The retry policy to apply.
+        """
+        self.transport = transport
+        self.retry = retry
+
+    async def handle_async_request(self, request):
+        """Send a request retrying it according to the retry policy."""
+        retry = self.retry
+        method = request.method
+        url = str(request.url)
+
+        budget = getattr(retry, 'budget', None)
+        if budget is not None:
+            budget.deposit()
+
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as exc:
+                retry = self.increment_error(retry, method, url, exc)
+                await asyncio.sleep(retry.get_backoff_time())
+                await self.pace()
+                continue
+
+            has_retry_after = 'Retry-After' in response.headers
+            if not retry.is_retry(method, response.status_code,
+                                  has_retry_after):
+                return response
+
+            await response.aclose()
+
+            observe_retried(response.status_code, response.headers)
+
+            retry = retry.increment(method, url)
+            await asyncio.sleep(self.get_retry_delay(retry, response))
+            await self.pace()
+
+    @staticmethod
+    def increment_error(retry, method: str, url: str, exc: Exception):
+        """Get the retry policy of the next attempt after a transport error,
+        or raise the error if the request may not be retried."""
+        # The request may have reached the server unless it failed to
+        # connect, retry it only if its method is idempotent.
+        if (not isinstance(exc, UNSENT_ERRORS) and
+                # pylint: disable=protected-access
+                not retry._is_method_retryable(method)):
+            raise exc
+
+        try:
+            return retry.increment(method, url, error=exc)
+        except MaxRetryError as retry_exc:
+            # Report an exhausted budget the way the synchronous sessions
+            # do, and the last error otherwise.
+            if isinstance(retry_exc.reason, RetryBudgetExhausted):
+                raise
+            raise exc  # pylint: disable=raise-missing-from
+
+    @staticmethod
+    async def pace():
+        """Wait for the rate limiter of the client if any."""
+        limiter = current_rate_limiter()
+        if limiter is not None:
+            await asyncio.sleep(limiter.reserve())
+
+    @staticmethod
+    def get_retry_delay(retry, response) -> float:
+        """Get the number of seconds to sleep before the next attempt."""
+        retry_after = response.headers.get('Retry-After')
+        if (retry_after is not None and retry.respect_retry_after_header and
+                response.status_code in retry.RETRY_AFTER_STATUS_CODES):
+            try:
+                return retry.parse_retry_after(retry_after)
+            except InvalidHeader:
+                pass
+
+        return retry.get_backoff_time()
+
+    async def aclose(self):
+        """Close the underlying transport."""
+        await self.transport.aclose()
+
+
+class AsyncRetryMixin(RetryMixin):  # pylint: disable=too-few-public-methods
+    """Implementation of the custom retry policy for async HTTP sessions."""
+
+    def create_transport(self, **kwargs) -> AsyncRetryTransport:
+        """Create HTTP transport with retry policy and connection pooling.
+
+        Accepts the same keyword arguments as
+        :meth:`RetryMixin.create_adapter`. The ``pool_connections`` and
+        ``pool_maxsize`` options bound the number of keep-alive connections
+        of the shared pool and ``pool_idle_timeout`` sets the keep-alive
+        expiry.
+
+        :keyword transport: The transport to send requests through.
+            Defaults to :class:`httpx.AsyncHTTPTransport`.
+        """
+        retry_strategy = self.create_retry(
+            kwargs.get('max_retries', 3),
+            kwargs.get('backoff_factor', 1.0),
+            kwargs.get('retry_budget'),
+        )
+
+        transport = kwargs.get('transport')
+        if transport is None:
+            pool_connections = kwargs.get('pool_connections', DEFAULT_POOLSIZE)
+            pool_maxsize = kwargs.get('pool_maxsize', DEFAULT_POOLSIZE)
+
+            limits = httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=pool_connections * pool_maxsize,
+                keepalive_expiry=kwargs.get('pool_idle_timeout'),
+            )
+            transport = httpx.AsyncHTTPTransport(
+                limits=limits,
+                verify=kwargs.get('verify', True),
+            )
+
+        return AsyncRetryTransport(transport, retry_strategy)
+
+
+class AsyncRetrySession(httpx.AsyncClient, AsyncRetryMixin):
+    """Implementation of the :class:`httpx.AsyncClient` with retry policy."""
+
+    def __init__(self, **kwargs):
+        """Initialize a new :class:`AsyncRetrySession` object with the
+        specified retry policy.
+
+        Accepts the same keyword arguments as
+        :meth:`AsyncRetryMixin.create_transport`.
+        """
+        super().__init__(
+            transport=self.create_transport(**kwargs),
+            headers=kwargs.get('headers'),
+        )
+
+
+class JWTBearerAuth(httpx.Auth):
+    """Authenticate requests with the access token of the JWT session."""
+
+    def __init__(self, session: 'AsyncJWTSession'):
+        """Initialize a new :class:`JWTBearerAuth` object."""
+        self.session = session
+
+    async def async_auth_flow(self, request):
+        """Add the ``Authorization`` header to the request."""
+        token = await self.session.ensure_token()
+        request.headers['Authorization'] = f"Bearer {token['access_token']}"
+        yield request
+
+
+class AsyncJWTSession(AsyncRetrySession, JWTMixin):
+    """Async session class to implement OAuth Grant Type JWT Bearer Flow.
+
+    Unlike :class:`airslate.sessions.JWTSession` the access token is not
+    requested on initialization, but on the first request, and it is renewed
+    once it expires.
+    """
+
+    # Renew access token this number of seconds before it expires.
+    TOKEN_LEEWAY = 30.0
+
+    def __init__(self, client_id: str, user_id: str, key: bytes, **kwargs):
+        super().__init__(**kwargs)
+        self.init_credentials(client_id, user_id, key, kwargs.get('scope'))
+
+        self.token = None
+        self.token_expires_at = None
+        self._token_lock = None
+
+        self.auth = JWTBearerAuth(self)
+
+    def update_token(self, token: dict):
+        """Update token storage."""
+        self.token = token
+        self.token_expires_at = None
+        if 'expires_in' in token:
+            self.token_expires_at = time.monotonic() + token['expires_in']
+
+    def token_expired(self) -> bool:
+        """Check whether the current access token has to be renewed."""
+        if self.token is None:
+            return True
+
+        if self.token_expires_at is None:
+            return False
+
+        return time.monotonic() >= self.token_expires_at - self.TOKEN_LEEWAY
+
+    async def ensure_token(self) -> dict:
+        """Return a valid access token, requesting a new one if needed.
+
+        Concurrent callers waiting for an expired token share one request.
+        """
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+
+        async with self._token_lock:
+            if self.token_expired():
+                self.update_token(await self.get_token())
+
+        return self.token
+
+    async def get_token(self) -> dict:
+        """Automatic token retrieve using OAuth Grant Type JWT Bearer Flow."""
+        try:
+            response = await self.post(
+                self.token_url,
+                auth=None,
+                **self.token_request(),
+            )
+            response.raise_for_status()
+            return response.json()
+        except MaxRetryError as retry_exc:
+            raise ApiError(
+                status=503,
+                message=str(retry_exc).lstrip('None: '),
+            ) from retry_exc
+        except httpx.HTTPStatusError as exc:
+            raise ApiError(response=exc.response) from exc
+        except httpx.HTTPError as exc:
+            raise ApiError(message=str(exc)) from exc
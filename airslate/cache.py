@@ -0,0 +1,340 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""HTTP response cache for airslate package.
+
+Cached responses are stored along with their ``ETag`` and ``Last-Modified``
+validators. A response younger than the cache TTL is served without a
+request, an older one is revalidated by a conditional request and served
+again if the API replies ``304 Not Modified``.
+
+Classes:
+- CacheEntry: A cached response.
+- CacheStats: Cache usage counters.
+- MemoryCache: In-memory LRU cache.
+- FileCache: On-disk cache.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+# Response headers stored along with the cached body
+STORED_HEADERS = (
+    'Cache-Control',
+    'Content-Type',
+    'Date',
+    'ETag',
+    'Expires',
+    'Last-Modified',
+)
+
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    """Create the cache key of a GET request.
+
+    >>> cache_key('https://api.airslate.io/v1/organizations',
+    ...           {'per_page': 2, 'page': 1})
+    'https://api.airslate.io/v1/organizations?page=1&per_page=2'
+    """
+    if not params:
+        return url
+
+    return url + '?' + urlencode(sorted(params.items()), doseq=True)
+
+
+@dataclass
+class CacheEntry:
+    """A cached response."""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_response(cls, response: Response) -> 'CacheEntry':
+        """Create a cache entry out of the response."""
+        headers = {name: response.headers[name] for name in STORED_HEADERS
+                   if name in response.headers}
+
+        return cls(
+            url=response.url,
+            status_code=response.status_code,
+            headers=headers,
+            content=response.content,
+            encoding=response.encoding,
+        )
+
+    def to_response(self) -> Response:
+        """Create a response out of the cache entry."""
+        response = Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response._content = self.content  # pylint: disable=protected-access
+
+        return response
+
+    def validators(self) -> Dict[str, str]:
+        """Get the headers of a conditional request revalidating the entry."""
+        headers = {}
+        if 'ETag' in self.headers:
+            headers['If-None-Match'] = self.headers['ETag']
+        if 'Last-Modified' in self.headers:
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+
+        return headers
+
+    def refresh(self, response: Response):
+        """Update the entry after a ``304 Not Modified`` response."""
+        for name in STORED_HEADERS:
+            if name in response.headers:
+                self.headers[name] = response.headers[name]
+
+        self.stored_at = time.time()
+
+
+@dataclass
+class CacheStats:
+    """Cache usage counters.
+
+    Responses served out of the cache, either fresh or revalidated, count as
+    hits, downloaded ones count as misses. Revalidations are the conditional
+    requests sent and evictions are the entries dropped to free space.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert the counters to a dictionary."""
+        return asdict(self)
+
+
+class BaseCache(ABC):
+    """Base class for response caches.
+
+    Entries are grouped by the URL without the query string, so that all the
+    entries of a path can be invalidated at once.
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        """Initialize a new cache.
+
+        :param ttl: The number of seconds a cached response is served without
+            revalidation.
+        """
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+
+    @abstractmethod
+    def get(self, url: str, key: str) -> Optional[CacheEntry]:
+        """Get a cached entry."""
+
+    @abstractmethod
+    def set(self, url: str, key: str, entry: CacheEntry):
+        """Store an entry."""
+
+    @abstractmethod
+    def invalidate(self, url: str):
+        """Drop all the entries of the URL."""
+
+    @abstractmethod
+    def clear(self):
+        """Drop all the entries."""
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether the entry may be served without revalidation."""
+        return time.time() - entry.stored_at < self.ttl
+
+    def is_cacheable(self, response: Response) -> bool:
+        """Check whether the response may be stored."""
+        if response.status_code != 200:
+            return False
+
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return False
+
+        # Without validators the entry would be useless once it is stale
+        return (self.ttl > 0 or 'ETag' in response.headers or
+                'Last-Modified' in response.headers)
+
+    def record(self, counter: str, value: int = 1):
+        """Increment a usage counter."""
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + value)
+
+
+class MemoryCache(BaseCache):
+    """In-memory response cache dropping the least recently used entries."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 0.0):
+        """Initialize a new :class:`MemoryCache` object.
+
+        :param maxsize: The maximum number of entries to keep.
+        :param ttl: The number of seconds a cached response is served without
+            revalidation.
+        """
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._keys: Dict[str, set] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, url: str, key: str) -> Optional[CacheEntry]:
+        """Get a cached entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, url: str, key: str, entry: CacheEntry):
+        """Store an entry."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._keys.setdefault(url, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, url: str):
+        """Drop all the entries of the URL."""
+        with self._lock:
+            for key in list(self._keys.get(url, ())):
+                self._drop(key)
+
+    def clear(self):
+        """Drop all the entries."""
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+
+    def _drop(self, key: str):
+        """Drop the entry."""
+        entry = self._entries.pop(key)
+        url = key.split('?', 1)[0]
+
+        keys = self._keys.get(url, set())
+        keys.discard(key)
+        if not keys:
+            self._keys.pop(url, None)
+
+        return entry
+
+
+class FileCache(BaseCache):
+    """On-disk response cache.
+
+    Each URL gets its own directory, which keeps the entries of all its query
+    strings. An entry is a file holding JSON encoded metadata on the first
+    line followed by the response body.
+    """
+
+    def __init__(self, directory: str, ttl: float = 0.0):
+        """Initialize a new :class:`FileCache` object.
+
+        :param directory: The directory to store the entries in.
+        :param ttl: The number of seconds a cached response is served without
+            revalidation.
+        """
+        super().__init__(ttl)
+        self.directory = directory
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+    def _path(self, url: str, key: str = None) -> str:
+        path = os.path.join(self.directory, self._hash(url))
+        if key is None:
+            return path
+        return os.path.join(path, self._hash(key))
+
+    def get(self, url: str, key: str) -> Optional[CacheEntry]:
+        """Get a cached entry."""
+        try:
+            with open(self._path(url, key), 'rb') as file:
+                metadata = json.loads(file.readline())
+                content = file.read()
+        except (OSError, ValueError):
+            return None
+
+        return CacheEntry(content=content, **metadata)
+
+    def set(self, url: str, key: str, entry: CacheEntry):
+        """Store an entry."""
+        directory = self._path(url)
+        os.makedirs(directory, exist_ok=True)
+
+        metadata = asdict(entry)
+        del metadata['content']
+
+        # Write to a temporary file first, so that concurrent readers never
+        # see a partially written entry
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(json.dumps(metadata).encode('utf-8') + b'\n')
+                file.write(entry.content)
+            os.replace(temp_path, self._path(url, key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def invalidate(self, url: str):
+        """Drop all the entries of the URL."""
+        shutil.rmtree(self._path(url), ignore_errors=True)
+
+    def clear(self):
+        """Drop all the entries."""
+        if not os.path.isdir(self.directory):
+            return
+
+        with self._lock:
+            for name in os.listdir(self.directory):
+                shutil.rmtree(os.path.join(self.directory, name),
+                              ignore_errors=True)
+
+
+def create_cache(options: dict) -> Optional[BaseCache]:
+    """Create the response cache configured by the client options.
+
+    Returns ``None`` if caching is disabled.
+    """
+    if options.get('cache_dir'):
+        return FileCache(options['cache_dir'], options['cache_ttl'])
+
+    if options.get('cache_maxsize'):
+        return MemoryCache(options['cache_maxsize'], options['cache_ttl'])
+
+    return None
@@ -0,0 +1,338 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Recording and replaying API traffic for airslate package.
+
+A :class:`CassetteAdapter` is mounted into a session in place of the HTTP
+adapter. In the ``record`` mode it sends requests over the network and
+captures the responses into a :class:`Cassette`. In the ``replay`` mode it
+serves the captured responses from memory, optionally with injected
+latency, connection errors and ``429 Too Many Requests`` responses, so that
+the client, resources and schemas can be load tested and profiled without a
+network and apart from the server time.
+
+.. code-block:: python
+
+   from airslate.cassette import Cassette, CassetteAdapter
+   from airslate.client import Client
+   from airslate.sessions import RetrySession
+
+   session = RetrySession()
+   CassetteAdapter(Cassette.load('organizations.json.gz')).mount(session)
+
+   client = Client(session)
+
+Classes:
+- Interaction: A captured response to a request.
+- Cassette: Captured responses of a session.
+- CassetteAdapter: Records or replays the requests of a session.
+"""
+
+import base64
+import gzip
+import itertools
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from requests import Session
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .exceptions import BaseError
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# The version of the cassette file format
+FORMAT_VERSION = 1
+
+# Headers describing the response as it was transferred, not as it is
+# stored, the body of a captured response is already decoded.
+TRANSFER_HEADERS = frozenset((
+    'connection', 'content-encoding', 'content-length', 'keep-alive',
+    'transfer-encoding',
+))
+
+
+class CassetteMiss(BaseError):
+    """Raised when a replayed request has not been recorded."""
+
+
+@dataclass(frozen=True)
+class Interaction:
+    """A captured response to a request."""
+
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+
+    @classmethod
+    def capture(cls, response: Response) -> 'Interaction':
+        """Capture the response, reading its body."""
+        headers = tuple((name, value)
+                        for name, value in response.headers.items()
+                        if name.lower() not in TRANSFER_HEADERS)
+
+        return cls(
+            method=response.request.method,
+            url=response.request.url,
+            status=response.status_code,
+            reason=response.reason or '',
+            headers=headers,
+            body=response.content or b'',
+        )
+
+    def to_dict(self) -> dict:
+        """Convert the interaction to a JSON serializable dictionary."""
+        result = {
+            'method': self.method,
+            'url': self.url,
+            'status': self.status,
+            'reason': self.reason,
+            'headers': [list(header) for header in self.headers],
+        }
+
+        try:
+            result['body'] = self.body.decode('utf-8')
+        except UnicodeDecodeError:
+            result['body64'] = base64.b64encode(self.body).decode('ascii')
+
+        return result
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Interaction':
+        """Create an interaction out of a dictionary."""
+        if 'body64' in data:
+            body = base64.b64decode(data['body64'])
+        else:
+            body = data.get('body', '').encode('utf-8')
+
+        return cls(
+            method=data['method'],
+            url=data['url'],
+            status=data['status'],
+            reason=data.get('reason', ''),
+            headers=tuple(tuple(header) for header in data['headers']),
+            body=body,
+        )
+
+    def build_response(self, request: PreparedRequest) -> Response:
+        """Build a response to the request out of the interaction."""
+        response = Response()
+        response.status_code = self.status
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        # pylint: disable=protected-access
+        response._content = self.body
+        response._content_consumed = True
+        return response
+
+
+class Cassette:
+    """Captured responses of a session.
+
+    Responses are looked up by the request method and URL. Responses
+    captured several times for the same request are replayed in the order
+    they have been captured, over and over again.
+
+    The cassette file is compact JSON, compressed with gzip if its name ends
+    with ``.gz``.
+    """
+
+    def __init__(self, interactions: List[Interaction] = None,
+                 path: Optional[str] = None):
+        """Initialize a new :class:`Cassette` object.
+
+        :param interactions: The captured responses.
+        :param path: The file the cassette is saved to.
+        """
+        self.path = path
+        self.interactions: List[Interaction] = []
+
+        self._index: Dict[Tuple[str, str], List[Interaction]] = {}
+        self._cycles: Dict[Tuple[str, str], Iterator[Interaction]] = {}
+        self._lock = threading.Lock()
+
+        for interaction in interactions or ():
+            self.add(interaction)
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def add(self, interaction: Interaction):
+        """Add a captured response."""
+        key = (interaction.method.upper(), interaction.url)
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index.setdefault(key, []).append(interaction)
+            self._cycles.pop(key, None)
+
+    def find(self, method: str, url: str) -> Interaction:
+        """Get the next captured response to the request.
+
+        Raises :class:`CassetteMiss` if the request has not been recorded.
+        """
+        key = (method.upper(), url)
+        with self._lock:
+            cycle = self._cycles.get(key)
+            if cycle is None:
+                if key not in self._index:
+                    raise CassetteMiss(f'Request not recorded: {method} {url}')
+                cycle = self._cycles[key] = itertools.cycle(self._index[key])
+            return next(cycle)
+
+    @classmethod
+    def load(cls, path: str) -> 'Cassette':
+        """Load the cassette from the file."""
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported cassette version: {data.get('version')}")
+
+        return cls([Interaction.from_dict(item)
+                    for item in data['interactions']], path=path)
+
+    def save(self, path: Optional[str] = None):
+        """Save the cassette to the file, the one it was loaded from by
+        default."""
+        path = path or self.path
+        if path is None:
+            raise ValueError('Cassette path is not set')
+
+        with self._lock:
+            data = {
+                'version': FORMAT_VERSION,
+                'interactions': [item.to_dict()
+                                 for item in self.interactions],
+            }
+
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, separators=(',', ':'))
+
+
+class CassetteAdapter(BaseAdapter):
+    """Records or replays the requests of a session.
+
+    Injected faults apply to the ``replay`` mode only, they are drawn for
+    each request in turn: the latency is waited for first, then a connection
+    error is raised or a ``429 Too Many Requests`` response returned with the
+    configured probabilities. Replayed requests do not go through urllib3,
+    so its retry policy does not apply to them and injected faults reach the
+    client as is.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, cassette: Cassette, mode: str = REPLAY,
+                 adapter: Optional[BaseAdapter] = None, **faults):
+        """Initialize a new :class:`CassetteAdapter` object.
+
+        :param cassette: The cassette to record into or replay from.
+        :param mode: Either ``record`` or ``replay``.
+        :param adapter: The adapter sending recorded requests, the one
+            mounted into the session for HTTPS URLs by default, so that
+            recorded requests keep its connection pool and retry policy.
+        :keyword float latency: The number of seconds each replayed request
+            takes.
+        :keyword float error_rate: The fraction of replayed requests which
+            fail with a connection error.
+        :keyword float throttle_rate: The fraction of replayed requests
+            answered with ``429 Too Many Requests``.
+        :keyword float retry_after: The ``Retry-After`` delay of the
+            injected ``429`` responses.
+        :keyword int seed: The seed of the fault injection random number
+            generator, so that runs are reproducible.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f'Unknown cassette mode: {mode}')
+
+        super().__init__()
+        self.cassette = cassette
+        self.mode = mode
+        self.adapter = adapter
+
+        self.latency = faults.get('latency', 0.0)
+        self.error_rate = faults.get('error_rate', 0.0)
+        self.throttle_rate = faults.get('throttle_rate', 0.0)
+        self.retry_after = faults.get('retry_after', 1)
+        self._random = random.Random(faults.get('seed'))
+        self._lock = threading.Lock()
+
+    def mount(self, session: Session) -> 'CassetteAdapter':
+        """Mount the adapter into the session for all HTTP(S) URLs."""
+        if self.mode == RECORD and self.adapter is None:
+            self.adapter = session.get_adapter('https://')
+
+        session.mount('https://', self)
+        session.mount('http://', self)
+        return self
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:
+        # pylint: disable=arguments-differ
+        """Send the request or replay the response to it."""
+        if self.mode == RECORD:
+            response = self.adapter.send(request, *args, **kwargs)
+            self.cassette.add(Interaction.capture(response))
+            return response
+
+        return self.replay(request)
+
+    def replay(self, request: PreparedRequest) -> Response:
+        """Replay the captured response to the request."""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            draw = self._random.random()
+
+        if draw < self.error_rate:
+            raise RequestsConnectionError('Injected connection error',
+                                          request=request)
+
+        if draw < self.error_rate + self.throttle_rate:
+            return self.throttled(request)
+
+        interaction = self.cassette.find(request.method, request.url)
+        return interaction.build_response(request)
+
+    def throttled(self, request: PreparedRequest) -> Response:
+        """Build an injected ``429 Too Many Requests`` response."""
+        return Interaction(
+            method=request.method,
+            url=request.url,
+            status=429,
+            reason='Too Many Requests',
+            headers=(('Content-Type', 'application/json'),
+                     ('Retry-After', str(self.retry_after))),
+            body=b'{"error":"Too Many Requests"}',
+        ).build_response(request)
+
+    def close(self):
+        """Close the recording adapter and save the recorded cassette."""
+        if self.mode == RECORD:
+            self.adapter.close()
+            if self.cassette.path is not None:
+                self.cassette.save()
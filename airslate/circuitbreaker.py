@@ -0,0 +1,244 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Circuit breaker for airslate package.
+
+A circuit breaker watches the outcome of recent requests to a host. Once
+too many of them fail or are too slow, the circuit opens and requests fail
+right away with :class:`airslate.exceptions.CircuitOpenError` instead of
+waiting for timeouts and retries. After ``recovery_timeout`` seconds a
+trial request is let through, the circuit closes if it succeeds and opens
+again otherwise. Requests which were let through before the circuit last
+changed its state do not count, e.g. a request sent while the circuit was
+closed can not close it again once it is half-open.
+
+Classes:
+- CircuitBreaker: Circuit breaker of a host.
+- CircuitBreakers: Circuit breakers of all hosts used by a client.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from .exceptions import ApiError, CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """Circuit breaker of a host."""
+
+    # The number of seconds outcomes of requests count for.
+    WINDOW = 30.0
+
+    # The number of requests in the window required to open the circuit.
+    MIN_CALLS = 10
+
+    # The number of trial requests allowed at once while half-open.
+    HALF_OPEN_CALLS = 1
+
+    def __init__(self, host: str, failure_rate: float = 0.5,
+                 slow_call: Optional[float] = None,
+                 recovery_timeout: float = 30.0):
+        """Initialize a new :class:`CircuitBreaker` object.
+
+        :param host: The host requests are sent to.
+        :param failure_rate: The fraction of failed, or slow, requests in the
+            window which opens the circuit.
+        :param slow_call: The number of seconds a request has to take to be
+            counted as slow. ``None`` disables latency tracking.
+        :param recovery_timeout: The number of seconds the circuit stays open
+            before a trial request is let through.
+        """
+        self.host = host
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.recovery_timeout = recovery_timeout
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        # Incremented on each change of the state
+        self._generation = 0
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The state of the circuit: ``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            if self._state == OPEN and self._recovery_delay() <= 0:
+                return HALF_OPEN
+            return self._state
+
+    def _recovery_delay(self) -> float:
+        return self._opened_at + self.recovery_timeout - time.monotonic()
+
+    def allow(self) -> int:
+        """Check whether a request may be sent.
+
+        Returns the generation of the circuit state to pass to
+        :meth:`record`. Raises :class:`CircuitOpenError` if the circuit is
+        open.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return self._generation
+
+            delay = self._recovery_delay()
+            if self._state == OPEN and delay <= 0:
+                self._transition(HALF_OPEN)
+                self._trials = 0
+
+            trial = self._trials < self.HALF_OPEN_CALLS
+            if self._state == HALF_OPEN and trial:
+                self._trials += 1
+                return self._generation
+
+            raise CircuitOpenError(status=503, host=self.host,
+                                   retry_after=max(delay, 0.0))
+
+    def record(self, failed: bool, duration: float,
+               generation: Optional[int] = None):
+        """Account the outcome of a request.
+
+        :param failed: Whether the request has failed.
+        :param duration: The number of seconds the request has taken.
+        :param generation: The generation returned by :meth:`allow` when the
+            request was let through, the current one by default. Outcomes
+            of requests let through before the state has changed are
+            ignored.
+        """
+        if self.slow_call is not None and duration >= self.slow_call:
+            failed = True
+
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            if self._state == HALF_OPEN:
+                self._trials = max(self._trials - 1, 0)
+                if failed:
+                    self._open(now)
+                else:
+                    self._transition(CLOSED)
+                    self._calls.clear()
+                return
+
+            if self._state == OPEN:
+                return
+
+            self._calls.append((now, failed))
+            horizon = now - self.WINDOW
+            while self._calls and self._calls[0][0] < horizon:
+                self._calls.popleft()
+
+            if len(self._calls) >= self.MIN_CALLS:
+                failures = sum(1 for _, f in self._calls if f)
+                if failures >= self.failure_rate * len(self._calls):
+                    self._open(now)
+
+    def _open(self, now: float):
+        self._transition(OPEN)
+        self._opened_at = now
+        self._calls.clear()
+
+    def _transition(self, state: str):
+        self._state = state
+        self._generation += 1
+
+    @staticmethod
+    def is_failure(exc: BaseException) -> bool:
+        """Check whether the error means the host is failing.
+
+        Client errors, such as ``404 Not Found`` or ``429 Too Many
+        Requests``, do not.
+        """
+        if isinstance(exc, ApiError):
+            return exc.status is None or exc.status >= 500
+        return True
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Call the function sending a request through the breaker."""
+        with self._watch():
+            return func(*args, **kwargs)
+
+    async def call_async(self, func: Callable, *args, **kwargs):
+        """Await the coroutine function sending a request through the
+        breaker."""
+        with self._watch():
+            return await func(*args, **kwargs)
+
+    @contextmanager
+    def _watch(self) -> Iterator[None]:
+        generation = self.allow()
+
+        started = time.monotonic()
+        failed = True
+        try:
+            yield
+            failed = False
+        except BaseException as exc:
+            failed = self.is_failure(exc)
+            raise
+        finally:
+            self.record(failed, time.monotonic() - started, generation)
+
+
+class CircuitBreakers:
+    """Circuit breakers of all hosts used by a client."""
+
+    def __init__(self, **kwargs):
+        """Initialize a new :class:`CircuitBreakers` object.
+
+        Accepts the same keyword arguments as :class:`CircuitBreaker`.
+        """
+        self.kwargs = kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CircuitBreaker:
+        """Get the circuit breaker of the URL host."""
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    host, CircuitBreaker(host, **self.kwargs))
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Get the state of the circuit of each host, e.g. for health checks.
+
+        >>> breakers = CircuitBreakers()
+        >>> _ = breakers.get('https://api.airslate.io/v1/organizations')
+        >>> breakers.states()
+        {'api.airslate.io': 'closed'}
+        """
+        return {host: b.state for host, b in list(self._breakers.items())}
+
+
+def create_circuit_breakers(options: dict) -> Optional[CircuitBreakers]:
+    """Create the circuit breakers configured by the client options.
+
+    Returns ``None`` if circuit breaking is disabled.
+    """
+    if not options.get('circuit_breaker'):
+        return None
+
+    return CircuitBreakers(
+        failure_rate=options['circuit_failure_rate'],
+        slow_call=options['circuit_slow_call'],
+        recovery_timeout=options['circuit_recovery_timeout'],
+    )
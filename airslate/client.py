@@ -7,23 +7,57 @@
 
 """Client module for airslate package."""
 
+import itertools
 import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Optional
 
 import requests
-from asdicts.dict import merge, intersect_keys
+from asdicts.dict import merge
 from requests.models import Response
 from urllib3.exceptions import MaxRetryError
 
-from . import exceptions, sessions
+from . import exceptions, hooks, sessions
+from .cache import CacheEntry, cache_key, create_cache
+from .circuitbreaker import create_circuit_breakers
+from .concurrency import SingleFlight
+from .hedging import create_hedge_policy
+from .metrics import create_metrics
+from .options import Options, RequestTemplate, overlay, overlay_headers
+from .ratelimit import create_rate_limiter, pacing
 from .resources.organizations import Organizations
-from .utils import default_headers
 
 
-class Client:
-    """airSlate API client class."""
+@lru_cache(maxsize=None)
+def status_errors() -> Dict[int, type]:
+    """Get the mapping of status codes to API error classes.
 
-    # pylint: disable=too-many-instance-attributes
-    # Eight is reasonable in this case.
+    The mapping is built once per process, instantiating every error class of
+    :mod:`airslate.exceptions` to read its status.
+    """
+    statuses = {}
+    for cls in exceptions.__dict__.values():
+        if (isinstance(cls, type) and issubclass(cls, exceptions.ApiError)
+                # Raised before a request is sent, never for a response
+                and cls is not exceptions.CircuitOpenError):
+            statuses[cls().status] = cls
+    return statuses
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class BaseClient:
+    """Base class for airSlate API clients.
+
+    Implements options handling and the status code to exception mapping
+    shared by :class:`Client` and :class:`airslate.aio.client.AsyncClient`.
+
+    The client options are compiled into a
+    :class:`airslate.options.RequestTemplate` on the first request and
+    compiled again once ``client.options`` are modified.
+    """
 
     DEFAULT_OPTIONS = {
         # API endpoint base URL to connect to.
@@ -42,8 +76,89 @@ class Client:
         # delay.
         'max_retries': 3,
 
+        # The fraction of recent requests which may be retried, e.g. ``0.2``.
+        # Requests failed once the budget is exhausted raise an error right
+        # away instead of being retried. Set to ``None`` to retry every
+        # request up to ``max_retries`` times.
+        'retry_budget': None,
+
         # Used API version.
         'version': 'v1',
+
+        # Keep connections alive and reuse them across requests. When
+        # disabled, the server is asked to close the connection after each
+        # request, so that every call pays a fresh TCP and TLS handshake.
+        'keep_alive': True,
+
+        # The number of per-host connection pools to cache.
+        'pool_connections': 10,
+
+        # The maximum number of connections to keep in each per-host pool.
+        'pool_maxsize': 10,
+
+        # The number of seconds pooled connections may stay unused before
+        # they are closed. Set to ``None`` to keep idle connections forever.
+        'pool_idle_timeout': 60.0,
+
+        # The maximum number of GET responses to keep in the in-memory cache.
+        # Set to ``0`` to disable caching.
+        'cache_maxsize': 0,
+
+        # The number of seconds a cached response is served without a
+        # request. Older responses are revalidated with a conditional request.
+        'cache_ttl': 0.0,
+
+        # Store cached responses in this directory instead of the memory.
+        'cache_dir': None,
+
+        # Send only one of identical GET requests issued concurrently, the
+        # other callers wait for it and receive the same response or error.
+        'coalesce': False,
+
+        # The number of requests per second to pace requests to. Requests
+        # wait for their turn instead of hitting the API rate limit, and the
+        # pace adjusts to the rate limit headers of the responses. Set to
+        # ``None`` to disable pacing.
+        'rate_limit': None,
+
+        # The number of requests allowed to be sent at once when pacing
+        # requests. Defaults to ``rate_limit``.
+        'rate_limit_burst': None,
+
+        # Fail requests to a host right away, raising CircuitOpenError, once
+        # too many recent requests to it failed or were too slow.
+        'circuit_breaker': False,
+
+        # The fraction of failed requests which opens the circuit.
+        'circuit_failure_rate': 0.5,
+
+        # The number of seconds a request has to take to count as failed.
+        # Set to ``None`` to count only errors.
+        'circuit_slow_call': None,
+
+        # The number of seconds the circuit stays open before a trial request
+        # is let through.
+        'circuit_recovery_timeout': 30.0,
+
+        # Send a second copy of a GET request which has not received a
+        # response in time and return whichever response arrives first.
+        'hedge': False,
+
+        # The number of seconds to wait for a response before hedging a GET
+        # request. Set to ``None`` to wait for the 95th percentile of the
+        # recent latencies of the endpoint.
+        'hedge_delay': None,
+
+        # The maximum fraction of GET requests to hedge.
+        'hedge_ratio': 0.05,
+
+        # Keep latency histograms, status, retry and traffic counters of
+        # requests per endpoint, exposed as ``client.metrics``.
+        'metrics': False,
+
+        # The maximum number of threads running the calls submitted by
+        # ``Client.submit()`` and the ``*_async`` resource methods.
+        'background_workers': 4,
     }
 
     CLIENT_OPTIONS = set(DEFAULT_OPTIONS.keys())
@@ -72,105 +187,114 @@ class Client:
 
     ALL_OPTIONS = CLIENT_OPTIONS | QUERY_OPTIONS | REQUEST_OPTIONS
 
-    def __init__(self, session=None, auth=None, **options):
-        """A :class:`Client` object for interacting with airSlate's API."""
+    CONNECTION_ERROR_MESSAGE = (
+        'A connection attempt failed because the connected party did not '
+        'properly respond after a period of time, or established connection '
+        'failed because connected host has failed to respond.'
+    )
+
+    def __init__(self, auth=None, **options):
+        """Initialize options shared by all airSlate API clients."""
         self.options = merge(self.DEFAULT_OPTIONS, options)
         self.auth = auth
+        self._template = None
 
         self.headers = options.pop('headers', {})
-        self.session = session or sessions.RetrySession(
-            max_retries=self.options['max_retries'],
-        )
+        self.hooks = hooks.Hooks()
+        self.metrics = create_metrics(self.options, self.hooks)
+        self.rate_limiter = create_rate_limiter(self.options)
+        self.circuit_breakers = create_circuit_breakers(self.options)
+        self.hedging = create_hedge_policy(self.options)
 
         self._init_statuses()
 
-        # Initialize each resource facade and injecting client object into it
-        self.organizations = Organizations(
-            self, api_version=self.options['version'])
-
-    def request(self, method: str, path: str, **options) -> Response:
-        """Dispatches a request to the airSlate API."""
-        options = self._merge_options(options)
-        url = options['base_url'].rstrip('/') + '/' + path.lstrip('/')
-
-        # Select and formats options to be passed to the request
-        request_options = self._parse_request_options(options)
-
-        # Select proper session implementation
-        current_session = (self.session if self.session.auth is None
-                           else self.session.auth)
-
-        try:
-            if 'headers' in request_options and request_options['headers']:
-                current_session.headers.update(request_options['headers'])
-                del request_options['headers']
-
-            # Ensure SSL connection is closed after finished using session.
-            with current_session as session:
-                response = getattr(session, method)(
-                    url, auth=self.auth, **request_options)
-
-            if response.status_code in self.statuses:
-                raise self.statuses[response.status_code](
-                    response=response
-                )
+    @property
+    def options(self) -> dict:
+        """The options of the client."""
+        return self._options
+
+    @options.setter
+    def options(self, value: dict):
+        self._options = Options(value)
+        # The revision of the new options starts over
+        self._template = None
+
+    def _compile(self) -> RequestTemplate:
+        """Get the request template of the current client options."""
+        template = self._template
+        if template is None or template.revision != self._options.revision:
+            template = self._template = RequestTemplate(
+                self._options, self.QUERY_OPTIONS, self.REQUEST_OPTIONS,
+                self.ALL_OPTIONS)
+        return template
+
+    def _session_options(self) -> dict:
+        """Select options of the default session."""
+        return {
+            'max_retries': self.options['max_retries'],
+            'pool_connections': self.options['pool_connections'],
+            'pool_maxsize': self.options['pool_maxsize'],
+            'pool_idle_timeout': self.options['pool_idle_timeout'],
+            'retry_budget': self.options['retry_budget'],
+        }
+
+    @staticmethod
+    def _retry_error_message(exc: Exception) -> str:
+        """Describe the reason why a request has not been retried."""
+        # requests wraps MaxRetryError in RetryError
+        if not isinstance(exc, MaxRetryError) and exc.args:
+            exc = exc.args[0]
+
+        reason = getattr(exc, 'reason', None)
+        if isinstance(reason, sessions.RetryBudgetExhausted):
+            return str(reason)
+
+        return 'Exceeded API Rate Limit'
+
+    def _resolve_url(self, options: dict, path: str) -> str:
+        """Build an absolute URL of the API endpoint.
+
+        The ``base_url`` of the options takes precedence over the client one.
+        """
+        if 'base_url' in options:
+            base_url = options['base_url'].rstrip('/')
+        else:
+            base_url = self._compile().base_url
+        return base_url + '/' + path.lstrip('/')
 
-            # Any unhandled 5xx is a server error
-            if 500 <= response.status_code < 600:
-                raise exceptions.InternalServerError(response=response)
+    def _raise_for_status(self, response):
+        """Raise an API error if the response is unsuccessful.
 
-            return response
-        except (MaxRetryError, requests.exceptions.RetryError) as retry_exc:
-            status = 503
-            response = None
-
-            if hasattr(retry_exc, 'response') and retry_exc.response:
-                response = retry_exc.response
-                status = response.status_code
+        Rate limit headers of every response are passed to the rate limiter.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(response.status_code, response.headers)
 
-            raise exceptions.RetryApiError(
-                message='Exceeded API Rate Limit',
-                response=response,
-                status=status,
-            )
-        except requests.exceptions.ConnectionError as conn_exc:
-            message = ('A connection attempt failed because the '
-                       'connected party did not properly respond '
-                       'after a period of time, or established connection '
-                       'failed because connected host has failed to respond.')
-            raise exceptions.InternalServerError(
-                message=message,
-                response=conn_exc.response,
-            )
-        except requests.exceptions.RequestException as req_exc:
-            raise exceptions.InternalServerError(
-                response=req_exc.response
+        if response.status_code in self.statuses:
+            raise self.statuses[response.status_code](
+                response=response
             )
 
-    def post(self, path, data, **options) -> Response:
-        """Parses POST request options and dispatches a request."""
-        return self._create('post', path, data, **options)
-
-    def patch(self, path, data, **options) -> Response:
-        """Parses PATCH request options and dispatches a request."""
-        return self._create('patch', path, data, **options)
+        # Any unhandled 5xx is a server error
+        if 500 <= response.status_code < 600:
+            raise exceptions.InternalServerError(response=response)
 
-    def _create(self, method, path, data, **options) -> Response:
-        """Internal helper to send POST/PUT/PATCH requests."""
+    def _create_options(self, data, options: dict) -> dict:
+        """Parses POST/PUT/PATCH request options."""
         # Select all unknown options.
         parameter_options = self._parse_parameter_options(options)
 
         # Values in the ``data`` takes precedence.
-        body = merge(parameter_options, data)
+        body = overlay(parameter_options, data)
 
         # Values in the ``options['headers']`` takes precedence.
-        headers = merge(default_headers(), options.pop('headers', {}))
+        headers = overlay_headers(self._compile().headers,
+                                  options.pop('headers', {}))
 
-        return self.request(method, path, data=body, headers=headers,
-                            **options)
+        return dict(options, data=body, headers=headers)
 
-    def get(self, path, query=None, **options) -> Response:
-        """Parses GET request options and dispatches a request."""
+    def _get_options(self, query, options: dict) -> dict:
+        """Parses GET request options."""
         # Select query string options.
         query_options = self._parse_query_options(options)
 
@@ -178,24 +302,77 @@ class Client:
         parameter_options = self._parse_parameter_options(options)
 
         # Values in the ``query`` takes precedence.
-        _query = {} if query is None else query
-        query = merge(query_options, parameter_options, _query)
+        query = overlay(overlay(query_options, parameter_options), query or {})
 
         # Values in the ``options['headers']`` takes precedence.
-        headers = merge(default_headers(), options.pop('headers', {}))
-
         # `Content-Type` HTTP header should be set only for PUT and POST
-        del headers['Content-Type']
+        headers = overlay_headers(self._compile().get_headers,
+                                  options.pop('headers', {}))
+
+        return dict(options, params=query, headers=headers)
 
-        return self.request('get', path, params=query, headers=headers,
-                            **options)
+    def _request_key(self, method: str, path: str, options: dict) -> tuple:
+        """Build the key identifying identical requests.
+
+        Requests are identical if they have the same method, URL, query and
+        headers, the latter including the credentials of the request.
+        """
+        url = self._resolve_url(options, path)
+
+        headers = dict(self.headers)
+        headers.update(options.get('headers', {}))
+        headers = tuple(sorted((name.lower(), value)
+                               for name, value in headers.items()))
+
+        return method, cache_key(url, options.get('params')), headers
+
+    @staticmethod
+    def _endpoint(path: str) -> str:
+        """Get the template of the requested path.
+
+        Latencies and traces are accounted per endpoint template, not per
+        resource.
+        """
+        return getattr(path, 'template', path)
+
+    def _hedges(self, options: dict) -> bool:
+        """Check whether a GET request is hedged."""
+        return (self.hedging is not None and not options.get('stream') and
+                options.get('hedge', self.options['hedge']))
+
+    def _hedge_pacing(self) -> Callable[[], bool]:
+        """Create a check telling whether the next step of a hedged request
+        waits for the rate limiter.
+
+        The request waits for the rate limiter before the hedging delay
+        starts, so its first copy is sent right away, and every later copy
+        waits once the delay is over.
+        """
+        if self.rate_limiter is None:
+            return lambda: False
+
+        steps = itertools.count()
+        return lambda: next(steps) != 1
+
+    def _start_trace(self, method: str, url: str, path: str,
+                     body) -> Optional[hooks.RequestTrace]:
+        """Start tracing a request.
+
+        Requests are traced only if somebody listens to the hooks, returns
+        ``None`` otherwise.
+        """
+        if not self.hooks:
+            return None
+
+        trace = hooks.RequestTrace(self.hooks, method, url,
+                                   self._endpoint(path))
+        # json.dumps() escapes non-ASCII characters, so characters are bytes
+        trace.sent = len(body or '')
+        return trace
 
     def _init_statuses(self):
         """Create a mapping of status codes to classes."""
-        self.statuses = {}
-        for cls in exceptions.__dict__.values():
-            if isinstance(cls, type) and issubclass(cls, exceptions.ApiError):
-                self.statuses[cls().status] = cls
+        self.statuses = dict(status_errors())
 
     def _parse_parameter_options(self, options: dict) -> dict:
         """Select all unknown options.
@@ -219,8 +396,8 @@ class Client:
         >>> client._parse_parameter_options({'timeout': 1.0})
         {}
         """
-        options = self._merge_options(options)
-        return intersect_keys(options, self.ALL_OPTIONS, invert=True)
+        parameters = dict(self._compile().parameters)
+        return overlay(parameters, options, self.ALL_OPTIONS, invert=True)
 
     def _parse_query_options(self, options: dict) -> dict:
         """Select query string options out of the provided options object.
@@ -246,8 +423,8 @@ class Client:
         >>> client._parse_query_options({'per_page': 15})
         {'per_page': 15}
         """
-        options = self._merge_options(options)
-        return intersect_keys(options, self.QUERY_OPTIONS)
+        query = dict(self._compile().query)
+        return overlay(query, options, self.QUERY_OPTIONS)
 
     def _parse_request_options(self, options: dict) -> dict:
         """Select request options out of the provided options object.
@@ -276,21 +453,21 @@ class Client:
         >>> client._parse_request_options({'headers': {'x-header': 'value'}})
         {'timeout': 5.0, 'headers': {'x-header': 'value'}}
         """
-        # Merge options with default options
-        options = self._merge_options(options)
-
-        # Select request options keys from the provided options object
-        request_options = intersect_keys(options, self.REQUEST_OPTIONS)
+        # Select request options keys from the provided options object and
+        # overlay them on the client ones
+        request_options = overlay(dict(self._compile().request), options,
+                                  self.REQUEST_OPTIONS)
 
         # If 'params' is in request_options, format the params values to be
         # JSON serializable
         if 'params' in request_options:
-            params = request_options['params']
-            for key in params:
-                # json.dumps(None) -> 'null'
-                # json.dumps(True) -> 'true'
-                if isinstance(params[key], bool) or params[key] is None:
-                    params[key] = json.dumps(params[key])
+            # json.dumps(None) -> 'null'
+            # json.dumps(True) -> 'true'
+            request_options['params'] = {
+                key: (json.dumps(value)
+                      if isinstance(value, bool) or value is None else value)
+                for key, value in request_options['params'].items()
+            }
 
         # If 'data' is in request_options, serialize it to JSON, since
         # requests library doesn't do it automatically
@@ -304,13 +481,347 @@ class Client:
 
         return request_options
 
-    def _merge_options(self, *objects):
-        """Merge option objects with the client's object.
 
-        Merges one or more options objects with client's options and returns a
-        new options object.
+class Client(BaseClient):
+    """airSlate API client class.
+
+    A client is thread-safe: per-request headers, credentials and options
+    never modify the state shared by the threads, so that one client and its
+    connection pool may serve a whole pool of worker threads.
+
+    Calls may also run in the background of the client own pool of at most
+    ``background_workers`` threads, see :meth:`submit`, so that a thread may
+    overlap several independent calls and wait for the slowest one only.
+
+    A client may be pickled and sent to another process along with its
+    options, headers, credentials and the access token of its session, and
+    it may be used by a process forked after it has been created: the
+    connection pools and the threads are rebuilt in the child on the first
+    call. Hooks subscribers, cached responses and collected metrics stay in
+    the original process.
+    """
+
+    def __init__(self, session=None, auth=None, **options):
+        """A :class:`Client` object for interacting with airSlate's API."""
+        super().__init__(auth, **options)
+
+        self.session = session or sessions.RetrySession(
+            **self._session_options())
+
+        self.cache = create_cache(self.options)
+        self.single_flight = SingleFlight()
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._shutdown = False
+        self._background = threading.local()
+        self._pid = os.getpid()
+
+        # Initialize each resource facade and injecting client object into it
+        self.organizations = Organizations(
+            self, api_version=self.options['version'])
+
+    def __getstate__(self):
+        return {
+            'options': dict(self.options),
+            'headers': self.headers,
+            'auth': self.auth,
+            'session': self.session,
+        }
+
+    def __setstate__(self, state):
+        Client.__init__(self, state['session'], state['auth'],
+                        **state['options'])
+        self.headers = state['headers']
+
+    def _check_fork(self):
+        """Rebuild the state which does not survive fork() if the client is
+        used by a forked child process."""
+        if self._pid == os.getpid():
+            return
+
+        self._pid = os.getpid()
+        sessions.reset_after_fork(self.session)
+
+        # The threads of the parent do not exist in the child, and the locks
+        # of the per-process state may have been held while forking.
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._shutdown = False
+        self._background = threading.local()
+        self.cache = create_cache(self.options)
+        self.single_flight = SingleFlight()
+        self.rate_limiter = create_rate_limiter(self.options)
+        self.circuit_breakers = create_circuit_breakers(self.options)
+        self.hedging = create_hedge_policy(self.options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the underlying session and release pooled connections.
+
+        The background calls which have not started yet are cancelled, the
+        running ones are waited for.
+        """
+        self.shutdown(cancel_futures=True)
+        if self.hedging is not None:
+            self.hedging.shutdown()
+        self.session.close()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The pool of threads running the background calls, created on
+        the first call."""
+        self._check_fork()
+        with self._executor_lock:
+            if self._shutdown:
+                raise RuntimeError('cannot submit calls after shutdown')
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.options['background_workers'],
+                    thread_name_prefix='airslate',
+                    initializer=self._start_worker,
+                )
+            return self._executor
+
+    def _start_worker(self):
+        self._background.worker = True
+
+    def shared_executor(self,
+                        workers: int = 1) -> Optional[ThreadPoolExecutor]:
+        """Get the pool of threads running the background calls, for the
+        calling thread to spread its own calls over.
+
+        Returns ``None`` if the pool has fewer than ``workers`` threads,
+        after :meth:`shutdown`, and to the background calls: they would wait
+        for the calls queued behind them.
+        """
+        if (workers > self.options['background_workers'] or
+                getattr(self._background, 'worker', False)):
+            return None
+
+        try:
+            return self.executor
+        except RuntimeError:
+            return None
+
+    def submit_call(self, func: Callable, *args, **kwargs) -> Future:
+        """Call the function in the background.
+
+        Returns a :class:`concurrent.futures.Future` of the call result. A
+        call which has not started yet may be cancelled with
+        ``future.cancel()``.
+        """
+        return self.executor.submit(func, *args, **kwargs)
+
+    def submit(self, method: str, path: str, *args, **options) -> Future:
+        """Dispatch a request in the background.
+
+        ``get``, ``post`` and ``patch`` requests take the same arguments as
+        the methods of the same name, other methods the ones of
+        :meth:`request`. Returns a :class:`concurrent.futures.Future` of the
+        response.
+
+        .. code-block:: python
+
+           first = client.submit('get', '/v1/organizations')
+           second = client.organizations.settings_async(org_id)
+
+           organizations, settings = first.result().json(), second.result()
+        """
+        func = {
+            'get': self.get,
+            'post': self.post,
+            'patch': self.patch,
+        }.get(method.lower())
+
+        if func is None:
+            return self.submit_call(self.request, method, path, *args,
+                                    **options)
+
+        return self.submit_call(func, path, *args, **options)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Stop running background calls.
+
+        Calls submitted afterwards raise :class:`RuntimeError`. The client
+        still sends requests from the calling thread.
+
+        :param wait: Wait for the running calls to complete.
+        :param cancel_futures: Cancel the calls which have not started yet.
         """
-        return merge(self.options, *objects)
+        with self._executor_lock:
+            self._shutdown = True
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def request(self, method: str, path: str, **options) -> Response:
+        """Dispatches a request to the airSlate API."""
+        self._check_fork()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        return self._request(method, path, options)
+
+    def _request(self, method: str, path: str, options: dict) -> Response:
+        """Dispatches a request which has waited for the rate limiter."""
+        url = self._resolve_url(options, path)
+
+        # Select and formats options to be passed to the request
+        request_options = self._parse_request_options(options)
+
+        # Headers are sent with the request only, the shared session is never
+        # modified, so that a client may be used by many threads at once.
+        if not options.get('keep_alive', self._compile().keep_alive):
+            request_options['headers']['Connection'] = 'close'
+
+        trace = self._start_trace(method, url, path,
+                                  request_options.get('data'))
+        if trace is None:
+            return self._dispatch(method, url, request_options)
+
+        request_options['hooks'] = {'response': trace.on_response}
+        with trace.sending():
+            response = self._dispatch(method, url, request_options)
+
+        trace.finish(response, request_options.get('stream', False))
+        return response
+
+    def _dispatch(self, method: str, url: str,
+                  request_options: dict) -> Response:
+        """Sends a request through the circuit breaker of its host if any."""
+        if self.circuit_breakers is None:
+            return self._send(method, url, request_options)
+
+        breaker = self.circuit_breakers.get(url)
+        return breaker.call(self._send, method, url, request_options)
+
+    def _send(self, method: str, url: str, request_options: dict) -> Response:
+        """Sends a request mapping the errors to API errors."""
+        # Select proper session implementation
+        current_session = (self.session if self.session.auth is None
+                           else self.session.auth)
+
+        try:
+            with pacing(self.rate_limiter):
+                response = current_session.request(
+                    method.upper(), url, auth=self.auth, **request_options)
+
+            self._raise_for_status(response)
+
+            return response
+        except (MaxRetryError, requests.exceptions.RetryError) as retry_exc:
+            status = 503
+            response = None
+
+            if hasattr(retry_exc, 'response') and retry_exc.response:
+                response = retry_exc.response
+                status = response.status_code
+
+            raise exceptions.RetryApiError(
+                message=self._retry_error_message(retry_exc),
+                response=response,
+                status=status,
+            )
+        except requests.exceptions.ConnectionError as conn_exc:
+            raise exceptions.InternalServerError(
+                message=self.CONNECTION_ERROR_MESSAGE,
+                response=conn_exc.response,
+            )
+        except requests.exceptions.RequestException as req_exc:
+            raise exceptions.InternalServerError(
+                response=req_exc.response
+            )
+
+    def post(self, path, data, **options) -> Response:
+        """Parses POST request options and dispatches a request."""
+        return self._create('post', path, data, **options)
+
+    def patch(self, path, data, **options) -> Response:
+        """Parses PATCH request options and dispatches a request."""
+        return self._create('patch', path, data, **options)
+
+    def _create(self, method, path, data, **options) -> Response:
+        """Internal helper to send POST/PUT/PATCH requests."""
+        try:
+            return self.request(method, path,
+                                **self._create_options(data, options))
+        finally:
+            # Cached responses of the path may be outdated now
+            if self.cache is not None:
+                self.cache.invalidate(self._resolve_url(options, path))
+
+    def get(self, path, query=None, **options) -> Response:
+        """Parses GET request options and dispatches a request."""
+        self._check_fork()
+        options = self._get_options(query, options)
+
+        if options.get('stream'):
+            return self.request('get', path, **options)
+
+        if options.get('coalesce', self.options['coalesce']):
+            key = self._request_key('get', path, options)
+            return self.single_flight.do(key, self._get, path, options)
+
+        return self._get(path, options)
+
+    def _get(self, path, options: dict) -> Response:
+        """Dispatches a GET request through the response cache if any."""
+        if self.cache is None:
+            return self._fetch(path, options)
+
+        return self._cached_get(path, options)
+
+    def _fetch(self, path, options: dict) -> Response:
+        """Dispatches a GET request hedging it if it is enabled."""
+        if not self._hedges(options):
+            return self.request('get', path, **options)
+
+        paced = self._hedge_pacing()
+        if paced():
+            self.rate_limiter.acquire()
+
+        def send():
+            if paced():
+                self.rate_limiter.acquire()
+            return self._request('get', path, dict(options))
+
+        return self.hedging.call(self._endpoint(path), send)
+
+    def _cached_get(self, path, options: dict) -> Response:
+        """Dispatches a GET request through the response cache."""
+        url = self._resolve_url(options, path)
+        key = cache_key(url, options['params'])
+
+        entry = self.cache.get(url, key)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.record('hits')
+                return entry.to_response()
+
+            options['headers'].update(entry.validators())
+            self.cache.record('revalidations')
+
+        response = self._fetch(path, options)
+
+        if entry is not None and response.status_code == 304:
+            entry.refresh(response)
+            self.cache.set(url, key, entry)
+            self.cache.record('hits')
+            return entry.to_response()
+
+        self.cache.record('misses')
+        if self.cache.is_cacheable(response):
+            self.cache.set(url, key, CacheEntry.from_response(response))
+
+        return response
 
     @classmethod
     def jwt_session(cls, client_id, user_id, key, **kwargs):
@@ -0,0 +1,135 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Concurrency primitives for airslate package.
+
+Classes:
+- SingleFlight: Collapses identical concurrent calls made by threads.
+- AsyncSingleFlight: Collapses identical concurrent calls made by tasks.
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:  # pylint: disable=too-few-public-methods
+    """A call in flight."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:  # pylint: disable=too-few-public-methods
+    """Collapse concurrent calls with the same key into one.
+
+    The first caller of a key executes the function, callers arriving while
+    it is running wait for it and receive the same result or the same
+    exception. Once the call finishes the key is forgotten, so results are
+    never reused by later callers.
+
+    >>> flight = SingleFlight()
+    >>> flight.do('key', lambda: 42)
+    42
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+        # The number of callers which received the result of another call
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs):
+        """Execute the function unless a call with the same key is running.
+
+        :param key: The key identifying identical calls.
+        :param func: The function to call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class _AsyncCall:  # pylint: disable=too-few-public-methods
+    """A call of a coroutine function in flight."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:  # pylint: disable=too-few-public-methods
+    """Collapse concurrent calls of coroutine functions with the same key.
+
+    Behaves like :class:`SingleFlight` for the tasks of an event loop. The
+    call runs in a task of its own, so a cancelled caller does not cancel
+    it for the others. The call is cancelled once no caller waits for it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _AsyncCall] = {}
+
+        # The number of callers which received the result of another call
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable],
+                 *args, **kwargs):
+        """Await the coroutine function unless a call with the same key is
+        running.
+
+        :param key: The key identifying identical calls.
+        :param func: The coroutine function to call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _AsyncCall(asyncio.ensure_future(func(*args, **kwargs)))
+            call.task.add_done_callback(
+                functools.partial(self._forget, key, call))
+            self._calls[key] = call
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters:
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _AsyncCall, task: asyncio.Task):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+        # Do not warn about the exception if nobody was waiting any longer
+        if not task.cancelled():
+            task.exception()
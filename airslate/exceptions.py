@@ -31,7 +31,9 @@ class ApiError(BaseError):
 
         try:
             if response is not None:
-                reason = response.reason
+                # requests exposes ``reason``, httpx ``reason_phrase``
+                reason = getattr(response, 'reason',
+                                 getattr(response, 'reason_phrase', None))
                 if status is None:
                     status = response.status_code
 
@@ -178,6 +180,33 @@ class InternalServerError(ApiError):
         )
 
 
+class CircuitOpenError(ApiError):
+    """Error raised when requests to a failing host are short-circuited.
+
+    The request has not been sent, the host has been failing recently.
+    """
+
+    def __init__(
+            self,
+            message: Optional[str] = None,
+            status: Optional[int] = None,
+            host: Optional[str] = None,
+            retry_after: Optional[float] = None,
+    ):
+        if message is None:
+            message = 'Circuit breaker is open'
+            if host is not None:
+                message = f'Circuit breaker is open for {host}'
+
+        super().__init__(message=message, status=status)
+
+        # The host requests were sent to.
+        self.host = host
+
+        # The number of seconds before a trial request is allowed.
+        self.retry_after = retry_after
+
+
 class DomainError(BaseError):
     """Base domain error for airslate package."""
 
@@ -0,0 +1,341 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Hedged requests for airslate package.
+
+A hedged request is a second copy of an idempotent request sent once the
+first one has been waiting for a response longer than usual. Whichever of
+them finishes first is returned and the other one is cancelled, which cuts
+the tail latency caused by occasional slow responses at the price of a few
+extra requests. The share of hedged requests is capped by a ratio, so that
+a slow API is never flooded with copies.
+
+The synchronous client sends a request which may be hedged from a thread of
+the policy, so that the caller is free to take the first response. Requests
+the cap does not allow to hedge are sent by the caller's thread, and so are
+the ones finding all the threads of the policy busy: requests never wait in
+a queue, which would delay them and count towards the hedging delay.
+
+Classes:
+- LatencyTracker: Recent latencies of an endpoint.
+- HedgeStats: Hedging usage counters.
+- HedgePolicy: Decides when to hedge requests and sends them.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional
+
+
+class LatencyTracker:
+    """Recent latencies of an endpoint.
+
+    >>> tracker = LatencyTracker()
+    >>> for i in range(1, 101):
+    ...     tracker.add(i / 100)
+    >>> tracker.percentile(0.95)
+    0.95
+    """
+
+    def __init__(self, size: int = 100):
+        """Initialize a new :class:`LatencyTracker` object.
+
+        :param size: The number of latest latencies to keep.
+        """
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, duration: float):
+        """Account the latency of a request in seconds."""
+        with self._lock:
+            self._samples.append(duration)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Get the latency below which the given fraction of requests fall.
+
+        Returns ``None`` if no latency has been accounted yet.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+
+        if not samples:
+            return None
+
+        index = max(math.ceil(fraction * len(samples)) - 1, 0)
+        return samples[index]
+
+
+@dataclass
+class HedgeStats:
+    """Hedging usage counters.
+
+    ``requests`` is the number of requests which could have been hedged,
+    ``hedged`` the number of them which were, and ``wins`` the number of
+    hedges which finished first.
+    """
+
+    requests: int = 0
+    hedged: int = 0
+    wins: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert the counters to a dictionary."""
+        return asdict(self)
+
+
+class HedgePolicy:  # pylint: disable=too-many-instance-attributes
+    """Decides when to hedge requests and sends them.
+
+    A request is hedged once it has been waiting for ``delay`` seconds, or,
+    if no delay is given, for longer than the ``percentile`` of the recent
+    latencies of its endpoint. Hedges never exceed ``ratio`` of requests.
+    """
+
+    # The number of latencies of an endpoint required to hedge its requests
+    # when no fixed delay is given.
+    MIN_SAMPLES = 20
+
+    # The default number of threads sending requests of the synchronous
+    # client which may be hedged, and their hedges.
+    MAX_WORKERS = 10
+
+    def __init__(self, delay: Optional[float] = None, ratio: float = 0.05,
+                 percentile: float = 0.95, max_workers: int = MAX_WORKERS):
+        """Initialize a new :class:`HedgePolicy` object.
+
+        :param delay: The number of seconds to wait for a response before
+            sending a hedge. ``None`` waits for the observed percentile.
+        :param ratio: The maximum fraction of requests to hedge.
+        :param percentile: The percentile of the latencies of an endpoint to
+            wait for when no fixed delay is given.
+        :param max_workers: The maximum number of threads sending requests
+            of the synchronous client which may be hedged, and their hedges.
+        """
+        self.delay = delay
+        self.ratio = ratio
+        self.percentile = percentile
+        self.max_workers = max_workers
+        self.stats = HedgeStats()
+
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._busy = 0
+        self._lock = threading.Lock()
+
+    def latencies(self, endpoint: str) -> LatencyTracker:
+        """Get the latency tracker of the endpoint."""
+        tracker = self._latencies.get(endpoint)
+        if tracker is None:
+            with self._lock:
+                tracker = self._latencies.setdefault(endpoint,
+                                                     LatencyTracker())
+        return tracker
+
+    def delay_for(self, endpoint: str) -> Optional[float]:
+        """Get the number of seconds to wait before hedging a request.
+
+        Returns ``None`` if requests to the endpoint may not be hedged yet.
+        """
+        if self.delay is not None:
+            return self.delay
+
+        tracker = self.latencies(endpoint)
+        if len(tracker) < self.MIN_SAMPLES:
+            return None
+
+        return tracker.percentile(self.percentile)
+
+    def _count_request(self):
+        with self._lock:
+            self.stats.requests += 1
+
+    def _allowed(self) -> bool:
+        """Check whether the cap allows one more hedge."""
+        return self.stats.hedged + 1 <= self.ratio * self.stats.requests
+
+    def _acquire(self) -> bool:
+        """Check whether the cap allows one more hedge and account it."""
+        with self._lock:
+            if not self._allowed():
+                return False
+            self.stats.hedged += 1
+            return True
+
+    def _win(self):
+        with self._lock:
+            self.stats.wins += 1
+
+    def _submit(self, func: Callable, *args, **kwargs) -> Optional[Future]:
+        """Call the function in an idle thread of the policy.
+
+        Returns ``None`` if all the threads are busy.
+        """
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return None
+            self._busy += 1
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='airslate-hedge',
+                )
+            executor = self._executor
+
+        future = executor.submit(func, *args, **kwargs)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future):
+        with self._lock:
+            self._busy -= 1
+
+    def call(self, endpoint: str, func: Callable, *args, **kwargs):
+        """Call the function sending a request, hedging it if it is slow.
+
+        Requests can not be interrupted once a thread has sent them, so the
+        response of the losing request is closed as soon as it arrives.
+        """
+        self._count_request()
+        started = time.monotonic()
+
+        delay = self.delay_for(endpoint)
+        primary = None
+        if delay is not None and self._allowed():
+            primary = self._submit(func, *args, **kwargs)
+
+        if primary is None:
+            result = func(*args, **kwargs)
+            self.latencies(endpoint).add(time.monotonic() - started)
+            return result
+
+        done, _ = wait([primary], timeout=delay)
+        hedge = None
+        if not done and self._acquire():
+            hedge = self._submit(func, *args, **kwargs)
+            if hedge is None:
+                with self._lock:
+                    self.stats.hedged -= 1
+
+        if hedge is None:
+            result = primary.result()
+            self.latencies(endpoint).add(time.monotonic() - started)
+            return result
+
+        return self._race(endpoint, started, primary, hedge)
+
+    def _race(self, endpoint: str, started: float, primary: Future,
+              hedge: Future):
+        """Take the result of whichever request finishes first."""
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+
+                for loser in pending:
+                    loser.cancel()
+                    loser.add_done_callback(_close_response)
+                if future is hedge:
+                    self._win()
+                self.latencies(endpoint).add(time.monotonic() - started)
+                return future.result()
+
+        raise error
+
+    async def call_async(self, endpoint: str, func: Callable, *args,
+                         **kwargs):
+        """Await the coroutine function sending a request, hedging it if it
+        is slow.
+
+        The losing request is cancelled.
+        """
+        self._count_request()
+        started = time.monotonic()
+
+        delay = self.delay_for(endpoint)
+        if delay is None:
+            result = await func(*args, **kwargs)
+            self.latencies(endpoint).add(time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(func(*args, **kwargs))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._acquire():
+                result = await primary
+                self.latencies(endpoint).add(time.monotonic() - started)
+                return result
+
+            hedge = asyncio.ensure_future(func(*args, **kwargs))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+
+                    if task is hedge:
+                        self._win()
+                    self.latencies(endpoint).add(time.monotonic() - started)
+                    return task.result()
+
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def shutdown(self):
+        """Stop the threads sending hedged requests."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _close_response(future: Future):
+    """Release the connection of a response nobody is waiting for."""
+    if future.cancelled() or future.exception() is not None:
+        return
+
+    close = getattr(future.result(), 'close', None)
+    if close is not None:
+        close()
+
+
+def create_hedge_policy(options: dict) -> Optional[HedgePolicy]:
+    """Create the hedging policy configured by the client options.
+
+    Returns ``None`` if hedging is disabled.
+    """
+    if not options.get('hedge'):
+        return None
+
+    # A request and its hedge need a connection each
+    return HedgePolicy(
+        delay=options['hedge_delay'],
+        ratio=options['hedge_ratio'],
+        max_workers=options['pool_maxsize'],
+    )
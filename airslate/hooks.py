@@ -0,0 +1,492 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Request lifecycle hooks for airslate package.
+
+Callbacks subscribed to the hooks of a client are called with an
+:class:`Event` as a request goes through its lifecycle:
+
+- ``request``: the request is about to be sent;
+- ``retry``: an attempt has failed and the request is going to be retried;
+- ``response``: the response headers have been received;
+- ``body``: the response body has been downloaded, or a streamed response
+  has been read to the end or closed;
+- ``loaded``: a resource has created models out of the response;
+- ``error``: the request has failed.
+
+Each event carries the :class:`Timings` recorded so far. When nothing is
+subscribed requests are not traced at all.
+
+Classes:
+- Timings: Where the time of a request goes.
+- Event: A request lifecycle event.
+- Hooks: Subscribers of request lifecycle events.
+- RequestTrace: Records the lifecycle of a request.
+- OpenTelemetryHooks: Reports requests as OpenTelemetry spans.
+"""
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+REQUEST = 'request'
+RETRY = 'retry'
+RESPONSE = 'response'
+BODY = 'body'
+LOADED = 'loaded'
+ERROR = 'error'
+
+EVENTS = (REQUEST, RETRY, RESPONSE, BODY, LOADED, ERROR)
+
+# The trace of the request being sent by the current thread or task
+_current: ContextVar[Optional['RequestTrace']] = ContextVar(
+    'airslate_request_trace', default=None)
+
+# Traces of the responses returned by the clients
+_traces = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class Timings:
+    """Where the time of a request goes, in seconds.
+
+    ``pool`` is the time spent waiting for a pooled connection, ``connect``
+    and ``tls`` the time spent to open a new one, if any. ``ttfb`` is the
+    time from sending the request until the response headers arrive, which
+    includes the former ones, and ``download`` the time spent reading the
+    body afterwards. ``decode`` and ``load`` are the time spent to decode the
+    JSON body and to create models out of it.
+    """
+
+    pool: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    decode: float = 0.0
+    load: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert the timings to a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class Event:  # pylint: disable=too-many-instance-attributes
+    """A request lifecycle event.
+
+    ``endpoint`` is the template of the requested path, e.g.
+    ``/v1/organizations/{org_id}/settings``, if the path has been built by a
+    resource, the path itself otherwise. ``elapsed`` is the number of seconds
+    since the request has started, ``sent`` and ``received`` the sizes of
+    the request and the response bodies in bytes. ``context`` is a
+    dictionary shared by all the events of a request, subscribers may keep
+    their own state of the request in it.
+    """
+
+    name: str
+    method: Optional[str]
+    url: str
+    timings: Timings
+    endpoint: Optional[str] = None
+    context: dict = field(default_factory=dict)
+    attempt: int = 0
+    status: Optional[int] = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+    sent: int = 0
+    received: int = 0
+
+
+class Hooks:
+    """Subscribers of request lifecycle events.
+
+    >>> hooks = Hooks()
+    >>> bool(hooks)
+    False
+    >>> @hooks.subscribe('error')
+    ... def on_error(event):
+    ...     print(event.error)
+    >>> bool(hooks)
+    True
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Tuple[Callable, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, name: str, callback: Callable[[Event], Any] = None):
+        """Call the callback on the event.
+
+        Returns the callback, so that it may be used as a decorator.
+        """
+        if name not in EVENTS:
+            raise ValueError(f'Unknown event: {name}')
+
+        if callback is None:
+            return lambda func: self.subscribe(name, func)
+
+        with self._lock:
+            self._subscribers[name] = (
+                self._subscribers.get(name, ()) + (callback,))
+
+        return callback
+
+    def unsubscribe(self, name: str, callback: Callable[[Event], Any]):
+        """Stop calling the callback on the event."""
+        with self._lock:
+            callbacks = tuple(c for c in self._subscribers.get(name, ())
+                              if c != callback)
+            if callbacks:
+                self._subscribers[name] = callbacks
+            else:
+                self._subscribers.pop(name, None)
+
+    def callbacks(self, name: str) -> Tuple[Callable, ...]:
+        """Get the callbacks subscribed to the event."""
+        return self._subscribers.get(name, ())
+
+    def emit(self, event: Event):
+        """Call the callbacks subscribed to the event."""
+        for callback in self.callbacks(event.name):
+            callback(event)
+
+
+class RequestTrace:  # pylint: disable=too-many-instance-attributes
+    """Records the lifecycle of a request and emits its events."""
+
+    def __init__(self, hooks: Hooks, method: Optional[str], url: str,
+                 endpoint: Optional[str] = None):
+        """Initialize a new :class:`RequestTrace` object.
+
+        :param hooks: The hooks to emit the events to.
+        :param method: The request method.
+        :param url: The request URL.
+        :param endpoint: The template of the requested path.
+        """
+        self.hooks = hooks
+        self.method = method and method.upper()
+        self.url = url
+        self.endpoint = endpoint
+        self.timings = Timings()
+        self.context = {}
+        self.attempt = 0
+        self.status = None
+        self.sent = 0
+        self.received = 0
+
+        self._started = time.monotonic()
+        self._marks: Dict[str, float] = {}
+        self._responded = False
+        self._completed = False
+
+    def elapsed(self) -> float:
+        """Get the number of seconds since the request has started."""
+        return time.monotonic() - self._started
+
+    def emit(self, name: str, error: BaseException = None):
+        """Emit an event of the request."""
+        callbacks = self.hooks.callbacks(name)
+        if not callbacks:
+            return
+
+        event = Event(
+            name=name,
+            method=self.method,
+            url=self.url,
+            timings=replace(self.timings),
+            endpoint=self.endpoint,
+            context=self.context,
+            attempt=self.attempt,
+            status=self.status,
+            error=error,
+            elapsed=self.elapsed(),
+            sent=self.sent,
+            received=self.received,
+        )
+        for callback in callbacks:
+            callback(event)
+
+    def add(self, timing: str, seconds: float):
+        """Add the number of seconds to a timing."""
+        setattr(self.timings, timing, getattr(self.timings, timing) + seconds)
+
+    @contextmanager
+    def activate(self) -> Iterator['RequestTrace']:
+        """Make the trace the current one of the thread or task."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def sending(self) -> Iterator['RequestTrace']:
+        """Make the trace the current one while the request is being sent,
+        accounting its failure."""
+        with self.activate():
+            self.emit(REQUEST)
+            try:
+                yield self
+            except Exception as exc:
+                self.fail(exc)
+                raise
+
+    def retry(self, error: BaseException = None):
+        """Account a failed attempt."""
+        self.attempt += 1
+        self.emit(RETRY, error)
+
+    def fail(self, error: BaseException):
+        """Account a failed request."""
+        self.status = getattr(error, 'status', self.status)
+        self.emit(ERROR, error)
+
+    def on_response(self, response, *args, **kwargs):
+        """Account the response headers, used as a requests hook."""
+        # pylint: disable=unused-argument
+        self.timings.ttfb = self.elapsed()
+        self.status = response.status_code
+        self._responded = True
+        self.emit(RESPONSE)
+        return response
+
+    async def on_httpcore(self, name: str, info: dict):
+        """Account the connection timings, used as an httpcore trace."""
+        # pylint: disable=unused-argument
+        prefix, _, stage = name.rpartition('.')
+        if stage == 'started':
+            self._marks[prefix] = time.monotonic()
+            return
+
+        started = self._marks.pop(prefix, None)
+        if started is None or stage != 'complete':
+            return
+
+        if prefix == 'connection.connect_tcp':
+            self.add('connect', time.monotonic() - started)
+        elif prefix == 'connection.start_tls':
+            self.add('tls', time.monotonic() - started)
+        elif prefix.endswith('.receive_response_headers'):
+            self.timings.ttfb = self.elapsed()
+
+    def finish(self, response, stream: bool = False):
+        """Account the response once it has been returned by the session."""
+        if not self._responded:
+            if not self.timings.ttfb:
+                self.timings.ttfb = self.elapsed()
+            self.status = response.status_code
+            self._responded = True
+            self.emit(RESPONSE)
+
+        if stream:
+            self._watch_stream(response)
+        else:
+            self.complete(len(response.content))
+
+        _traces[response] = self
+
+    def complete(self, received: int):
+        """Account the downloaded response body, once."""
+        if self._completed:
+            return
+
+        self._completed = True
+        self.timings.download = max(self.elapsed() - self.timings.ttfb, 0.0)
+        self.received = received
+        self.emit(BODY)
+
+    def _watch_stream(self, response):
+        """Complete the request once the streamed body has been read to the
+        end or the response has been closed."""
+        # httpx closes a response once its body has been read to the end
+        if hasattr(response, 'aclose'):
+            aclose = response.aclose
+
+            async def close_async():
+                try:
+                    await aclose()
+                finally:
+                    self.complete(response.num_bytes_downloaded)
+
+            response.aclose = close_async
+            return
+
+        iter_content, close = response.iter_content, response.close
+
+        def iter_counted(*args, **kwargs):
+            for chunk in iter_content(*args, **kwargs):
+                self.received += len(chunk)
+                yield chunk
+            self.complete(self.received)
+
+        def close_counted():
+            try:
+                close()
+            finally:
+                self.complete(self.received)
+
+        response.iter_content = iter_counted
+        response.close = close_counted
+
+    def load(self, response, loader: Callable[[Any], Any]):
+        """Decode the response body and create models out of it."""
+        started = time.monotonic()
+        try:
+            data = response.json()
+            decoded = time.monotonic()
+            result = loader(data)
+        except Exception as exc:
+            self.fail(exc)
+            raise
+
+        self.timings.decode = decoded - started
+        self.timings.load = time.monotonic() - decoded
+        self.emit(LOADED)
+
+        return result
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Get the trace of the request being sent by the current thread or
+    task, if it is traced."""
+    return _current.get()
+
+
+def trace_of(hooks: Hooks, response) -> RequestTrace:
+    """Get the trace of the response, starting a new one if it has none."""
+    trace = _traces.get(response)
+    if trace is None:
+        trace = RequestTrace(hooks, None, str(response.url))
+    return trace
+
+
+@lru_cache(maxsize=None)
+def _otel_trace():
+    """Import the OpenTelemetry trace API once it is used, if installed."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace
+
+
+class OpenTelemetryHooks:
+    """Reports requests as OpenTelemetry spans.
+
+    A span is started for each request and ended once the body has been
+    downloaded, a streamed response has been read or closed, or the request
+    has failed. Retries are added to it as span
+    events and the timings as attributes. Creating models is reported as a
+    separate ``airslate.load`` span.
+
+    .. code-block:: python
+
+       from opentelemetry import trace
+
+       OpenTelemetryHooks(trace.get_tracer('airslate')).install(client.hooks)
+    """
+
+    def __init__(self, tracer):
+        """Initialize a new :class:`OpenTelemetryHooks` object.
+
+        :param tracer: The OpenTelemetry tracer to start spans with.
+        """
+        self.tracer = tracer
+        self._callbacks = {
+            REQUEST: self.on_request,
+            RETRY: self.on_retry,
+            RESPONSE: self.on_response,
+            BODY: self.on_body,
+            LOADED: self.on_loaded,
+            ERROR: self.on_error,
+        }
+
+    def install(self, hooks: Hooks):
+        """Subscribe to the events of the hooks."""
+        for name, callback in self._callbacks.items():
+            hooks.subscribe(name, callback)
+
+    def uninstall(self, hooks: Hooks):
+        """Unsubscribe from the events of the hooks."""
+        for name, callback in self._callbacks.items():
+            hooks.unsubscribe(name, callback)
+
+    @staticmethod
+    def _timing_attributes(event: Event) -> dict:
+        return {f'airslate.timings.{name}': value
+                for name, value in event.timings.to_dict().items()}
+
+    def on_request(self, event: Event):
+        """Start the span of the request."""
+        event.context['span'] = self.tracer.start_span(
+            f'HTTP {event.method}',
+            attributes={
+                'http.request.method': event.method,
+                'url.full': event.url,
+            },
+        )
+
+    def on_retry(self, event: Event):
+        """Add the failed attempt to the span."""
+        span = event.context.get('span')
+        if span is not None:
+            span.add_event('retry', {'http.request.resend_count':
+                                     event.attempt})
+
+    def on_response(self, event: Event):
+        """Add the response status to the span."""
+        span = event.context.get('span')
+        if span is not None:
+            span.set_attribute('http.response.status_code', event.status)
+
+    def on_body(self, event: Event):
+        """End the span of the request."""
+        span = event.context.pop('span', None)
+        if span is not None:
+            span.set_attributes(self._timing_attributes(event))
+            span.end()
+            event.context['parent'] = span
+
+    def on_loaded(self, event: Event):
+        """Report creating models as a span of its own."""
+        duration = event.timings.decode + event.timings.load
+
+        options = {}
+        parent = event.context.get('parent')
+        otel_trace = _otel_trace()
+        if parent is not None and otel_trace is not None:
+            options['context'] = otel_trace.set_span_in_context(parent)
+
+        span = self.tracer.start_span(
+            'airslate.load',
+            start_time=time.time_ns() - int(duration * 1e9),
+            attributes=self._timing_attributes(event),
+            **options,
+        )
+        span.end()
+
+    def on_error(self, event: Event):
+        """Record the error and end the span of the request."""
+        span = event.context.pop('span', None)
+        if span is None:
+            return
+
+        span.record_exception(event.error)
+        span.set_attribute('error.type', type(event.error).__name__)
+        if event.status is not None:
+            span.set_attribute('http.response.status_code', event.status)
+        span.end()
@@ -0,0 +1,251 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Request metrics for airslate package.
+
+Metrics are collected out of the request lifecycle hooks, see
+:mod:`airslate.hooks`, and labeled with the request method and the endpoint
+template, e.g. ``/v1/organizations/{org_id}/settings``, rather than the raw
+URL, so that the number of series stays small. They are exported in the
+Prometheus text format.
+
+Classes:
+- Histogram: Cumulative histogram of observed values.
+- Metrics: Request metrics of one or several clients.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .hooks import BODY, ERROR, RETRY, Event, Hooks
+
+# Upper bounds of the request duration buckets in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Content type of the exported metrics
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative histogram of observed values.
+
+    >>> histogram = Histogram((0.1, 1.0))
+    >>> histogram.observe(0.05)
+    >>> histogram.observe(0.5)
+    >>> histogram.cumulative()
+    [(0.1, 1), (1.0, 2), (inf, 2)]
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize a new :class:`Histogram` object.
+
+        :param buckets: The sorted upper bounds of the buckets.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Account a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Get the number of values up to each bucket bound."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Metrics:  # pylint: disable=too-many-instance-attributes
+    """Request metrics of one or several clients.
+
+    Keeps a histogram of request durations, the number of responses of each
+    status, the number of retries, and the number of bytes sent and
+    received. Errors with no status, such as connection errors, are counted
+    under the ``error`` status. Each request is accounted once, even if its
+    response fails to load. Streamed responses are accounted once they have
+    been read to the end or closed.
+
+    >>> from airslate.client import Client
+    >>> client = Client()
+    >>> metrics = Metrics().install(client.hooks)
+    >>> metrics.export()
+    ''
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 prefix: str = 'airslate'):
+        """Initialize a new :class:`Metrics` object.
+
+        :param buckets: The upper bounds of the request duration buckets in
+            seconds.
+        :param prefix: The prefix of the exported metric names.
+        """
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, str], int] = {}
+        self.retries: Dict[Tuple[str, str], int] = {}
+        self.sent: Dict[Tuple[str, str], int] = {}
+        self.received: Dict[Tuple[str, str], int] = {}
+
+        self._lock = threading.Lock()
+
+    def install(self, hooks: Hooks) -> 'Metrics':
+        """Collect the metrics of the requests of the hooks."""
+        hooks.subscribe(BODY, self.on_complete)
+        hooks.subscribe(ERROR, self.on_complete)
+        hooks.subscribe(RETRY, self.on_retry)
+        return self
+
+    def uninstall(self, hooks: Hooks):
+        """Stop collecting the metrics of the requests of the hooks."""
+        hooks.unsubscribe(BODY, self.on_complete)
+        hooks.unsubscribe(ERROR, self.on_complete)
+        hooks.unsubscribe(RETRY, self.on_retry)
+
+    @staticmethod
+    def _labels(event: Event) -> Tuple[str, str]:
+        return event.method or 'GET', event.endpoint or event.url
+
+    def on_complete(self, event: Event):
+        """Account a finished request."""
+        # A response failing to load is an error emitted after its body,
+        # the request has been accounted already.
+        accounted = event.context.setdefault('metrics', [])
+        if self in accounted:
+            return
+        accounted.append(self)
+
+        labels = self._labels(event)
+        status = 'error' if event.status is None else str(event.status)
+
+        with self._lock:
+            histogram = self.durations.get(labels)
+            if histogram is None:
+                histogram = self.durations[labels] = Histogram(self.buckets)
+            histogram.observe(event.elapsed)
+
+            key = labels + (status,)
+            self.responses[key] = self.responses.get(key, 0) + 1
+            self.sent[labels] = self.sent.get(labels, 0) + event.sent
+            self.received[labels] = (self.received.get(labels, 0) +
+                                     event.received)
+
+    def on_retry(self, event: Event):
+        """Account a retried attempt."""
+        labels = self._labels(event)
+        with self._lock:
+            self.retries[labels] = self.retries.get(labels, 0) + 1
+
+    def clear(self):
+        """Drop all the collected metrics."""
+        with self._lock:
+            for series in (self.durations, self.responses, self.retries,
+                           self.sent, self.received):
+                series.clear()
+
+    def export(self) -> str:
+        """Export the metrics in the Prometheus text format.
+
+        Serve the result with the :data:`CONTENT_TYPE` content type.
+        """
+        with self._lock:
+            lines = []
+            self._export_durations(lines)
+            self._export_counter(
+                lines, 'responses_total', 'Responses by status.',
+                self.responses, ('method', 'endpoint', 'status'))
+            self._export_counter(
+                lines, 'retries_total', 'Retried attempts.',
+                self.retries, ('method', 'endpoint'))
+            self._export_counter(
+                lines, 'sent_bytes_total', 'Request body bytes sent.',
+                self.sent, ('method', 'endpoint'))
+            self._export_counter(
+                lines, 'received_bytes_total',
+                'Response body bytes received.',
+                self.received, ('method', 'endpoint'))
+
+        return ''.join(line + '\n' for line in lines)
+
+    def _export_durations(self, lines: List[str]):
+        if not self.durations:
+            return
+
+        name = f'{self.prefix}_request_duration_seconds'
+        lines.append(f'# HELP {name} Request duration in seconds.')
+        lines.append(f'# TYPE {name} histogram')
+
+        for labels, histogram in sorted(self.durations.items()):
+            base = _format_labels(('method', 'endpoint'), labels)
+            for bound, count in histogram.cumulative():
+                bucket = _format_labels(('le',), (_format_value(bound),))
+                lines.append(f'{name}_bucket{{{base},{bucket}}} {count}')
+            lines.append(f'{name}_sum{{{base}}} '
+                         f'{_format_value(histogram.sum)}')
+            lines.append(f'{name}_count{{{base}}} {histogram.count}')
+
+    def _export_counter(self, lines: List[str], suffix: str, text: str,
+                        series: dict, names: Tuple[str, ...]):
+        # pylint: disable=too-many-arguments
+        if not series:
+            return
+
+        name = f'{self.prefix}_{suffix}'
+        lines.append(f'# HELP {name} {text}')
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in sorted(series.items()):
+            lines.append(f'{name}{{{_format_labels(names, labels)}}} {value}')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format label pairs escaping the values.
+
+    >>> print(_format_labels(('endpoint', 'status'), ('/v1/"a"', 200)))
+    endpoint="/v1/\\"a\\"",status="200"
+    """
+    pairs = []
+    for name, value in zip(names, values):
+        value = (str(value).replace('\\', '\\\\').replace('"', '\\"')
+                 .replace('\n', '\\n'))
+        pairs.append(f'{name}="{value}"')
+    return ','.join(pairs)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value.
+
+    >>> _format_value(float('inf')), _format_value(0.25), _format_value(2.0)
+    ('+Inf', '0.25', '2.0')
+    """
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def create_metrics(options: dict, hooks: Hooks) -> Optional[Metrics]:
+    """Create the metrics configured by the client options.
+
+    Returns ``None`` if metrics are disabled.
+    """
+    if not options.get('metrics'):
+        return None
+
+    return Metrics().install(hooks)
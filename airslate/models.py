@@ -11,28 +11,183 @@ This module provides classes for representing various data models used by the
 HTTP client. These classes can be used for serializing and deserializing data
 between the client and server.
 
+Models with fields of scalar types only, e.g. :class:`Organization`, are
+converted to dictionaries by a shallow copy instead of
+:func:`dataclasses.asdict`, and are pickled as a tuple of field values.
+:func:`encode_models` and :func:`decode_models` convert lists of models to
+JSON and back, using ``orjson`` if it is installed.
+
 Classes:
 - Organization: Represents an organization in the airSlate API.
+- SlottedOrganization: Memory efficient variant of Organization.
+- OrganizationBatch: Column store of organizations.
 
 """
 
+import dataclasses
+import json
 from abc import ABCMeta
 from dataclasses import asdict, dataclass
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Field types which values are immutable and need no deep copy
+SCALAR_TYPES = frozenset((str, int, float, bool, datetime, date, type(None)))
+
+
+def _is_scalar_type(annotation) -> bool:
+    """Check whether the values of the annotated field are scalars.
+
+    >>> _is_scalar_type(Optional[str]), _is_scalar_type(List[str])
+    (True, False)
+    """
+    if get_origin(annotation) is Union:
+        return all(_is_scalar_type(arg) for arg in get_args(annotation))
+    return annotation in SCALAR_TYPES
+
+
+def _model_type(annotation) -> Optional[type]:
+    """Get the model class of the annotated field, if it holds a model.
+
+    >>> _model_type(Optional[Organization]), _model_type(dict)
+    (<class 'airslate.models.Organization'>, None)
+    """
+    if get_origin(annotation) is Union:
+        models = [arg for arg in get_args(annotation) if _model_type(arg)]
+        return models[0] if len(models) == 1 else None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _tuple_getter(names: Sequence[str]) -> Callable[[Any], tuple]:
+    """Create a function getting a tuple of the named attributes."""
+    # attrgetter() returns a single value instead of a tuple for one name
+    if len(names) == 1:
+        name = names[0]
+        return lambda obj: (getattr(obj, name),)
+    if not names:
+        return lambda obj: ()
+    return attrgetter(*names)
+
+
+class _ModelLayout(NamedTuple):
+    """Fields of a model class, computed once per class."""
+
+    names: tuple
+    values: Callable[[Any], tuple]
+    init_values: Callable[[Any], tuple]
+    flat: bool
+    nested: tuple
+
+
+@lru_cache(maxsize=None)
+def _model_layout(cls: type) -> _ModelLayout:
+    """Get the fields of the model class."""
+    fields = dataclasses.fields(cls)
+    names = tuple(f.name for f in fields)
+    init_names = tuple(f.name for f in fields if f.init)
+
+    # Resolve the forward references to the models declared later
+    hints = get_type_hints(cls)
+    models = {f.name: _model_type(hints[f.name]) for f in fields}
+
+    return _ModelLayout(
+        names=names,
+        values=_tuple_getter(names),
+        init_values=_tuple_getter(init_names),
+        flat=all(_is_scalar_type(f.type) for f in fields),
+        nested=tuple((name, model) for name, model in models.items()
+                     if model is not None),
+    )
+
+
+def _json_default(value):
+    """Encode the values unknown to :mod:`json` the way ``orjson`` does."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(
+        f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _dumps(obj) -> bytes:
+    """Encode the object to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)  # pylint: disable=no-member
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                      default=_json_default).encode('utf-8')
+
+
+def _loads(data: Union[bytes, str]):
+    """Decode the JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)  # pylint: disable=no-member
+    return json.loads(data)
 
 
 @dataclass(frozen=True)
 class BaseModel(metaclass=ABCMeta):
     """Base model class."""
 
+    __slots__ = ()
+
+    def __reduce__(self):
+        """Pickle the model as its class and a tuple of field values."""
+        cls = type(self)
+        return cls, _model_layout(cls).init_values(self)
+
     def __getstate__(self):
-        """Play nice with pickle."""
+        """Get the field values as a dictionary."""
         return self.to_dict()
 
+    def __setstate__(self, state):
+        """Restore the state of a frozen instance.
+
+        Models are no longer pickled with their state, this keeps loading
+        the ones pickled by previous versions.
+        """
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     def to_dict(self) -> dict:
-        """Convert this entity to a dictionary."""
-        return dict(asdict(self).items())
+        """Convert this entity to a dictionary.
+
+        Nested containers and models are copied recursively, unless the
+        model has fields of scalar types only.
+        """
+        layout = _model_layout(type(self))
+        if layout.flat:
+            return dict(zip(layout.names, layout.values(self)))
+        return asdict(self)
+
+    def to_json(self) -> bytes:
+        """Convert this entity to UTF-8 encoded JSON.
+
+        Date and time values are encoded in the ISO 8601 format.
+        """
+        return _dumps(self.to_dict())
 
 
 @dataclass(repr=False, frozen=True)
@@ -58,7 +213,7 @@ class OrganizationSettings(BaseModel):
     """Represent an organization settings in the airSlate API."""
 
     id: str  # pylint: disable=invalid-name
-    settings: dict
+    settings: 'OrganizationSettingsContent'
 
     def __repr__(self):
         """Provide an easy-to-read description of the current instance."""
@@ -77,5 +232,203 @@ class OrganizationSettingsContent(BaseModel):
 
     def __repr__(self):
         """Provide an easy-to-read description of the current instance."""
-        attrs = [k + ': ' + str(v) for k, v in self.__dict__.items()]
+        attrs = [f.name + ': ' + str(getattr(self, f.name))
+                 for f in dataclasses.fields(self)]
         return f'<OrganizationSettingsContent: {", ".join(attrs)}>'
+
+
+def slotted(cls: type, name: Optional[str] = None) -> type:
+    """Create a variant of the model class which stores fields in slots.
+
+    Instances of the created class have no ``__dict__``, which considerably
+    reduces memory used by large amount of models. Apart from that the class
+    behaves the same as the original one, but it is not a subclass of it.
+
+    >>> SlottedOrganizationSettings = slotted(OrganizationSettings)
+    >>> settings = SlottedOrganizationSettings(id='1', settings={})
+    >>> settings
+    <OrganizationSettings: id=1>
+    >>> hasattr(settings, '__dict__')
+    False
+    """
+    field_names = tuple(f.name for f in dataclasses.fields(cls))
+
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = field_names
+    for field_name in field_names:
+        # Defaults are kept by the generated __init__()
+        namespace.pop(field_name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+
+    name = name or f'Slotted{cls.__name__}'
+    namespace['__qualname__'] = name
+
+    return type(cls)(name, cls.__bases__, namespace)
+
+
+SlottedOrganization = slotted(Organization)
+
+
+def encode_models(models: Iterable[BaseModel]) -> bytes:
+    """Encode the models to a UTF-8 encoded JSON array of objects.
+
+    >>> encode_models([OrganizationSettings(id='1', settings={})])
+    b'[{"id":"1","settings":{}}]'
+    """
+    return _dumps([model.to_dict() for model in models])
+
+
+def decode_models(cls: type, data: Union[bytes, str]) -> List[BaseModel]:
+    """Decode models of the given class out of a JSON array of objects.
+
+    Values are created as they are decoded from JSON, e.g. dates are kept
+    as ISO 8601 strings, except for the objects of the fields holding
+    models, which are created as the models of the fields.
+    """
+    if not _model_layout(cls).nested:
+        return [cls(**row) for row in _loads(data)]
+
+    return [_from_dict(cls, row) for row in _loads(data)]
+
+
+def _from_dict(cls: type, row: dict) -> BaseModel:
+    """Create a model out of a decoded JSON object."""
+    for name, model in _model_layout(cls).nested:
+        value = row.get(name)
+        if isinstance(value, dict):
+            row[name] = _from_dict(model, value)
+    return cls(**row)
+
+
+class ModelBatch:
+    """Column store of models.
+
+    Each field of the :attr:`__model__` is stored in a separate list, so a
+    batch of rows takes a fraction of memory of the same amount of models.
+    Filtering by a field scans a single list instead of every model. Models
+    are created on demand, when a row is accessed.
+    """
+
+    __model__: type
+
+    # Fields with low cardinality which values are shared between rows
+    CATEGORICAL: tuple = ()
+
+    def __init__(self, columns: Dict[str, list]):
+        """Initialize a new batch from the lists of field values.
+
+        :param columns: A mapping of each model field to the list of values.
+        """
+        names = [f.name for f in dataclasses.fields(self.__model__)]
+        if set(columns) != set(names):
+            raise ValueError(
+                f'Columns do not match {self.__model__.__name__} fields')
+
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('Columns must have the same length')
+
+        self.columns = {name: columns[name] for name in names}
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> 'ModelBatch':
+        """Create a batch out of dictionaries of field values.
+
+        Optional fields missing in a row get their default values.
+        """
+        defaults = {}
+        for field in dataclasses.fields(cls.__model__):
+            if field.default is not dataclasses.MISSING:
+                defaults[field.name] = field.default
+
+        columns: Dict[str, list] = {
+            f.name: [] for f in dataclasses.fields(cls.__model__)}
+        shared: Dict[Any, Any] = {}
+        categorical = set(cls.CATEGORICAL)
+
+        appenders = [(name, values.append, name in categorical)
+                     for name, values in columns.items()]
+        for row in rows:
+            for name, append, is_categorical in appenders:
+                value = row[name] if name in row else defaults[name]
+                if is_categorical:
+                    value = shared.setdefault(value, value)
+                append(value)
+
+        return cls(columns)
+
+    @classmethod
+    def from_models(cls, models: Iterable[BaseModel]) -> 'ModelBatch':
+        """Create a batch out of model instances."""
+        names = [f.name for f in dataclasses.fields(cls.__model__)]
+        return cls.from_rows(
+            {name: getattr(model, name) for name in names}
+            for model in models
+        )
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for i in range(self._length):
+            yield self.row(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(range(*key.indices(self._length)))
+        return self.row(key)
+
+    def __repr__(self):
+        return f'<{type(self).__name__}: {self._length} rows>'
+
+    def row(self, index: int) -> BaseModel:
+        """Create a model out of the row with the given index."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('Batch index out of range')
+
+        return self.__model__(**{
+            name: values[index] for name, values in self.columns.items()})
+
+    def column(self, name: str) -> list:
+        """Get the list of values of the given field."""
+        return self.columns[name]
+
+    def take(self, indices: Iterable[int]) -> 'ModelBatch':
+        """Create a batch out of the rows with the given indices."""
+        indices = list(indices)
+        return type(self)({
+            name: [values[i] for i in indices]
+            for name, values in self.columns.items()
+        })
+
+    def where(self, name: str,
+              predicate: Callable[[Any], bool]) -> 'ModelBatch':
+        """Select rows which value of the given field matches the predicate.
+
+        >>> batch = OrganizationBatch.from_rows([
+        ...     {'id': '1', 'name': 'Acme', 'subdomain': 'acme',
+        ...      'status': 'FINISHED', 'created_at': '', 'updated_at': ''},
+        ...     {'id': '2', 'name': 'Corp', 'subdomain': 'corp',
+        ...      'status': 'DELETED', 'created_at': '', 'updated_at': ''},
+        ... ])
+        >>> batch.where('status', lambda s: s == 'FINISHED').column('id')
+        ['1']
+        """
+        values = self.columns[name]
+        return self.take(i for i, v in enumerate(values) if predicate(v))
+
+    def to_models(self) -> List[BaseModel]:
+        """Create a list of models out of all rows."""
+        return list(self)
+
+
+class OrganizationBatch(ModelBatch):
+    """Column store of :class:`Organization` models."""
+
+    __model__ = Organization
+
+    CATEGORICAL = ('status', 'category', 'size')
@@ -0,0 +1,153 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Client options handling for airslate package.
+
+The client options are compiled into a :class:`RequestTemplate` once, which
+splits them into query, parameter and request options in advance, so that a
+request only overlays its own options on top of the template instead of
+merging and filtering all the client options several times. The template is
+compiled again once the options are modified.
+
+Classes:
+- Options: Client options dictionary counting its modifications.
+- RequestTemplate: Client options compiled for sending requests.
+"""
+
+from typing import AbstractSet, Mapping, Optional
+
+from asdicts.dict import intersect_keys, merge
+
+from .utils import default_headers
+
+
+class Options(dict):
+    """Client options dictionary counting its modifications.
+
+    >>> options = Options(timeout=5.0)
+    >>> options['timeout'] = 10.0
+    >>> options.revision
+    1
+    """
+
+    __slots__ = ('revision',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.revision = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.revision += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.revision += 1
+
+    def clear(self):
+        super().clear()
+        self.revision += 1
+
+    def pop(self, *args):
+        self.revision += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.revision += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.revision += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.revision += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+def overlay(target: dict, options: Mapping,
+            keys: Optional[AbstractSet[str]] = None,
+            invert: bool = False) -> dict:
+    """Update the target with the options selected by keys.
+
+    Nested dictionaries are merged, everything else is replaced. Selects all
+    the options if ``keys`` is ``None``, the ones not in ``keys`` if
+    ``invert`` is set. Returns the target.
+
+    >>> overlay({'a': 1, 'h': {'x': 1}}, {'h': {'y': 2}, 'b': 2}, {'h'})
+    {'a': 1, 'h': {'x': 1, 'y': 2}}
+    """
+    for key, value in options.items():
+        if keys is not None and (key in keys) is invert:
+            continue
+
+        previous = target.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            value = merge(previous, value)
+        target[key] = value
+
+    return target
+
+
+def overlay_headers(headers: Mapping[str, str],
+                    override: Mapping[str, str]) -> dict:
+    """Overlay headers on a copy of the default ones, names are compared
+    case-insensitively.
+
+    >>> overlay_headers({'User-Agent': 'a', 'Accept': 'b'},
+    ...                 {'user-agent': 'c'})
+    {'Accept': 'b', 'user-agent': 'c'}
+    """
+    result = dict(headers)
+    if not override:
+        return result
+
+    names = {name.lower(): name for name in result}
+    for name, value in override.items():
+        previous = names.get(name.lower())
+        if previous is not None and previous != name:
+            del result[previous]
+        result[name] = value
+        names[name.lower()] = name
+
+    return result
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class RequestTemplate:
+    """Client options compiled for sending requests."""
+
+    __slots__ = ('revision', 'query', 'parameters', 'request', 'base_url',
+                 'keep_alive', 'headers', 'get_headers')
+
+    def __init__(self, options: Options, query_keys: AbstractSet[str],
+                 request_keys: AbstractSet[str], all_keys: AbstractSet[str]):
+        """Initialize a new :class:`RequestTemplate` object.
+
+        :param options: The client options.
+        :param query_keys: The names of the query string options.
+        :param request_keys: The names of the options passed to the session.
+        :param all_keys: The names of all the known options, others are
+            request parameters.
+        """
+        self.revision = options.revision
+
+        self.query = intersect_keys(options, query_keys)
+        self.parameters = intersect_keys(options, all_keys, invert=True)
+        self.request = intersect_keys(options, request_keys)
+        self.base_url = options['base_url'].rstrip('/')
+        self.keep_alive = options['keep_alive']
+
+        # Headers of POST, PUT and PATCH requests, and of the other ones
+        self.headers = dict(default_headers())
+        self.get_headers = {name: value
+                            for name, value in self.headers.items()
+                            if name.lower() != 'content-type'}
@@ -0,0 +1,233 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Client-side rate limiting for airslate package.
+
+Requests are paced by a token bucket before they are sent, instead of
+finding out about the API rate limit from ``429 Too Many Requests``
+responses. The bucket adjusts itself to the ``Retry-After`` and rate limit
+headers of the responses. The responses of the attempts retried by the
+session adjust the bucket and the retries are paced by it as well.
+
+Classes:
+- RateLimitStats: Rate limiter usage counters.
+- RateLimiter: Token bucket rate limiter.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Mapping, Optional
+
+# Rate limit headers, the former are sent by most APIs, the latter are
+# defined by the IETF draft.
+REMAINING_HEADERS = ('X-RateLimit-Remaining', 'RateLimit-Remaining')
+RESET_HEADERS = ('X-RateLimit-Reset', 'RateLimit-Reset')
+
+# Reset values above this one are epoch timestamps, not delays in seconds
+EPOCH_THRESHOLD = 10 ** 9
+
+# The rate limiter of the request being sent by the current thread or task
+_current: ContextVar[Optional['RateLimiter']] = ContextVar(
+    'airslate_rate_limiter', default=None)
+
+
+def parse_delay(value: Optional[str], now: float = None) -> Optional[float]:
+    """Parse a delay in seconds or a date into the number of seconds to wait.
+
+    >>> parse_delay('2')
+    2.0
+    >>> parse_delay('1700000010', now=1700000000)
+    10.0
+    >>> parse_delay('Wed, 21 Oct 2015 07:28:00 GMT', now=1445412470)
+    10.0
+    >>> parse_delay('soon') is None
+    True
+    """
+    if value is None:
+        return None
+
+    now = time.time() if now is None else now
+
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - now
+        except (TypeError, ValueError):
+            return None
+    else:
+        if delay > EPOCH_THRESHOLD:
+            delay -= now
+
+    return max(delay, 0.0)
+
+
+@dataclass
+class RateLimitStats:
+    """Rate limiter usage counters.
+
+    ``requests`` is the number of paced requests, ``delayed`` the number of
+    them which had to wait, and ``wait_time`` and ``max_wait`` the total and
+    the longest wait in seconds.
+    """
+
+    requests: int = 0
+    delayed: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert the counters to a dictionary."""
+        return asdict(self)
+
+
+class RateLimiter:
+    """Token bucket rate limiter shared by all the users of a client.
+
+    The bucket holds up to ``burst`` tokens and is refilled with ``rate``
+    tokens per second. Each request takes a token, waiting for it if the
+    bucket is empty. Responses telling the rate limit is exhausted pause the
+    bucket until the limit is reset.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """Initialize a new :class:`RateLimiter` object.
+
+        :param rate: The number of requests allowed per second.
+        :param burst: The number of requests allowed to be sent at once.
+            Defaults to ``rate`` rounded up.
+        """
+        if rate <= 0:
+            raise ValueError('Rate must be positive')
+
+        self.rate = float(rate)
+        self.burst = burst or max(int(-(-rate // 1)), 1)
+        self.stats = RateLimitStats()
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return the number of seconds to wait for it.
+
+        The token is taken right away, so that the requests waiting in
+        parallel are spread over time instead of being sent together.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            self._tokens -= 1.0
+            delay = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            delay = max(delay, self._paused_until - now)
+
+            self.stats.requests += 1
+            if delay > 0:
+                self.stats.delayed += 1
+                self.stats.wait_time += delay
+                self.stats.max_wait = max(self.stats.max_wait, delay)
+
+            return delay
+
+    def acquire(self) -> float:
+        """Wait for a token and return the number of seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given number of seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+
+    def update(self, status_code: int, headers: Mapping[str, str]):
+        """Adjust the bucket to the rate limit headers of a response."""
+        if status_code in (429, 503):
+            delay = parse_delay(headers.get('Retry-After'))
+            if delay is not None:
+                self.pause(delay)
+                return
+
+        remaining = _first_header(headers, REMAINING_HEADERS)
+        if remaining is None:
+            return
+
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+
+        if remaining <= 0:
+            delay = parse_delay(_first_header(headers, RESET_HEADERS))
+            self.pause(1.0 / self.rate if delay is None else delay)
+            return
+
+        # The server may be shared with other clients, never spend more
+        # tokens than it still allows.
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+
+
+def _first_header(headers: Mapping[str, str], names) -> Optional[str]:
+    for name in names:
+        if name in headers:
+            return headers[name]
+    return None
+
+
+@contextmanager
+def pacing(limiter: Optional[RateLimiter]) -> Iterator[None]:
+    """Pace the retries of the requests sent by the current thread or task
+    with the rate limiter."""
+    token = _current.set(limiter)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_rate_limiter() -> Optional[RateLimiter]:
+    """Get the rate limiter of the request being sent by the current thread
+    or task, if it is paced."""
+    return _current.get()
+
+
+def observe_retried(status: int, headers: Mapping[str, str]):
+    """Adjust the rate limiter of the current request to a response retried
+    by the session.
+
+    The client sees the last response only, the responses of the retried
+    attempts reach the rate limiter through the session.
+    """
+    limiter = _current.get()
+    if limiter is not None:
+        limiter.update(status, headers)
+
+
+def create_rate_limiter(options: dict) -> Optional[RateLimiter]:
+    """Create the rate limiter configured by the client options.
+
+    Returns ``None`` if rate limiting is disabled.
+    """
+    if not options.get('rate_limit'):
+        return None
+
+    return RateLimiter(options['rate_limit'], options.get('rate_limit_burst'))
@@ -12,13 +12,258 @@ classes within airslate package.
 
 """
 
+import functools
+import math
+import random
+import time
 from abc import ABCMeta
-from typing import TYPE_CHECKING
+from concurrent.futures import FIRST_COMPLETED, Executor, Future
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from airslate.exceptions import ApiError
+from airslate.hooks import trace_of
 
 if TYPE_CHECKING:
     from airslate.client import Client
 
 
+def last_page(response_data: dict) -> Optional[int]:
+    """Get the number of the last page from the pagination metadata.
+
+    Returns ``None`` if the response does not provide enough metadata.
+
+    >>> last_page({'meta': {'last_page': 3}})
+    3
+    >>> last_page({'meta': {'total': 5, 'per_page': 2}})
+    3
+    >>> last_page({'meta': {'total': 0, 'per_page': 2}})
+    1
+    >>> last_page({'meta': {}}) is None
+    True
+    """
+    meta = response_data.get('meta') or {}
+    if 'last_page' in meta:
+        return int(meta['last_page'])
+
+    if 'total' in meta and 'per_page' in meta:
+        pages = math.ceil(int(meta['total']) / int(meta['per_page']))
+        return max(pages, 1)
+
+    return None
+
+
+def has_next_page(response_data: dict, page: int,
+                  per_page: Optional[int] = None) -> bool:
+    """Check whether there is a page after the given one.
+
+    The decision is based on the pagination metadata of the response if the
+    API provides one, otherwise the pages are followed until a short or an
+    empty page is received.
+
+    >>> has_next_page({'data': [{}], 'meta': {'last_page': 3}}, 2)
+    True
+    >>> has_next_page({'data': [{}], 'meta': {'last_page': 3}}, 3)
+    False
+    >>> has_next_page({'data': [{}], 'meta': {'total': 4, 'per_page': 2}}, 2)
+    False
+    >>> has_next_page({'data': [{}], 'links': {'next': None}}, 1)
+    False
+    >>> has_next_page({'data': [{}, {}]}, 1, per_page=2)
+    True
+    >>> has_next_page({'data': [{}]}, 1, per_page=2)
+    False
+    >>> has_next_page({'data': []}, 1)
+    False
+    """
+    last = last_page(response_data)
+    if last is not None:
+        return page < last
+
+    links = response_data.get('links') or {}
+    if 'next' in links:
+        return bool(links['next'])
+
+    data = response_data.get('data') or []
+    if per_page is not None:
+        return len(data) >= int(per_page)
+
+    return len(data) > 0
+
+
+def fetch_concurrently(fetch: Callable[[int], dict], numbers: Iterable[int],
+                       concurrency=4, retries=2,
+                       backoff=0.5) -> Dict[int, dict]:
+    """Call ``fetch`` for each page number using a pool of threads.
+
+    The pages failed with an API error are requested again, up to
+    ``retries`` times, then the error of the first failed page is raised.
+    Retries are delayed with decorrelated jitter: the first delay is picked
+    at random up to ``backoff`` seconds, each next one between ``backoff``
+    and three times the previous delay. Returns a mapping of page numbers to
+    their contents.
+    """
+    pages: Dict[int, dict] = {}
+    pending = list(numbers)
+    errors: Dict[int, ApiError] = {}
+    delay = 0.0
+
+    with ThreadPoolExecutor(max_workers=max(int(concurrency), 1)) as pool:
+        for attempt in range(max(int(retries), 0) + 1):
+            if not pending:
+                break
+
+            if attempt:
+                delay = random.uniform(backoff if delay else 0.0,
+                                       max(backoff, delay * 3))
+                time.sleep(delay)
+
+            futures = {n: pool.submit(fetch, n) for n in pending}
+            errors = {}
+            for number, future in futures.items():
+                try:
+                    pages[number] = future.result()
+                except ApiError as exc:
+                    errors[number] = exc
+
+            # Retry only the pages which have failed
+            pending = sorted(errors)
+
+    if errors:
+        raise errors[min(errors)]
+
+    return pages
+
+
+@dataclass
+class BulkResult:
+    """The outcome of one of the requests of a bulk operation.
+
+    Holds either the ``value`` returned for the ``key`` or the ``error`` the
+    request has failed with.
+    """
+
+    key: Hashable
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request has succeeded."""
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """Get the value, raising the error if the request has failed."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def map_concurrently(call: Callable[[Any], Any], keys: Iterable[Hashable],
+                     concurrency=4,
+                     executor: Optional[Executor] = None
+                     ) -> Iterator[BulkResult]:
+    """Call ``call`` for each key using a pool of threads.
+
+    Yields a :class:`BulkResult` of each key as soon as its call completes,
+    so the results come in the completion order. At most ``concurrency``
+    calls run at once and the keys are consumed as calls complete, hence a
+    long iterable of keys is never held in memory. A failed call does not
+    stop the others, its result holds the error. Duplicate keys are called
+    once. The calls run in ``executor`` if it is given, otherwise in a pool
+    of threads of their own.
+    """
+    workers = max(int(concurrency), 1)
+    keys = iter(keys)
+    seen = set()
+
+    owned = executor is None
+    if owned:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+
+    def submit():
+        for key in keys:
+            if key not in seen:
+                seen.add(key)
+                pending[executor.submit(call, key)] = key
+                return
+
+    try:
+        for _ in range(workers):
+            submit()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                submit()
+                yield _bulk_result(key, future)
+    finally:
+        # The caller may stop iterating early: do not start the calls which
+        # are still queued.
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
+
+
+def _bulk_result(key: Hashable, future: Future) -> BulkResult:
+    """Create the result of the completed call of the key."""
+    try:
+        return BulkResult(key, value=future.result())
+    except Exception as exc:  # pylint: disable=broad-except
+        return BulkResult(key, error=exc)
+
+
+def background(method: Callable) -> Callable:
+    """Create a variant of the resource method running in the background.
+
+    The variant returns a :class:`concurrent.futures.Future` of the result of
+    the method called by the client pool of threads, see
+    :meth:`airslate.client.Client.submit_call`.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.client.submit_call(method, self, *args, **kwargs)
+
+    wrapper.__doc__ = (f'Run :meth:`{method.__name__}` in the background, '
+                       'returning a Future of its result.')
+    return wrapper
+
+
+class Endpoint(str):
+    """Path of an API endpoint remembering the template it was built from.
+
+    The template, e.g. ``/v1/organizations/{org_id}/settings``, identifies
+    the endpoint regardless of the resource requested, so that metrics and
+    latencies are kept per endpoint rather than per URL.
+
+    >>> endpoint = Endpoint('/v1/organizations/1/settings',
+    ...                     '/v1/organizations/{org_id}/settings')
+    >>> endpoint
+    '/v1/organizations/1/settings'
+    >>> endpoint.template
+    '/v1/organizations/{org_id}/settings'
+    """
+
+    def __new__(cls, path: str, template: Optional[str] = None):
+        endpoint = super().__new__(cls, path)
+        endpoint.template = str(path) if template is None else template
+        return endpoint
+
+
 # pylint: disable=too-few-public-methods
 class BaseResource(metaclass=ABCMeta):
     """Base resource class."""
@@ -30,14 +275,117 @@ class BaseResource(metaclass=ABCMeta):
         self.client = client
         self.api_version = api_version or BaseResource.API_VERSION
 
-    def resolve_endpoint(self, path: str) -> str:
+    def resolve_endpoint(self, path: str, **params) -> Endpoint:
         """Resolve resource endpoint taking into account API version.
 
+        The ``path`` is a template filled in with ``params``, the template is
+        kept as :attr:`Endpoint.template` of the result.
+
         >>> from airslate.client import Client
         >>> resource = BaseResource(Client())
         >>> resource.resolve_endpoint('/foo')
         '/v1/foo'
         >>> resource.resolve_endpoint('foo/bar/0/baz')
         '/v1/foo/bar/0/baz'
+        >>> endpoint = resource.resolve_endpoint('foo/{foo_id}', foo_id=1)
+        >>> endpoint, endpoint.template
+        ('/v1/foo/1', '/v1/foo/{foo_id}')
         """
-        return f"/{self.api_version}/{path.lstrip('/')}"
+        template = f"/{self.api_version}/{path.lstrip('/')}"
+        if not params:
+            return Endpoint(template)
+
+        return Endpoint(template.format(**params), template)
+
+    def load(self, response, loader: Callable[[dict], Any]):
+        """Decode the response and create models out of it using ``loader``.
+
+        The time spent is reported to the ``loaded`` hook of the client.
+        """
+        hooks = getattr(self.client, 'hooks', None)
+        if not hooks:
+            return loader(response.json())
+
+        return trace_of(hooks, response).load(response, loader)
+
+    def paginate(self, path: str, prefetch=False, **options) -> Iterator[dict]:
+        """Iterate over the pages of a collection endpoint.
+
+        Yields decoded response of each page, starting with the page given
+        by the ``page`` option (the first page by default). The next page is
+        requested only when the current one is consumed, unless ``prefetch``
+        is set: then the next page is downloaded in the background while the
+        caller processes the current one.
+        """
+        url = self.resolve_endpoint(path)
+        page = int(options.pop('page', 1))
+        per_page = options.get('per_page')
+
+        def fetch(number):
+            return self.client.get(url, page=number, **options).json()
+
+        if not prefetch:
+            while True:
+                response_data = fetch(page)
+                yield response_data
+
+                if not has_next_page(response_data, page, per_page):
+                    return
+                page += 1
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(fetch, page)
+        try:
+            while future is not None:
+                response_data = future.result()
+
+                future = None
+                if has_next_page(response_data, page, per_page):
+                    page += 1
+                    future = executor.submit(fetch, page)
+
+                yield response_data
+        finally:
+            # The caller may stop iterating early: do not wait for the page
+            # that is being prefetched.
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def fetch_pages(self, path: str, concurrency=4, page_retries=2,
+                    **options) -> List[dict]:
+        """Download all the pages of a collection endpoint concurrently.
+
+        The first page is requested to find out the number of the last page,
+        the remaining pages are then requested using at most ``concurrency``
+        threads. The pages failed with an API error are requested again, up
+        to ``page_retries`` times, before the error is raised. Returns
+        decoded responses in page order.
+
+        If the response does not provide pagination metadata the pages are
+        requested one by one.
+        """
+        url = self.resolve_endpoint(path)
+        first = int(options.pop('page', 1))
+
+        def fetch(number):
+            return self.client.get(url, page=number, **options).json()
+
+        response_data = fetch(first)
+        last = last_page(response_data)
+        if last is None:
+            if not has_next_page(response_data, first,
+                                 options.get('per_page')):
+                return [response_data]
+            return [response_data] + list(
+                self.paginate(path, page=first + 1, **options))
+
+        pages = fetch_concurrently(
+            fetch,
+            range(first + 1, last + 1),
+            concurrency,
+            page_retries,
+        )
+        pages[first] = response_data
+
+        return [pages[n] for n in sorted(pages)]
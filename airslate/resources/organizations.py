@@ -7,18 +7,55 @@
 
 """Organizations API resource module."""
 
-from typing import List
+from typing import Dict, Iterable, Iterator, List
 
 from airslate.exceptions import MissingData
 from airslate.models import (
     Organization,
+    OrganizationBatch,
     OrganizationSettings
 )
-from airslate.schemas import (
-    OrganizationSchema,
-    OrganizationSettingSchema,
-)
-from . import BaseResource
+from airslate.streaming import iter_data
+from . import BaseResource, BulkResult, background, map_concurrently
+
+
+def get_loader(name: str):
+    """Get the loader of the schema of :mod:`airslate.schemas`.
+
+    marshmallow takes longer to import than the rest of the package, so the
+    schemas are imported once the first response is loaded.
+    """
+    # pylint: disable=import-outside-toplevel
+    from airslate import schemas
+
+    return schemas.get_loader(getattr(schemas, name))
+
+
+def load_collection(response_data: dict) -> List[Organization]:
+    """Create a list of :class:`Organization` from the response data."""
+    if 'data' not in response_data:
+        raise MissingData()
+
+    return get_loader('OrganizationSchema').load_many(response_data['data'])
+
+
+def load_batch(pages: Iterable[dict]) -> OrganizationBatch:
+    """Create an :class:`OrganizationBatch` from the pages response data."""
+    loader = get_loader('OrganizationSchema')
+
+    def rows():
+        for response_data in pages:
+            if 'data' not in response_data:
+                raise MissingData()
+            for item in response_data['data']:
+                yield loader.load_fields(item)
+
+    return OrganizationBatch.from_rows(rows())
+
+
+def load_settings(response_data: dict) -> OrganizationSettings:
+    """Create an :class:`OrganizationSettings` from the response data."""
+    return get_loader('OrganizationSettingSchema').load(response_data)
 
 
 class Organizations(BaseResource):
@@ -29,18 +66,130 @@ class Organizations(BaseResource):
         url = self.resolve_endpoint('organizations')
         response = self.client.get(url, **options)
 
-        schema = OrganizationSchema()
-        response_data = response.json()
-        if 'data' not in response_data:
-            raise MissingData()
+        return self.load(response, load_collection)
+
+    def iter_collection(self, prefetch=False,
+                        **options) -> Iterator[Organization]:
+        """Iterate over all Organizations that the current user belongs to.
+
+        Pages are requested lazily, as the iteration goes. If ``prefetch`` is
+        set, the next page is downloaded in the background while the current
+        one is processed.
+        """
+        for response_data in self.paginate('organizations', prefetch,
+                                           **options):
+            yield from load_collection(response_data)
+
+    def stream_collection(self, **options) -> Iterator[Organization]:
+        """Iterate over a page of Organizations while it is being downloaded.
+
+        Items of the ``data`` array are decoded one at a time as soon as they
+        are received, so the whole response body is never held in memory.
+        """
+        url = self.resolve_endpoint('organizations')
+        options['stream'] = True
+        response = self.client.get(url, **options)
+
+        loader = get_loader('OrganizationSchema')
+        with response:
+            for item in iter_data(response.iter_content(chunk_size=None)):
+                yield loader.load(item)
 
-        return [schema.load(p) for p in response_data['data']]
+    def collection_all(self, concurrency=4, page_retries=2,
+                       **options) -> List[Organization]:
+        """Get all Organizations that the current user belongs to.
+
+        Once the first page tells the number of pages, the remaining pages
+        are requested concurrently using at most ``concurrency`` threads.
+        Failed pages are requested again up to ``page_retries`` times.
+        """
+        pages = self.fetch_pages('organizations', concurrency, page_retries,
+                                 **options)
+
+        return [o for page in pages for o in load_collection(page)]
+
+    def collection_batch(self, all_pages=False, concurrency=4,
+                         page_retries=2, **options) -> OrganizationBatch:
+        """Get Organizations that the current user belongs to as a batch.
+
+        The items are stored column by column, see :class:`OrganizationBatch`,
+        which is considerably more compact than a list of models. If
+        ``all_pages`` is set, all pages are requested the same way as
+        :meth:`collection_all` does, otherwise only the requested one.
+        """
+        if all_pages:
+            pages = self.fetch_pages('organizations', concurrency,
+                                     page_retries, **options)
+        else:
+            url = self.resolve_endpoint('organizations')
+            pages = [self.client.get(url, **options).json()]
+
+        return load_batch(pages)
 
     def settings(self, org_id: str, **kwargs) -> OrganizationSettings:
         """Retrieve the settings of the Organization."""
-        url = self.resolve_endpoint(f'organizations/{org_id}/settings')
+        url = self.resolve_endpoint('organizations/{org_id}/settings',
+                                    org_id=org_id)
         response = self.client.get(url, **kwargs)
 
-        schema = OrganizationSettingSchema()
-        response_data = response.json()
-        return schema.load(response_data)
+        return self.load(response, load_settings)
+
+    def iter_settings(self, org_ids: Iterable[str], concurrency=4,
+                      **kwargs) -> Iterator[BulkResult]:
+        """Retrieve the settings of many Organizations concurrently.
+
+        Yields a :class:`airslate.resources.BulkResult` keyed by the
+        Organization ID as soon as each request completes, holding either the
+        :class:`OrganizationSettings` or the error the request has failed
+        with, so that a failed Organization does not abort the others. At
+        most ``concurrency`` requests are sent at once, each of them retried
+        according to the client retry policy. They are sent by the client
+        pool of ``background_workers`` threads unless ``concurrency`` is
+        higher, then by a pool of their own. Keep ``pool_maxsize`` client
+        option not lower than ``concurrency`` to reuse the connections.
+        """
+        return map_concurrently(
+            lambda org_id: self.settings(org_id, **kwargs),
+            org_ids,
+            concurrency,
+            self.client.shared_executor(concurrency),
+        )
+
+    def settings_many(self, org_ids: Iterable[str], concurrency=4,
+                      **kwargs) -> Dict[str, BulkResult]:
+        """Retrieve the settings of many Organizations concurrently.
+
+        Works the same way as :meth:`iter_settings` does, but waits for all
+        the requests and returns a mapping of Organization IDs to their
+        results in the order of ``org_ids``.
+        """
+        org_ids = list(dict.fromkeys(org_ids))
+        results = {result.key: result for result in
+                   self.iter_settings(org_ids, concurrency, **kwargs)}
+
+        return {org_id: results[org_id] for org_id in org_ids}
+
+    collection_async = background(collection)
+    collection_all_async = background(collection_all)
+    collection_batch_async = background(collection_batch)
+    settings_async = background(settings)
+    settings_many_async = background(settings_many)
+
+
+class AsyncOrganizations(BaseResource):
+    """Represent Organizations API resource for the asynchronous client."""
+
+    async def collection(self, **options) -> List[Organization]:
+        """Get a list of all Organizations that the current user belongs to."""
+        url = self.resolve_endpoint('organizations')
+        response = await self.client.get(url, **options)
+
+        return self.load(response, load_collection)
+
+    async def settings(self, org_id: str, **kwargs) -> OrganizationSettings:
+        """Retrieve the settings of the Organization."""
+        url = self.resolve_endpoint('organizations/{org_id}/settings',
+                                    org_id=org_id)
+        response = await self.client.get(url, **kwargs)
+
+        return self.load(response, load_settings)
@@ -7,18 +7,36 @@
 
 """Schemas for handling (de)serialized model representation."""
 
-from marshmallow import fields, post_load, EXCLUDE, Schema
+import dataclasses
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Type
+
+from marshmallow import fields, missing, post_load, EXCLUDE, Schema
 
 from .models import (
+    BaseModel,
     Organization,
     OrganizationSettings,
     OrganizationSettingsContent,
 )
 
 
-class OrganizationSchema(Schema):
+class BaseSchema(Schema):
+    """Base schema which creates an instance of the :attr:`__model__`."""
+
+    __model__: Type[BaseModel]
+
+    @post_load
+    def make(self, data, **_kwargs):
+        """Create a :attr:`__model__` instance."""
+        return self.__model__(**data)
+
+
+class OrganizationSchema(BaseSchema):
     """Schema for :class:`Organization` model."""
 
+    __model__ = Organization
+
     class Meta:  # pylint: disable=too-few-public-methods
         """Metaclass to setup :class:`OrganizationSchema`."""
 
@@ -34,15 +52,12 @@ class OrganizationSchema(Schema):
     created_at = fields.Str(required=True)
     updated_at = fields.Str(required=True)
 
-    @post_load
-    def make(self, data, **_kwargs):
-        """Create a :class:`Organization` instance."""
-        return Organization(**data)
 
-
-class OrganizationSettingContentSchema(Schema):
+class OrganizationSettingContentSchema(BaseSchema):
     """Schema for :class:`OrganizationSettingsContent` model."""
 
+    __model__ = OrganizationSettingsContent
+
     class Meta:  # pylint: disable=too-few-public-methods
         """Create a :class:`OrganizationSettingContentSchema`."""
 
@@ -54,15 +69,12 @@ class OrganizationSettingContentSchema(Schema):
     allow_reusable_flow = fields.Bool(required=True)
     verified_domains = fields.List(fields.Str(), required=True)
 
-    @post_load
-    def make(self, data, **_kwargs) -> OrganizationSettingsContent:
-        """Create a :class:`OrganizationSettingsContent` instance."""
-        return OrganizationSettingsContent(**data)
-
 
-class OrganizationSettingSchema(Schema):
+class OrganizationSettingSchema(BaseSchema):
     """Schema for :class:`OrganizationSettings` model."""
 
+    __model__ = OrganizationSettings
+
     class Meta:  # pylint: disable=too-few-public-methods
         """Metaclass to setup :class:`OrganizationSettingSchema`."""
 
@@ -71,7 +83,224 @@ class OrganizationSettingSchema(Schema):
     id = fields.Str(required=True)
     settings = fields.Nested(OrganizationSettingContentSchema)
 
-    @post_load
-    def make(self, data, **_kwargs) -> OrganizationSettings:
-        """Create a :class:`OrganizationSettings` instance."""
-        return OrganizationSettings(**data)
+
+class _Fallback(Exception):
+    """Raised when data has to be loaded by marshmallow itself."""
+
+
+def _load_str(value):
+    if isinstance(value, str):
+        return value
+    raise _Fallback()
+
+
+def _load_bool(value):
+    if value is True or value is False:
+        return value
+    raise _Fallback()
+
+
+def _load_str_list(value):
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return list(value)
+    raise _Fallback()
+
+
+def _hook_names(schema: Schema) -> List[str]:
+    """Get names of the processing hooks registered by the schema."""
+    names = []
+    hooks_map = schema._hooks  # pylint: disable=protected-access
+    for key, hooks in hooks_map.items():
+        # marshmallow 3 uses (tag, many) keys and method names as values,
+        # marshmallow 4 uses tag keys and (name, many, kwargs) as values
+        tag = key[0] if isinstance(key, tuple) else key
+        for hook in hooks:
+            name = hook[0] if isinstance(hook, tuple) else hook
+            names.append(f'{tag}:{name}')
+    return names
+
+
+def _model_factory(model: type) -> Callable[[dict], Any]:
+    """Create a function which instantiates the model from a dictionary.
+
+    Frozen dataclasses assign each field through ``object.__setattr__`` in
+    their ``__init__``, so the instance dictionary is filled directly
+    whenever it is safe to do so.
+    """
+    if (not dataclasses.is_dataclass(model) or
+            hasattr(model, '__post_init__') or
+            '__dict__' not in dir(model)):
+        return lambda data: model(**data)
+
+    defaults = {}
+    required = set()
+    for field in dataclasses.fields(model):
+        if field.default is not dataclasses.MISSING:
+            defaults[field.name] = field.default
+        elif field.default_factory is not dataclasses.MISSING:
+            return lambda data: model(**data)
+        else:
+            required.add(field.name)
+
+    names = required | set(defaults)
+    new = object.__new__
+
+    def build(data):
+        if not required <= data.keys() or not data.keys() <= names:
+            # Let the model raise the proper error
+            return model(**data)
+
+        instance = new(model)
+        state = instance.__dict__
+        state.update(defaults)
+        state.update(data)
+        return instance
+
+    return build
+
+
+class SchemaLoader:
+    """Fast loader of models described by a :class:`BaseSchema`.
+
+    The loader inspects schema fields once and then validates and creates
+    models without walking marshmallow's field machinery for every item.
+    Only the features used by the schemas of this package are handled on
+    the fast path: required fields, ``allow_none``, unknown fields policy,
+    string, boolean, list of strings and nested fields. Any item which does
+    not pass the fast path checks is loaded by marshmallow itself, so the
+    validation errors and the results are the same as of
+    :meth:`marshmallow.Schema.load`.
+    """
+
+    FIELD_LOADERS = {
+        fields.String: _load_str,
+        fields.Boolean: _load_bool,
+    }
+
+    def __init__(self, schema_cls: Type[Schema]):
+        """Initialize a new :class:`SchemaLoader` object.
+
+        :param schema_cls: The schema class to load data with.
+        """
+        self.schema = schema_cls()
+        self.fields = []
+        self.known = set()
+        self.strict = self.schema.unknown != EXCLUDE
+        self.compiled = self._compile()
+        self.factory = None
+        if self.compiled:
+            self.factory = _model_factory(schema_cls.__model__)
+
+    def _compile(self) -> bool:
+        """Prepare field loaders, return ``False`` if not supported."""
+        if _hook_names(self.schema) != ['post_load:make']:
+            return False
+
+        if type(self.schema).make is not BaseSchema.make:
+            return False
+
+        for name, field in self.schema.load_fields.items():
+            loader = self._field_loader(field)
+            if loader is None:
+                return False
+
+            key = field.data_key or name
+            self.known.add(key)
+            self.fields.append((
+                field.attribute or name,
+                key,
+                loader,
+                field.required,
+                field.allow_none,
+            ))
+
+        return True
+
+    def _field_loader(self, field) -> Callable[[Any], Any]:
+        """Get a function to load value of the field."""
+        if field.validators or field.load_default is not missing:
+            return None
+
+        # Subclasses, e.g. Email or Url, deserialize values on their own
+        kind = type(field)
+        if kind in self.FIELD_LOADERS:
+            return self.FIELD_LOADERS[kind]
+
+        if (kind is fields.List and
+                self._field_loader(field.inner) is _load_str and
+                not field.inner.allow_none):
+            return _load_str_list
+
+        if (kind is fields.Nested and
+                not field.many and field.unknown is None and
+                isinstance(field.nested, type)):
+            nested = get_loader(field.nested)
+            if nested.compiled:
+                return nested.convert
+
+        return None
+
+    def convert(self, data):
+        """Load an item on the fast path or raise :class:`_Fallback`."""
+        return self.factory(self.convert_fields(data))
+
+    def convert_fields(self, data) -> dict:
+        """Load field values of an item or raise :class:`_Fallback`."""
+        if not isinstance(data, dict):
+            raise _Fallback()
+
+        if self.strict and not data.keys() <= self.known:
+            raise _Fallback()
+
+        result = {}
+        for attribute, key, loader, required, allow_none in self.fields:
+            if key not in data:
+                if required:
+                    raise _Fallback()
+                continue
+
+            value = data[key]
+            if value is None:
+                if not allow_none:
+                    raise _Fallback()
+                result[attribute] = None
+            else:
+                result[attribute] = loader(value)
+
+        return result
+
+    def load(self, data):
+        """Validate the item and create a model out of it."""
+        if self.compiled:
+            try:
+                return self.convert(data)
+            except _Fallback:
+                pass
+
+        return self.schema.load(data)
+
+    def load_fields(self, data) -> dict:
+        """Validate the item and return its field values without a model."""
+        if self.compiled:
+            try:
+                return self.convert_fields(data)
+            except _Fallback:
+                pass
+
+        model = self.schema.load(data)
+        return {f.name: getattr(model, f.name)
+                for f in dataclasses.fields(model)}
+
+    def load_many(self, items: Iterable) -> list:
+        """Validate the items and create a list of models out of them."""
+        load = self.load
+        return [load(item) for item in items]
+
+
+@lru_cache(maxsize=None)
+def get_loader(schema_cls: Type[Schema]) -> SchemaLoader:
+    """Get a :class:`SchemaLoader` of the schema class.
+
+    Loaders are created once per schema class and reused afterwards.
+    """
+    return SchemaLoader(schema_cls)
@@ -7,21 +7,348 @@
 
 """Session module for airslate package."""
 
+import random
+import threading
+import time
 import warnings
+import weakref
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-import jwt
 from requests import Session
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from requests.exceptions import RetryError, RequestException
-from requests_oauthlib import OAuth2Session
-from urllib3.exceptions import MaxRetryError
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import MaxRetryError, ResponseError
 from urllib3.util.retry import Retry
 
 from .exceptions import ApiError
+from .hooks import current_trace
+from .ratelimit import current_rate_limiter, observe_retried
+from .tokens import TokenStore
 from .utils import default_user_agent
 
 
+@lru_cache(maxsize=None)
+def retry_methods_param() -> str:
+    """Get the name of the init parameter of :class:`Retry` setting the
+    methods to retry.
+
+    urllib3 1.26.0 started issuing a DeprecationWarning for using the
+    'method_whitelist' init parameter of Retry and announced its removal in
+    version 2.0. The replacement parameter is 'allowed_methods'. The answer
+    does not change within a process, so it is found out once.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings('error')
+        try:
+            Retry(method_whitelist={})
+        except (DeprecationWarning, TypeError):
+            return 'allowed_methods'
+        return 'method_whitelist'
+
+
+@lru_cache(maxsize=16)
+def load_signing_key(key):
+    """Parse the PEM encoded RSA private key used to sign JWT assertions.
+
+    Parsing and validating an RSA key takes much longer than signing with
+    it, so parsed keys are cached per process.
+    """
+    # PyJWT and cryptography take longer to import than the rest of the
+    # package, only sessions signing JWT assertions pay for them.
+    # pylint: disable=import-outside-toplevel
+    from jwt.algorithms import RSAAlgorithm
+
+    return RSAAlgorithm(RSAAlgorithm.SHA256).prepare_key(key)
+
+
+class TracedConnectionMixin:  # pylint: disable=too-few-public-methods
+    """Accounts the time spent to open a connection to the traced request."""
+
+    def _new_conn(self):
+        trace = current_trace()
+        if trace is None:
+            return super()._new_conn()
+
+        started = time.monotonic()
+        try:
+            return super()._new_conn()
+        finally:
+            trace.add('connect', time.monotonic() - started)
+
+
+class TracedHTTPConnection(TracedConnectionMixin, HTTPConnection):
+    """HTTP connection timed by the request lifecycle hooks."""
+
+
+class TracedHTTPSConnection(TracedConnectionMixin, HTTPSConnection):
+    """HTTPS connection timed by the request lifecycle hooks."""
+
+    def connect(self):
+        """Connect to the host and perform the TLS handshake."""
+        trace = current_trace()
+        if trace is None:
+            return super().connect()
+
+        started = time.monotonic()
+        connect = trace.timings.connect
+        try:
+            return super().connect()
+        finally:
+            handshake = time.monotonic() - started
+            trace.add('tls', handshake - (trace.timings.connect - connect))
+
+
+class TracedPoolMixin:  # pylint: disable=too-few-public-methods
+    """Accounts the time spent waiting for a pooled connection to the traced
+    request."""
+
+    def _get_conn(self, timeout=None):
+        trace = current_trace()
+        if trace is None:
+            return super()._get_conn(timeout)
+
+        started = time.monotonic()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            trace.add('pool', time.monotonic() - started)
+
+
+class TracedHTTPConnectionPool(TracedPoolMixin, HTTPConnectionPool):
+    """HTTP connection pool timed by the request lifecycle hooks."""
+
+    ConnectionCls = TracedHTTPConnection
+
+
+class TracedHTTPSConnectionPool(TracedPoolMixin, HTTPSConnectionPool):
+    """HTTPS connection pool timed by the request lifecycle hooks."""
+
+    ConnectionCls = TracedHTTPSConnection
+
+
+class PoolingAdapter(HTTPAdapter):
+    """Implementation of the :class:`requests.adapters.HTTPAdapter` which
+    keeps connections alive between requests.
+
+    Connections are returned to the pool after each request and reused by
+    the subsequent ones. If the adapter has not been used for longer than
+    ``idle_timeout`` seconds, all pooled connections are closed before the
+    next request, so that stale sockets dropped by the server or by a load
+    balancer are not reused.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['idle_timeout']
+
+    def __init__(self, idle_timeout=None, **kwargs):
+        """Initialize a new :class:`PoolingAdapter` object.
+
+        :param float idle_timeout: The number of seconds pooled connections
+            may stay unused before they are closed. ``None`` disables idle
+            connections reaping.
+        """
+        self.idle_timeout = idle_timeout
+        self.last_used = time.monotonic()
+        self._reap_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def __setstate__(self, state):
+        self.last_used = time.monotonic()
+        self._reap_lock = threading.Lock()
+        super().__setstate__(state)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Initialize the pool manager creating traced connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TracedHTTPConnectionPool,
+            'https': TracedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        """Send a request using pooled connection."""
+        self.reap_idle()
+
+        budget = getattr(self.max_retries, 'budget', None)
+        if budget is not None:
+            budget.deposit()
+
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            self.last_used = time.monotonic()
+
+    def reap_idle(self) -> bool:
+        """Close pooled connections if the adapter has been idle for too long.
+
+        Marks the adapter as used. Returns ``True`` if connections were
+        closed, ``False`` otherwise.
+        """
+        if self.idle_timeout is None:
+            self.last_used = time.monotonic()
+            return False
+
+        # Only the first of concurrent requests may find the adapter idle,
+        # others must not clear the pool it has started to use.
+        with self._reap_lock:
+            now = time.monotonic()
+            idle = now - self.last_used >= self.idle_timeout
+            self.last_used = now
+
+            if idle:
+                self.poolmanager.clear()
+
+        return idle
+
+
+class RetryBudgetExhausted(ResponseError):
+    """Raised as the reason of :class:`MaxRetryError` when the retry budget
+    does not allow one more retry."""
+
+
+class RetryBudget:
+    """Limit retries to a fraction of recent requests.
+
+    Within the last ``window`` seconds at most ``min_retries`` plus
+    ``ratio`` of the requests sent may be retried, so that retries can not
+    multiply the load on the API during an outage. A budget is shared by all
+    the requests sent through an adapter or a transport.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10,
+                 window: float = 10.0):
+        """Initialize a new :class:`RetryBudget` object.
+
+        :param ratio: The fraction of recent requests which may be retried.
+        :param min_retries: The number of retries allowed regardless of the
+            number of requests, so that a client sending few requests can
+            retry them.
+        :param window: The number of seconds requests and retries count for.
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'ratio': self.ratio, 'min_retries': self.min_retries,
+                'window': self.window}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _prune(self, now: float):
+        horizon = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] < horizon:
+                events.popleft()
+
+    def deposit(self):
+        """Account a request sent."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            self._requests.append(now)
+
+    def withdraw(self) -> bool:
+        """Account a retry if the budget allows it.
+
+        Returns ``False`` if the budget is exhausted.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            allowed = self.min_retries + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                return False
+
+            self._retries.append(now)
+            return True
+
+
+class JitteredRetry(Retry):
+    """Retry policy with decorrelated jitter backoff and a retry budget.
+
+    The first delay is picked at random up to ``backoff_factor``, each next
+    one between ``backoff_factor`` and three times the previous delay, so
+    that clients failed at the same moment do not retry in lockstep. If a
+    :class:`RetryBudget` is given, retries it does not allow raise
+    :class:`MaxRetryError` right away.
+    """
+
+    def __init__(self, *args, budget: RetryBudget = None,
+                 sleep_time: float = 0.0, **kwargs):
+        """Initialize a new :class:`JitteredRetry` object.
+
+        Accepts the same arguments as :class:`urllib3.util.retry.Retry`.
+
+        :param budget: The retry budget to withdraw retries from.
+        :param sleep_time: The delay before the next attempt.
+        """
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+        self.sleep_time = sleep_time
+
+    def new(self, **kw):
+        kw.setdefault('budget', self.budget)
+        kw.setdefault('sleep_time', self.sleep_time)
+        return super().new(**kw)
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        """Return a new retry object for the next attempt."""
+        if response is not None:
+            observe_retried(response.status, response.headers)
+
+        retry = super().increment(method, url, response, error, _pool,
+                                  _stacktrace)
+
+        if self.budget is not None and not self.budget.withdraw():
+            raise MaxRetryError(
+                _pool, url, RetryBudgetExhausted('Retry budget exhausted'))
+
+        retry.sleep_time = self.next_sleep_time()
+
+        trace = current_trace()
+        if trace is not None:
+            trace.retry(error)
+
+        return retry
+
+    def next_sleep_time(self) -> float:
+        """Pick the delay before the next attempt."""
+        base = self.backoff_factor
+
+        # The first retry is not delayed longer than backoff_factor, like
+        # urllib3 retries it right away, but spread in time.
+        if not self.sleep_time:
+            return random.uniform(0, base)
+
+        cap = (getattr(self, 'backoff_max', None) or
+               getattr(Retry, 'DEFAULT_BACKOFF_MAX', 120))
+
+        return min(cap, random.uniform(base, max(base, self.sleep_time * 3)))
+
+    def get_backoff_time(self):
+        """Get the delay before the next attempt."""
+        return self.sleep_time
+
+    def sleep(self, response=None):
+        """Wait before the next attempt, and for the rate limiter of the
+        client if any."""
+        super().sleep(response)
+
+        limiter = current_rate_limiter()
+        if limiter is not None:
+            limiter.acquire()
+
+
 class RetryMixin:  # pylint: disable=too-few-public-methods
     """Implementation of the custom retry policy for HTTP sessions."""
 
@@ -45,8 +372,15 @@ class RetryMixin:  # pylint: disable=too-few-public-methods
         'POST',
     })
 
-    def create_retry(self, max_retries=3, backoff_factor=1.0):
-        """Create default HTTP adapter based on retry policy."""
+    def create_retry(self, max_retries=3, backoff_factor=1.0, budget=None):
+        """Create default HTTP adapter based on retry policy.
+
+        :param int max_retries: The maximum number of times to retry a
+            request.
+        :param float backoff_factor: The shortest delay between attempts.
+        :param budget: The :class:`RetryBudget` shared by the requests, or
+            the fraction of recent requests which may be retried.
+        """
         # Prevent incorrect configuration to avoid hammering API servers
         backoff_factor = abs(float(backoff_factor))
         if backoff_factor == 0.0:
@@ -63,22 +397,61 @@ class RetryMixin:  # pylint: disable=too-few-public-methods
             'status_forcelist': self.STATUSES_WHITELIST,
         }
 
-        # urllib3 1.26.0 started issuing a DeprecationWarning for using the
-        # 'method_whitelist' init parameter of Retry and announced its removal
-        # in version 2.0. The replacement parameter is 'allowed_methods'.
-        # Find out which init parameter to use:
-        with warnings.catch_warnings():
-            warnings.filterwarnings('error')
-            try:
-                Retry(method_whitelist={})
-            except (DeprecationWarning, TypeError):
-                retry_methods_param = 'allowed_methods'
-            else:
-                retry_methods_param = 'method_whitelist'
+        retry_kwargs[retry_methods_param()] = self.METHODS_WHITELIST
+
+        if budget is not None and not isinstance(budget, RetryBudget):
+            budget = RetryBudget(ratio=budget)
 
-        retry_kwargs[retry_methods_param] = self.METHODS_WHITELIST
+        return JitteredRetry(budget=budget, **retry_kwargs)
 
-        return Retry(**retry_kwargs)
+    def create_adapter(self, **kwargs) -> PoolingAdapter:
+        """Create HTTP adapter with retry policy and connection pool settings.
+
+        :keyword int max_retries: The maximum number of times to retry a
+            request.
+        :keyword float backoff_factor: A multiplier applied to the retry
+            interval between attempts.
+        :keyword int pool_connections: The number of per-host connection pools
+            to cache.
+        :keyword int pool_maxsize: The maximum number of connections to keep
+            in each per-host pool.
+        :keyword float pool_idle_timeout: The number of seconds pooled
+            connections may stay unused before they are closed.
+        :keyword retry_budget: The :class:`RetryBudget` shared by the
+            requests sent through the adapter, or the fraction of recent
+            requests which may be retried.
+        """
+        retry_strategy = self.create_retry(
+            kwargs.get('max_retries', 3),
+            kwargs.get('backoff_factor', 1.0),
+            kwargs.get('retry_budget'),
+        )
+
+        return PoolingAdapter(
+            max_retries=retry_strategy,
+            pool_connections=kwargs.get('pool_connections', DEFAULT_POOLSIZE),
+            pool_maxsize=kwargs.get('pool_maxsize', DEFAULT_POOLSIZE),
+            idle_timeout=kwargs.get('pool_idle_timeout'),
+        )
+
+
+def reset_after_fork(session: Session):
+    """Rebuild the state of the session which does not survive fork().
+
+    The pooled connections of a forked child process share their sockets with
+    the parent, so the connection pools of the HTTP adapters are dropped
+    without closing the connections and new connections are opened on
+    demand. Sessions defining an ``after_fork()`` method rebuild their own
+    state as well.
+    """
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        if isinstance(adapter, HTTPAdapter):
+            # Unpickling rebuilds the pools of an adapter from its settings
+            adapter.__setstate__(adapter.__getstate__())
+
+    after_fork = getattr(session, 'after_fork', None)
+    if after_fork is not None:
+        after_fork()
 
 
 class RetrySession(Session, RetryMixin):
@@ -97,21 +470,26 @@ class RetrySession(Session, RetryMixin):
             request.
         :keyword float backoff_factor: A multiplier applied to the retry
             interval between attempts.
+        :keyword int pool_connections: The number of per-host connection pools
+            to cache.
+        :keyword int pool_maxsize: The maximum number of connections to keep
+            in each per-host pool.
+        :keyword float pool_idle_timeout: The number of seconds pooled
+            connections may stay unused before they are closed.
         """
         super().__init__()
 
-        retry_strategy = self.create_retry(
-            kwargs.get('max_retries', 3),
-            kwargs.get('backoff_factor', 1.0)
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = self.create_adapter(**kwargs)
 
         self.mount('https://', adapter)
         self.mount('http://', adapter)
 
 
-class JWTSession(Session, RetryMixin):
-    """Session class to implement OAuth Grant Type JWT Bearer Flow."""
+class JWTMixin:  # pylint: disable=too-few-public-methods
+    """Implementation of the OAuth Grant Type JWT Bearer Flow token request.
+
+    Shared by the synchronous and asynchronous JWT sessions.
+    """
 
     token_url = 'https://oauth.airslate.com/public/oauth/token'
 
@@ -124,42 +502,18 @@ class JWTSession(Session, RetryMixin):
         'oauth-user-tokens',
     ]
 
-    def __init__(self, client_id: str, user_id: str, key: bytes, **kwargs):
-        super().__init__()
+    def init_credentials(self, client_id: str, user_id: str, key: bytes,
+                         scope=None):
+        """Setup credentials used to request an access token."""
         self.client_id = client_id
         self.user_id = user_id
         self.key = key
 
-        scope = kwargs.get('scope', self.DEFAULT_SCOPE)
+        scope = self.DEFAULT_SCOPE if scope is None else scope
         self.scope = ' '.join(scope) if isinstance(scope, list) else scope
 
-        self.headers.update(kwargs.get('headers', {}))
-
-        retry_strategy = self.create_retry(
-            kwargs.get('max_retries', 3),
-            kwargs.get('backoff_factor', 1.0)
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-
-        self.mount('https://', adapter)
-        self.mount('http://', adapter)
-
-        self.auth = OAuth2Session(
-            client_id=self.client_id,
-            token=self.get_token(),
-            token_updater=self.update_token,
-        )
-
-    def update_token(self, token):
-        """Update token storage on automatic token refresh.
-
-        This helper function will be used as a call back for
-        :class:`requests_oauthlib.OAuth2Session`.
-        """
-        self.auth.token = token
-
-    def get_token(self):
-        """Automatic token retrieve using OAuth Grant Type JWT Bearer Flow."""
+    def token_request(self) -> dict:
+        """Build keyword arguments of the access token request."""
         now = datetime.utcnow()
 
         payload = {
@@ -171,9 +525,11 @@ class JWTSession(Session, RetryMixin):
             'scope': self.scope,
         }
 
+        import jwt  # pylint: disable=import-outside-toplevel
+
         jwt_token = jwt.encode(
             payload=payload,
-            key=self.key,
+            key=load_signing_key(self.key),
             algorithm='RS256',
             headers={'alg': 'RS256', 'typ': 'JWT'},
         )
@@ -189,21 +545,268 @@ class JWTSession(Session, RetryMixin):
             'User-Agent': default_user_agent(),
         }
 
-        # Ensure SSL connection is closed after finished using session.
-        with self as session:
+        return {'headers': headers, 'data': data}
+
+    def token_key(self) -> str:
+        """Get the key identifying tokens of the credentials in a store."""
+        return f'{self.token_url} {self.client_id} {self.user_id} {self.scope}'
+
+
+def _withhold_auth(request):
+    """Leave the request as is, overriding the session auth."""
+    return request
+
+
+class TokenRefresher(threading.Thread):
+    """Thread renewing the access token of a :class:`JWTSession` ahead of
+    its expiration."""
+
+    # The number of seconds to wait before the next attempt if renewal
+    # failed, doubled after each consecutive failure up to MAX_RETRY_DELAY.
+    RETRY_DELAY = 5.0
+    MAX_RETRY_DELAY = 300.0
+
+    def __init__(self, session: 'JWTSession'):
+        """Initialize a new :class:`TokenRefresher` object."""
+        super().__init__(name='airslate-token-refresher', daemon=True)
+        self.session = weakref.ref(session)
+        self.stopped = threading.Event()
+
+    def delay(self):
+        """Get the number of seconds to wait before renewing the token."""
+        session = self.session()
+        if session is None or session.token_refresh_at is None:
+            return None
+
+        return max(session.token_refresh_at - time.time(), 0.0)
+
+    def run(self):
+        delay = self.delay()
+        failures = 0
+        while not self.stopped.wait(delay):
+            session = self.session()
+            if session is None:
+                return
+
+            # Any error, e.g. of the token store or the network, must not
+            # stop the renewal for the lifetime of the session.
             try:
-                response = session.request(
-                    'POST',
-                    self.token_url,
-                    headers=headers,
-                    data=data,
-                )
-                response.raise_for_status()
-                return response.json()
-            except (MaxRetryError, RetryError) as retry_exc:
-                raise ApiError(
-                    status=503,
-                    message=str(retry_exc).lstrip('None: '),
-                ) from retry_exc
-            except RequestException as exc:
-                raise ApiError(response=response) from exc
+                session.ensure_token()
+                delay = self.delay()
+                failures = 0
+            except Exception:  # pylint: disable=broad-except
+                delay = min(self.RETRY_DELAY * 2 ** failures,
+                            self.MAX_RETRY_DELAY)
+                failures += 1
+            del session
+
+    def stop(self):
+        """Stop renewing the token."""
+        self.stopped.set()
+
+
+class JWTSession(Session, RetryMixin, JWTMixin):
+    """Session class to implement OAuth Grant Type JWT Bearer Flow.
+
+    The access token is renewed ``refresh_ahead`` seconds before it expires,
+    either by the first request noticing it or, if ``background_refresh`` is
+    set, by a background thread. Threads noticing the expiration at the same
+    time share one renewal. Sessions using the same ``token_store`` share
+    the access token as well.
+    """
+
+    # Renew access token this number of seconds before it expires.
+    REFRESH_AHEAD = 60.0
+
+    def __init__(self, client_id: str, user_id: str, key: bytes, **kwargs):
+        """Initialize a new :class:`JWTSession` object.
+
+        Accepts the same keyword arguments as
+        :meth:`RetryMixin.create_adapter` and the following ones.
+
+        :keyword token_store: The :class:`airslate.tokens.TokenStore` to
+            share the access token through.
+        :keyword float refresh_ahead: The number of seconds before the access
+            token expiration to renew it.
+        :keyword bool background_refresh: Renew the access token in a
+            background thread.
+        """
+        super().__init__()
+        self.init_credentials(client_id, user_id, key, kwargs.get('scope'))
+
+        self.headers.update(kwargs.get('headers', {}))
+
+        adapter = self.create_adapter(**kwargs)
+
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+        self.token_store: TokenStore = kwargs.get('token_store')
+        self.refresh_ahead = kwargs.get('refresh_ahead', self.REFRESH_AHEAD)
+        self.token_refresh_at = None
+        self._token_lock = threading.Lock()
+
+        self._init_auth()
+        self.ensure_token()
+
+        self.refresher = None
+        if kwargs.get('background_refresh', False):
+            self.refresher = TokenRefresher(self)
+            self.refresher.start()
+
+    def __getstate__(self):
+        """Get the state of the session to pickle it.
+
+        The credentials, including the private key, and the current access
+        token travel with the session, so that the unpickled one does not
+        request a new token. Connection pools and the background refresher
+        thread are rebuilt on unpickling.
+        """
+        state = {name: value for name, value in self.__dict__.items()
+                 if name not in ('auth', 'refresher', '_token_lock')}
+        state['token'] = self.auth.token
+        state['background_refresh'] = self.refresher is not None
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        token = state.pop('token')
+        background_refresh = state.pop('background_refresh')
+        super().__setstate__(state)
+
+        self._token_lock = threading.Lock()
+        self._init_auth(token)
+
+        self.refresher = None
+        if background_refresh:
+            self.refresher = TokenRefresher(self)
+            self.refresher.start()
+
+    def _init_auth(self, token: dict = None):
+        """Create the OAuth2 session authorizing the API requests."""
+        # pylint: disable=import-outside-toplevel
+        from requests_oauthlib import OAuth2Session
+
+        self.auth = OAuth2Session(
+            client_id=self.client_id,
+            token=token,
+            token_updater=self.update_token,
+        )
+        self.auth.register_compliance_hook(
+            'protected_request', self._protected_request)
+
+        # API requests are sent through the OAuth2 session, so share the same
+        # connection pool and retry policy with it.
+        for prefix in ('https://', 'http://'):
+            self.auth.mount(prefix, self.adapters[prefix])
+
+    def after_fork(self):
+        """Rebuild the state of the session which does not survive fork().
+
+        The lock of the token renewal may have been held by another thread
+        of the parent process, and the background refresher thread does not
+        exist in the child.
+        """
+        self._token_lock = threading.Lock()
+        if self.refresher is not None:
+            self.refresher = TokenRefresher(self)
+            self.refresher.start()
+
+    def close(self):
+        """Close all adapters and the underlying OAuth2 session."""
+        if getattr(self, 'refresher', None) is not None:
+            self.refresher.stop()
+
+        super().close()
+        if self.auth is not None:
+            self.auth.close()
+
+    def update_token(self, token, expires_at=None):
+        """Update token storage on automatic token refresh.
+
+        This helper function will be used as a call back for
+        :class:`requests_oauthlib.OAuth2Session`.
+        """
+        self.auth.token = token
+
+        lifetime = token.get('expires_in')
+        if lifetime is None:
+            self.token_refresh_at = None
+            return
+
+        if expires_at is None:
+            expires_at = time.time() + lifetime
+
+        # Short-living tokens are renewed in the middle of their lifetime
+        self.token_refresh_at = expires_at - min(self.refresh_ahead,
+                                                 lifetime / 2)
+
+    def token_expired(self) -> bool:
+        """Check whether the current access token has to be renewed."""
+        if not self.auth.token:
+            return True
+
+        if self.token_refresh_at is None:
+            return False
+
+        return time.time() >= self.token_refresh_at
+
+    def ensure_token(self) -> dict:
+        """Return a valid access token, renewing it if needed."""
+        if self.token_expired():
+            with self._token_lock:
+                # Another thread may have renewed it while we were waiting
+                if self.token_expired():
+                    self._renew_token()
+
+        return self.auth.token
+
+    def _renew_token(self):
+        """Request a new access token or load the one renewed by others."""
+        if self.token_store is None:
+            self.update_token(self.get_token())
+            return
+
+        key = self.token_key()
+        with self.token_store.lock(key):
+            record = self.token_store.load(key)
+            if record is not None:
+                self.update_token(record['token'], record['expires_at'])
+
+            if record is None or self.token_expired():
+                token = self.get_token()
+                expires_at = None
+                if 'expires_in' in token:
+                    expires_at = time.time() + token['expires_in']
+
+                self.token_store.save(key, {
+                    'token': token,
+                    'expires_at': expires_at,
+                })
+                self.update_token(token, expires_at)
+
+    def _protected_request(self, url, headers, data):
+        """Renew the access token before it is added to a request."""
+        self.ensure_token()
+        return url, headers, data
+
+    def get_token(self):
+        """Automatic token retrieve using OAuth Grant Type JWT Bearer Flow."""
+        try:
+            # The token request must not be authorized by the OAuth2 session
+            # set as the session auth, nor close the shared connection pool.
+            response = self.request(
+                'POST',
+                self.token_url,
+                auth=_withhold_auth,
+                **self.token_request(),
+            )
+            response.raise_for_status()
+            return response.json()
+        except (MaxRetryError, RetryError) as retry_exc:
+            raise ApiError(
+                status=503,
+                message=str(retry_exc).lstrip('None: '),
+            ) from retry_exc
+        except RequestException as exc:
+            raise ApiError(response=response) from exc
@@ -0,0 +1,154 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Incremental decoding of JSON:API responses.
+
+This module allows to process the items of the ``data`` array of a large
+response while its body is being downloaded, keeping in memory only the item
+being decoded and the chunk being read.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+from .exceptions import MissingData
+
+WHITESPACE = frozenset(' \t\n\r')
+
+
+class StreamReader:
+    """Read JSON values out of a stream of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """Initialize a new :class:`StreamReader` object.
+
+        :param chunks: An iterable of UTF-8 encoded byte chunks.
+        """
+        self.chunks = iter(chunks)
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def fill(self) -> bool:
+        """Read the next chunk into the buffer.
+
+        Returns ``False`` if the end of stream is reached.
+        """
+        if self.eof:
+            return False
+
+        # Drop already consumed data to keep memory bounded
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+
+        for chunk in self.chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+
+        self.buffer += self._text_decoder.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while (self.pos < len(self.buffer) and
+                   self.buffer[self.pos] in WHITESPACE):
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.fill():
+                raise json.JSONDecodeError(
+                    'Unexpected end of stream', self.buffer, self.pos)
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character checking its value."""
+        if self.peek() != char:
+            raise json.JSONDecodeError(
+                f'Expecting {char!r}', self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value is incomplete, wait for more data
+                if self.fill():
+                    continue
+                raise
+
+            # A number at the end of buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def array(self) -> Iterator[Any]:
+        """Decode the next JSON array yielding its items one by one."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+
+def iter_data(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Incrementally decode the items of the ``data`` array of a response.
+
+    The items are yielded as soon as they are received. Raises
+    :class:`MissingData` if the response has no ``data`` key.
+
+    >>> chunks = [b'{"meta": {}, "da', b'ta": [{"id": 1}, {"i', b'd": 2}]}']
+    >>> list(iter_data(chunks))
+    [{'id': 1}, {'id': 2}]
+    """
+    reader = StreamReader(chunks)
+    found = False
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        raise MissingData()
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+
+        if key == 'data' and not found:
+            found = True
+            yield from reader.array()
+        else:
+            reader.value()
+
+        if reader.peek() != ',':
+            break
+        reader.pos += 1
+
+    reader.expect('}')
+    if not found:
+        raise MissingData()
@@ -0,0 +1,150 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Access token stores for airslate package.
+
+A token store lets several sessions, possibly living in different processes,
+share an access token instead of requesting one each. A record kept in the
+store is a dictionary holding the ``token`` returned by the token endpoint
+and its ``expires_at`` wall clock time.
+
+Classes:
+- TokenStore: Base class for token stores.
+- MemoryTokenStore: Store shared by the sessions of a process.
+- FileTokenStore: Store shared by the processes of a host.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class TokenStore(ABC):
+    """Base class for token stores."""
+
+    def __init__(self):
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_locks'], state['_locks_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[dict]:
+        """Get the record stored under the key."""
+
+    @abstractmethod
+    def save(self, key: str, record: dict):
+        """Store the record under the key."""
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Acquire exclusive access to the record stored under the key.
+
+        The session holding the lock is the only one to request a new token,
+        the others wait for it and load the renewed token afterwards.
+        """
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            yield
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store shared by the sessions of a process."""
+
+    def __init__(self):
+        super().__init__()
+        self._records: Dict[str, dict] = {}
+
+    def load(self, key: str) -> Optional[dict]:
+        """Get the record stored under the key."""
+        return self._records.get(key)
+
+    def save(self, key: str, record: dict):
+        """Store the record under the key."""
+        self._records[key] = record
+
+
+class FileTokenStore(TokenStore):
+    """Token store shared by the processes of a host.
+
+    Each record is kept in a separate JSON file readable by the owner only.
+    Processes are synchronized with ``flock()`` on a companion lock file, so
+    the directory must be on a local disk. Where ``fcntl`` is not available
+    only the threads of a process are synchronized.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize a new :class:`FileTokenStore` object.
+
+        :param directory: The directory to keep the records in.
+        """
+        super().__init__()
+        self.directory = directory
+
+    def _path(self, key: str, suffix: str) -> str:
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    def load(self, key: str) -> Optional[dict]:
+        """Get the record stored under the key."""
+        try:
+            with open(self._path(key, '.json'), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key: str, record: dict):
+        """Store the record under the key."""
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+        # mkstemp() creates the file readable by the owner only
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(record, file)
+            os.replace(temp_path, self._path(key, '.json'))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Acquire exclusive access to the record stored under the key."""
+        with super().lock(key):
+            if fcntl is None:  # pragma: no cover
+                yield
+                return
+
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd = os.open(self._path(key, '.lock'), os.O_RDWR | os.O_CREAT,
+                         0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
@@ -0,0 +1,279 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Benchmark the client against a local stub of the airSlate API.
+
+Each benchmark reports the number of calls per second, call latency
+percentiles in milliseconds and the peak memory allocated by a call. The
+results are stored as JSON, so that runs made before and after a change
+can be compared.
+
+Usage:
+
+    $ python -m benchmarks.bench_client --output before.json
+    $ python -m benchmarks.bench_client --baseline before.json
+    $ python -m benchmarks.bench_client --quick --only client.get
+
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.stub_server import ORGANIZATION_ID, StubServer
+
+# Runs a fresh interpreter importing a module, prints the import time
+# and the peak memory allocated by the import.
+IMPORT_SCRIPT = '''
+import sys, time, tracemalloc
+if sys.argv[2] == 'memory':
+    tracemalloc.start()
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(elapsed, tracemalloc.get_traced_memory()[1])
+'''
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get the value below which the given fraction of values fall."""
+    values = sorted(values)
+    index = min(int(fraction * len(values)), len(values) - 1)
+    return values[index]
+
+
+def measure_allocations(func: Callable[[], Any], calls: int = 5) -> int:
+    """Get the median peak of memory allocated by a call in bytes."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    return int(statistics.median(peaks))
+
+
+def summarize(latencies: List[float], total: float) -> dict:
+    """Summarize call latencies in seconds."""
+    return {
+        'iterations': len(latencies),
+        'ops_per_sec': round(len(latencies) / total, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 4),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 4),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+    }
+
+
+def measure(func: Callable[[], Any], iterations: int,
+            warmup: int = 3) -> dict:
+    """Measure the calls of the function."""
+    for _ in range(warmup):
+        func()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    total = time.perf_counter() - started
+
+    result = summarize(latencies, total)
+    result['alloc_peak_bytes'] = measure_allocations(func)
+    return result
+
+
+def measure_import(module: str, iterations: int) -> dict:
+    """Measure importing the module by fresh interpreters."""
+    def run(mode):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT, module, mode],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        return float(output[0]), int(output[1])
+
+    latencies = [run('time')[0] for _ in range(iterations)]
+
+    result = summarize(latencies, sum(latencies))
+    result['alloc_peak_bytes'] = run('memory')[1]
+    return result
+
+
+def generate_key() -> bytes:
+    """Generate the RSA private key signing JWT assertions."""
+    # pylint: disable=import-outside-toplevel
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def client_benchmarks(server: StubServer) -> Dict[str, tuple]:
+    """Create the benchmarks of the client calls.
+
+    Returns a mapping of benchmark names to the function to call and the
+    number of iterations.
+    """
+    # pylint: disable=import-outside-toplevel
+    from airslate.client import Client
+    from airslate.sessions import JWTSession, RetrySession
+
+    client = Client(base_url=server.url)
+    key = generate_key()
+
+    class StubJWTSession(JWTSession):
+        token_url = server.url + '/public/oauth/token'
+
+    def jwt_session():
+        StubJWTSession('client-id', 'user-id', key).close()
+
+    settings_path = f'/v1/organizations/{ORGANIZATION_ID}/settings'
+    organizations = client.organizations
+
+    return {
+        'client.get': (lambda: client.get(settings_path), 2000),
+        'client.post': (
+            lambda: client.post('/v1/organizations', {'name': 'Acme'}), 2000),
+        'organizations.collection[10]': (
+            lambda: organizations.collection(per_page=10), 1000),
+        'organizations.collection[1k]': (
+            lambda: organizations.collection(per_page=1000), 100),
+        'organizations.collection[100k]': (
+            lambda: organizations.collection(per_page=100_000), 3),
+        'organizations.settings': (
+            lambda: organizations.settings(ORGANIZATION_ID), 2000),
+        'JWTSession()': (jwt_session, 200),
+        'RetrySession()': (lambda: RetrySession().close(), 2000),
+        'Client()': (lambda: Client(base_url=server.url).close(), 2000),
+    }
+
+
+def run(names: Optional[List[str]], scale: float) -> Dict[str, dict]:
+    """Run the benchmarks selected by name, all of them by default."""
+    def selected(name):
+        return not names or name in names
+
+    def iterations(count):
+        return max(int(count * scale), 1)
+
+    results = {}
+    for module in ('airslate', 'airslate.client'):
+        name = f'import {module}'
+        if selected(name):
+            results[name] = measure_import(module, iterations(20))
+            report(name, results[name])
+
+    with StubServer() as server:
+        for name, (func, count) in client_benchmarks(server).items():
+            if selected(name):
+                results[name] = measure(func, iterations(count),
+                                        warmup=min(3, iterations(count)))
+                report(name, results[name])
+
+    return results
+
+
+def metadata() -> dict:
+    """Describe the environment the benchmarks run in."""
+    # pylint: disable=import-outside-toplevel
+    import airslate
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'airslate': airslate.__version__,
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def report(name: str, result: dict):
+    """Print the result of a benchmark."""
+    print(f"{name:<32} {result['ops_per_sec']:>12,.1f} ops/s "
+          f"p50 {result['p50_ms']:>9.3f} ms "
+          f"p95 {result['p95_ms']:>9.3f} ms "
+          f"p99 {result['p99_ms']:>9.3f} ms "
+          f"{result['alloc_peak_bytes'] / 1024:>10,.1f} KiB/call")
+
+
+def compare(baseline: Dict[str, dict], results: Dict[str, dict]):
+    """Print the changes of the results relative to the baseline."""
+    def change(metric, base, new):
+        if not base[metric]:
+            return '     n/a'
+        return f'{(new[metric] - base[metric]) / base[metric]:>+8.1%}'
+
+    print()
+    print(f"{'benchmark':<32} {'ops/s':>8} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'alloc':>8}")
+    for name, new in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        print(f'{name:<32} '
+              f"{change('ops_per_sec', base, new)} "
+              f"{change('p50_ms', base, new)} "
+              f"{change('p95_ms', base, new)} "
+              f"{change('p99_ms', base, new)} "
+              f"{change('alloc_peak_bytes', base, new)}")
+
+
+def main():
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help='run only the benchmarks with these names')
+    parser.add_argument('--quick', action='store_true',
+                        help='run a tenth of the iterations')
+    parser.add_argument('--output', metavar='FILE',
+                        help='store the results in this JSON file')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='compare the results with this JSON file')
+    args = parser.parse_args()
+
+    results = run(args.only, 0.1 if args.quick else 1.0)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'meta': metadata(), 'results': results}, file,
+                      indent=2, sort_keys=True)
+            file.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            compare(json.load(file)['results'], results)
+
+
+if __name__ == '__main__':
+    main()
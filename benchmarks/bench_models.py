@@ -0,0 +1,105 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Compare asdict() and fast serialization of Organizations.
+
+The ``asdict`` column converts models the way previous versions did:
+``to_dict()`` through :func:`dataclasses.asdict`, JSON through
+:func:`json.dumps` and pickle through the state dictionary of each model.
+
+Usage:
+
+    $ python -m benchmarks.bench_models --rows 10000 100000
+
+"""
+
+import argparse
+import copyreg
+import io
+import json
+import pickle
+from dataclasses import asdict
+
+from airslate.models import Organization, decode_models, encode_models
+from benchmarks.bench_schemas import make_rows, measure
+
+
+class StatePickler(pickle.Pickler):
+    """Pickle models with their state dictionary as previous versions did."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Organization):
+            return copyreg.__newobj__, (type(obj),), asdict(obj)
+        return NotImplemented
+
+
+def state_dumps(models: list) -> bytes:
+    """Pickle the models with their state dictionaries."""
+    file = io.BytesIO()
+    StatePickler(file, pickle.HIGHEST_PROTOCOL).dump(models)
+    return file.getvalue()
+
+
+def make_models(count: int) -> list:
+    """Create ``count`` Organizations."""
+    rows = make_rows(count)
+    for row in rows:
+        del row['unknown_field']
+    return [Organization(**row) for row in rows]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for count in args.rows:
+        models = make_models(count)
+        state_pickle = state_dumps(models)
+        fast_pickle = pickle.dumps(models, pickle.HIGHEST_PROTOCOL)
+        encoded = encode_models(models)
+
+        benchmarks = {
+            'to_dict': (
+                lambda m: [asdict(model) for model in m],
+                lambda m: [model.to_dict() for model in m],
+            ),
+            'to_json': (
+                lambda m: json.dumps([asdict(model) for model in m]).encode(),
+                encode_models,
+            ),
+            'from_json': (
+                lambda _: [Organization(**row)
+                           for row in json.loads(encoded)],
+                lambda _: decode_models(Organization, encoded),
+            ),
+            'pickle.dumps': (
+                state_dumps,
+                lambda m: pickle.dumps(m, pickle.HIGHEST_PROTOCOL),
+            ),
+            'pickle.loads': (
+                lambda _: pickle.loads(state_pickle),
+                lambda _: pickle.loads(fast_pickle),
+            ),
+        }
+
+        print(f'{count} rows, pickle {len(state_pickle):,d} -> '
+              f'{len(fast_pickle):,d} bytes')
+        print(f"{'':>14} {'asdict, s':>10} {'fast, s':>10} {'speedup':>8}")
+        for name, (slow_func, fast_func) in benchmarks.items():
+            slow = measure(slow_func, models, args.repeat)
+            fast = measure(fast_func, models, args.repeat)
+            print(f'{name:>14} {slow:>10.3f} {fast:>10.3f} '
+                  f'{slow / fast:>7.1f}x')
+        print()
+
+
+if __name__ == '__main__':
+    main()
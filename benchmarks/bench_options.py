@@ -0,0 +1,81 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Measure the CPU time and allocations the client spends on a request.
+
+The client sends requests through a stub session returning a canned
+response, so that neither the network nor requests are measured, only the
+options handling, error mapping and model loading of the client.
+
+Usage:
+
+    $ python -m benchmarks.bench_options --calls 100000
+
+"""
+
+import argparse
+import time
+
+from requests.models import Response
+
+from airslate.client import Client
+from benchmarks.bench_client import measure_allocations
+from benchmarks.stub_server import ORGANIZATION_ID, settings_body
+
+
+class StubSession:
+    """Session answering every request with the same response."""
+
+    auth = None
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def request(self, method, url, **kwargs):
+        # pylint: disable=unused-argument
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response._content = self.body  # pylint: disable=protected-access
+        return response
+
+    def close(self):
+        pass
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100_000)
+    args = parser.parse_args()
+
+    client = Client(StubSession(settings_body(ORGANIZATION_ID)))
+    path = f'/v1/organizations/{ORGANIZATION_ID}/settings'
+
+    benchmarks = {
+        'client.get': lambda: client.get(path),
+        'client.get(query)': lambda: client.get(path, {'page': 2},
+                                                headers={'X-Trace': '1'}),
+        'client.post': lambda: client.post(path, {'name': 'Acme'}),
+        'organizations.settings':
+            lambda: client.organizations.settings(ORGANIZATION_ID),
+    }
+
+    for name, func in benchmarks.items():
+        func()
+
+        started = time.process_time()
+        for _ in range(args.calls):
+            func()
+        elapsed = time.process_time() - started
+
+        print(f'{name:<24} {elapsed / args.calls * 1e6:>8.2f} us/call '
+              f'{measure_allocations(func):>8,d} B/call')
+
+
+if __name__ == '__main__':
+    main()
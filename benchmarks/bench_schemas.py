@@ -0,0 +1,80 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Compare marshmallow and fast loader deserialization of Organizations.
+
+Usage:
+
+    $ python -m benchmarks.bench_schemas --rows 10000 100000
+
+"""
+
+import argparse
+import time
+
+from airslate.schemas import OrganizationSchema, get_loader
+
+
+def make_rows(count: int) -> list:
+    """Create a payload of ``count`` Organizations."""
+    return [
+        {
+            'id': f'5FFE553A-2200-0000-{i:08X}',
+            'name': f'Acme {i}, Inc.',
+            'subdomain': f'acme{i}',
+            'status': 'FINISHED',
+            'category': 'PROFESSIONAL_AND_BUSINESS',
+            'size': '0-5',
+            'created_at': '2022-02-09T09:44:58Z',
+            'updated_at': '2022-10-28T03:59:10Z',
+            'unknown_field': i,
+        }
+        for i in range(count)
+    ]
+
+
+def marshmallow_load(rows: list) -> list:
+    """Deserialize rows the way collection() used to do it."""
+    schema = OrganizationSchema()
+    return [schema.load(row) for row in rows]
+
+
+def fast_load(rows: list) -> list:
+    """Deserialize rows using the fast loader."""
+    return get_loader(OrganizationSchema).load_many(rows)
+
+
+def measure(func, rows: list, repeat: int) -> float:
+    """Return the best time of ``repeat`` runs in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    assert marshmallow_load(make_rows(10)) == fast_load(make_rows(10))
+
+    print(f"{'rows':>8} {'marshmallow, s':>15} {'fast, s':>10} {'speedup':>8}")
+    for count in args.rows:
+        rows = make_rows(count)
+        slow = measure(marshmallow_load, rows, args.repeat)
+        fast = measure(fast_load, rows, args.repeat)
+        print(f'{count:>8} {slow:>15.3f} {fast:>10.3f} {slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Local stand-in for the airSlate API used by the benchmarks.
+
+The server answers the endpoints used by the client with canned payloads,
+which are encoded once and cached, so that the benchmarks measure the
+client rather than the server.
+
+Usage:
+
+    $ python -m benchmarks.stub_server --port 8000
+
+"""
+
+import argparse
+import json
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ORGANIZATION_ID = '5FFE553A-2200-0000-0000D981'
+
+
+def make_organization(number: int) -> dict:
+    """Create an Organization payload."""
+    return {
+        'id': f'5FFE553A-2200-0000-{number:08X}',
+        'name': f'Acme {number}, Inc.',
+        'subdomain': f'acme{number}',
+        'status': 'FINISHED',
+        'category': 'PROFESSIONAL_AND_BUSINESS',
+        'size': '0-5',
+        'created_at': '2022-02-09T09:44:58Z',
+        'updated_at': '2022-10-28T03:59:10Z',
+    }
+
+
+@lru_cache(maxsize=16)
+def organizations_body(count: int) -> bytes:
+    """Encode a page of ``count`` Organizations."""
+    return json.dumps({
+        'data': [make_organization(i) for i in range(count)],
+        'meta': {'current_page': 1, 'last_page': 1, 'per_page': count,
+                 'total': count},
+    }).encode('utf-8')
+
+
+@lru_cache(maxsize=16)
+def settings_body(org_id: str) -> bytes:
+    """Encode the settings of an Organization."""
+    return json.dumps({
+        'id': org_id,
+        'settings': {
+            'allow_recipient_registration': True,
+            'attach_completion_certificate': True,
+            'require_electronic_signature_consent': False,
+            'allow_reusable_flow': True,
+            'verified_domains': ['airslate.com', 'dochub.com'],
+        },
+    }).encode('utf-8')
+
+
+TOKEN_BODY = json.dumps({
+    'access_token': 'stub-access-token',
+    'token_type': 'Bearer',
+    'expires_in': 3600,
+}).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer the requests of the benchmarks."""
+
+    protocol_version = 'HTTP/1.1'
+
+    # Headers and body are written separately, don't let Nagle's algorithm
+    # hold the body back until the client acknowledges the headers
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Serve Organizations and their settings."""
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+
+        if parts == ['v1', 'organizations']:
+            query = parse_qs(url.query)
+            count = int(query.get('per_page', ['10'])[0])
+            self.reply(200, organizations_body(count))
+        elif parts[:2] == ['v1', 'organizations'] and parts[3:] == [
+                'settings']:
+            self.reply(200, settings_body(parts[2]))
+        else:
+            self.reply(200, b'{"data": []}')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Issue access tokens and echo created resources."""
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if self.path.endswith('/oauth/token'):
+            self.reply(200, TOKEN_BODY)
+        else:
+            self.reply(201, b'{"data": ' + (body or b'{}') + b'}')
+
+    def reply(self, status: int, body: bytes):
+        """Send a JSON response."""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubServer:
+    """Stub airSlate API server running in a background thread."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        """Initialize a new :class:`StubServer` object.
+
+        :param host: The address to listen on.
+        :param port: The port to listen on, ``0`` picks a free one.
+        """
+        self.server = ThreadingHTTPServer((host, port), StubHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    """Run the server in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    with StubServer(args.host, args.port) as server:
+        print(f'Serving on {server.url}')
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -156,6 +156,7 @@ EXTRAS_REQUIRE = {
         'coverage[toml]>=6.0',  # Code coverage measurement for Python
         'factory_boy>=3.2.0',  # A versatile test fixtures replacement
         'flake8>=6.0.0',  # The modular source code checker
+        'httpx>=0.23.0',  # Asynchronous client tests
         'pylint>=2.16.0',  # Python code static checker
         'pytest>=6.2.2',  # Our tests framework
         'pytest-mock>=3.10.0',  # Thin-wrapper around the mock package
@@ -163,6 +164,14 @@ EXTRAS_REQUIRE = {
     ],
     # Dependencies that are required to build documentation
     'docs': [],
+    # Dependencies that are required to use the asynchronous client
+    'async': [
+        'httpx>=0.23.0',  # Async HTTP client with connection pooling
+    ],
+    # Optional dependencies speeding up models serialization
+    'speedups': [
+        'orjson>=3.6.0',  # Fast JSON library
+    ],
 }
 
 # Dependencies that are required to develop package
@@ -199,7 +208,8 @@ if __name__ == '__main__':
         url=find_meta('url'),
         project_urls=PROJECT_URLS,
         classifiers=CLASSIFIERS,
-        packages=find_packages(exclude=['tests.*', 'tests']),
+        packages=find_packages(
+            exclude=['tests.*', 'tests', 'benchmarks.*', 'benchmarks']),
         platforms='any',
         include_package_data=True,
         zip_safe=False,
@@ -0,0 +1,283 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from airslate import exceptions
+from airslate.aio.client import AsyncClient
+from airslate.aio.sessions import AsyncRetrySession
+from airslate.client import Client
+from airslate.models import Organization, OrganizationSettings
+from airslate.sessions import RetryBudget
+from airslate.utils import default_headers
+from tests.resources.factories import OrganizationFactory
+
+
+def create_client(handler, **options):
+    """Create an AsyncClient sending requests to the ``handler``."""
+    session = AsyncRetrySession(
+        transport=httpx.MockTransport(handler),
+        max_retries=options.pop('max_retries', 3),
+    )
+    return AsyncClient(
+        session,
+        base_url='http://localhost.localdomain',
+        **options,
+    )
+
+
+def test_default_options():
+    client = AsyncClient()
+    assert client.options == Client().options
+    assert client.statuses == Client().statuses
+
+
+def test_ignored_options():
+    with pytest.warns(UserWarning, match='background_workers, cache_ttl'):
+        AsyncClient(cache_ttl=60.0, background_workers=8, timeout=1.0)
+
+    AsyncClient(**Client().options)
+
+
+def test_get():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={'data': []})
+
+    async def main():
+        async with create_client(handler) as client:
+            return await client.get('/v1/organizations', page=2, foo=True)
+
+    response = asyncio.run(main())
+
+    assert response.json() == {'data': []}
+    assert len(requests) == 1
+    assert requests[0].url.path == '/v1/organizations'
+    assert dict(requests[0].url.params) == {'page': '2', 'foo': 'true'}
+    assert requests[0].headers['User-Agent'] == default_headers()['User-Agent']
+    assert 'Content-Type' not in requests[0].headers
+
+
+def test_post():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={})
+
+    async def main():
+        async with create_client(handler) as client:
+            client.headers['key'] = 'value'
+            return await client.post('/v1/organizations', {'name': 'Acme'})
+
+    asyncio.run(main())
+
+    assert json.loads(requests[0].content) == {'name': 'Acme'}
+    assert requests[0].headers['key'] == 'value'
+    assert requests[0].headers['Content-Type'] == default_headers()[
+        'Content-Type']
+
+
+@pytest.mark.parametrize('status, error', [
+    (400, exceptions.BadRequest),
+    (401, exceptions.Unauthorized),
+    (404, exceptions.NotFoundError),
+    (505, exceptions.InternalServerError),
+])
+def test_error_statuses(status, error):
+    def handler(_request):
+        return httpx.Response(status, json={'message': 'Error message'})
+
+    async def main():
+        async with create_client(handler) as client:
+            await client.get('/v1/organizations')
+
+    with pytest.raises(error) as exc_info:
+        asyncio.run(main())
+
+    assert exc_info.value.status == status
+    assert exc_info.value.reason is not None
+
+
+def test_retry_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, json={})
+
+    async def main():
+        async with create_client(handler, max_retries=1) as client:
+            await client.get('/v1/organizations')
+
+    with pytest.raises(exceptions.RetryApiError) as exc_info:
+        asyncio.run(main())
+
+    assert exc_info.value.status == 503
+    assert len(calls) == 2
+
+
+def test_connection_error():
+    def handler(request):
+        raise httpx.ConnectError('Connection refused', request=request)
+
+    async def main():
+        async with create_client(handler, max_retries=0) as client:
+            await client.get('/v1/organizations')
+
+    with pytest.raises(exceptions.InternalServerError) as exc_info:
+        asyncio.run(main())
+
+    assert exc_info.value.message == Client.CONNECTION_ERROR_MESSAGE
+
+
+@pytest.mark.parametrize('method,attempts', [('get', 3), ('patch', 1)])
+def test_read_timeout_retried_if_idempotent(mocker, method, attempts):
+    mocker.patch('airslate.aio.sessions.asyncio.sleep')
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout('Timed out', request=request)
+
+    async def main():
+        async with create_client(handler, max_retries=2) as client:
+            if method == 'get':
+                await client.get('/v1/organizations')
+            else:
+                await client.patch('/v1/organizations/1', {'name': 'Acme'})
+
+    with pytest.raises(exceptions.InternalServerError):
+        asyncio.run(main())
+
+    assert len(calls) == attempts
+
+
+def test_organizations():
+    org_id = '5FFE553A-2200-0000-0000D981'
+    settings = {
+        'id': org_id,
+        'settings': {
+            'allow_recipient_registration': True,
+            'attach_completion_certificate': True,
+            'require_electronic_signature_consent': False,
+            'allow_reusable_flow': True,
+            'verified_domains': ['airslate.com'],
+        },
+    }
+
+    def handler(request):
+        if request.url.path == '/v1/organizations':
+            return httpx.Response(200, json={
+                'data': [OrganizationFactory(id=org_id)],
+            })
+        return httpx.Response(200, json=settings)
+
+    async def main():
+        async with create_client(handler) as client:
+            return await asyncio.gather(
+                client.organizations.collection(),
+                client.organizations.settings(org_id),
+            )
+
+    organizations, org_settings = asyncio.run(main())
+
+    assert len(organizations) == 1
+    assert isinstance(organizations[0], Organization)
+    assert organizations[0].id == org_id
+    assert isinstance(org_settings, OrganizationSettings)
+    assert org_settings.to_dict() == settings
+
+
+def test_coalesced_get():
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={'data': []})
+
+    async def main():
+        async with create_client(handler, coalesce=True) as client:
+            return await asyncio.gather(*[
+                client.get('/v1/organizations') for _ in range(5)
+            ])
+
+    responses = asyncio.run(main())
+
+    assert len(requests) == 1
+    assert all(r is responses[0] for r in responses)
+
+
+def test_retry_budget_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, json={})
+
+    async def main():
+        session = AsyncRetrySession(
+            transport=httpx.MockTransport(handler),
+            retry_budget=RetryBudget(ratio=0, min_retries=0),
+        )
+        async with AsyncClient(session) as client:
+            await client.get('/v1/organizations')
+
+    with pytest.raises(exceptions.RetryApiError) as exc_info:
+        asyncio.run(main())
+
+    assert exc_info.value.message == 'Retry budget exhausted'
+    assert len(calls) == 1
+
+
+def test_retry_budget_connection_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError('Connection refused', request=request)
+
+    async def main():
+        session = AsyncRetrySession(
+            transport=httpx.MockTransport(handler),
+            retry_budget=RetryBudget(ratio=0, min_retries=0),
+        )
+        async with AsyncClient(session) as client:
+            await client.get('/v1/organizations')
+
+    with pytest.raises(exceptions.RetryApiError) as exc_info:
+        asyncio.run(main())
+
+    assert exc_info.value.message == 'Retry budget exhausted'
+    assert len(calls) == 1
+
+
+def test_rate_limit_retried_responses():
+    statuses = iter([429, 200])
+
+    def handler(_request):
+        return httpx.Response(next(statuses), json={},
+                              headers={'Retry-After': '1'})
+
+    async def main():
+        async with create_client(handler, rate_limit=100) as client:
+            response = await client.get('/v1/organizations')
+            return response, client.rate_limiter
+
+    response, limiter = asyncio.run(main())
+
+    assert response.status_code == 200
+    # The retried attempt has waited for the limiter as well
+    assert limiter.stats.requests == 2
+    assert limiter._paused_until > 0
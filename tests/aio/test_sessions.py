@@ -0,0 +1,114 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+import jwt
+import pytest
+
+from airslate.aio.client import AsyncClient
+from airslate.aio.sessions import AsyncJWTSession, AsyncRetryTransport
+from airslate.exceptions import ApiError
+from airslate.sessions import RetryMixin
+
+TOKEN_URL = 'https://oauth.airslate.com/public/oauth/token'
+
+
+def create_session(handler, private_key, **kwargs):
+    return AsyncJWTSession(
+        client_id='00000000-0000-0000-0000-000000000000',
+        user_id='11111111-1111-1111-1111-111111111111',
+        key=private_key,
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def test_jwt_get_token(private_key):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if str(request.url) == TOKEN_URL:
+            return httpx.Response(200, json={
+                'access_token': 'foobar',
+                'expires_in': 3600,
+            })
+        return httpx.Response(200, json={})
+
+    async def main():
+        session = create_session(handler, private_key)
+        async with AsyncClient(session) as client:
+            await asyncio.gather(*[
+                client.get('/v1/organizations') for _ in range(10)
+            ])
+
+    asyncio.run(main())
+
+    token_requests = [r for r in requests if str(r.url) == TOKEN_URL]
+    assert len(token_requests) == 1
+    assert len(requests) == 11
+
+    data = parse_qs(token_requests[0].content.decode())
+    assert data['grant_type'] == [
+        'urn:ietf:params:oauth:grant-type:jwt-bearer']
+    assertion = jwt.decode(data['assertion'][0],
+                           options={'verify_signature': False})
+    assert assertion['sub'] == '11111111-1111-1111-1111-111111111111'
+
+    assert 'Authorization' not in token_requests[0].headers
+    assert requests[-1].headers['Authorization'] == 'Bearer foobar'
+
+
+def test_jwt_token_renewal(private_key):
+    tokens = iter(['first', 'second'])
+
+    def handler(request):
+        if str(request.url) == TOKEN_URL:
+            return httpx.Response(200, json={
+                'access_token': next(tokens),
+                'expires_in': 3600,
+            })
+        return httpx.Response(200, json={})
+
+    async def main():
+        session = create_session(handler, private_key)
+        first = await session.ensure_token()
+        assert await session.ensure_token() is first
+
+        session.token_expires_at -= 3600
+        return first, await session.ensure_token()
+
+    first, second = asyncio.run(main())
+    assert first['access_token'] == 'first'
+    assert second['access_token'] == 'second'
+
+
+def test_jwt_get_token_bad_request(private_key):
+    def handler(_request):
+        return httpx.Response(400, json={'message': 'Error message'})
+
+    async def main():
+        await create_session(handler, private_key).get_token()
+
+    with pytest.raises(ApiError) as exc_info:
+        asyncio.run(main())
+
+    assert 'Error message' == exc_info.value.message
+    assert 400 == exc_info.value.status
+    assert 'Bad Request' == exc_info.value.reason
+
+
+def test_retry_after_delay():
+    retry = RetryMixin().create_retry()
+    response = httpx.Response(429, headers={'Retry-After': '7'})
+    assert AsyncRetryTransport.get_retry_delay(retry, response) == 7
+
+    response = httpx.Response(500, headers={'Retry-After': '7'})
+    assert AsyncRetryTransport.get_retry_delay(retry, response) == 0
@@ -5,14 +5,25 @@
 # For the full copyright and license information, please view
 # the LICENSE file that was distributed with this source code.
 
+import copyreg
+import io
+import json
+import pickle
+from dataclasses import FrozenInstanceError
 from datetime import datetime
 
 import pytest
 
+from airslate import models
 from airslate.models import (
     Organization,
+    OrganizationBatch,
     OrganizationSettings,
     OrganizationSettingsContent,
+    SlottedOrganization,
+    decode_models,
+    encode_models,
+    slotted,
 )
 
 
@@ -47,3 +58,167 @@ def test_model_creation(model_cls, kwargs, expected_repr):
     model_instance = model_cls(**kwargs)
     assert model_instance.to_dict() == kwargs
     assert repr(model_instance) == expected_repr
+
+
+def create_organization(org_id, status='FINISHED'):
+    return Organization(
+        id=org_id,
+        name=f'Org {org_id}',
+        subdomain=org_id.lower(),
+        status=status,
+        created_at=datetime(2021, 1, 1),
+        updated_at=datetime(2021, 1, 1),
+    )
+
+
+def test_slotted_organization():
+    organization = create_organization('A')
+    slotted = SlottedOrganization(**organization.to_dict())
+
+    assert not hasattr(slotted, '__dict__')
+    assert slotted.to_dict() == organization.to_dict()
+    assert repr(slotted) == '<Organization: id=A>'
+    assert slotted == SlottedOrganization(**organization.to_dict())
+
+    with pytest.raises(FrozenInstanceError):
+        slotted.name = 'Other'
+
+    assert pickle.loads(pickle.dumps(slotted)) == slotted
+
+
+def test_slotted_repr():
+    content = OrganizationSettingsContent(
+        allow_recipient_registration=True,
+        attach_completion_certificate=False,
+        require_electronic_signature_consent=True,
+        allow_reusable_flow=False,
+        verified_domains=['example.com'],
+    )
+    cls = slotted(OrganizationSettingsContent)
+    copy = cls(**content.to_dict())
+
+    assert repr(copy) == repr(content)
+    assert copy.to_dict() == content.to_dict()
+
+
+def test_organization_batch():
+    models = [create_organization('A'),
+              create_organization('B', status='DELETED'),
+              create_organization('C')]
+    batch = OrganizationBatch.from_models(models)
+
+    assert len(batch) == 3
+    assert batch.column('id') == ['A', 'B', 'C']
+    assert batch[1] == models[1]
+    assert batch[-1] == models[2]
+    assert list(batch) == models
+    assert batch[1:].to_models() == models[1:]
+
+    finished = batch.where('status', lambda status: status == 'FINISHED')
+    assert finished.column('id') == ['A', 'C']
+
+    with pytest.raises(IndexError):
+        batch[3]  # pylint: disable=pointless-statement
+
+
+def test_organization_batch_from_rows():
+    rows = [create_organization(i).to_dict() for i in 'AB']
+    del rows[0]['size']
+
+    batch = OrganizationBatch.from_rows(rows)
+
+    assert batch.column('size') == [None, None]
+    # Values of categorical columns are shared between rows
+    first, second = batch.column('status')
+    assert first is second
+
+
+def test_organization_batch_bad_columns():
+    with pytest.raises(ValueError):
+        OrganizationBatch({'id': ['A']})
+
+
+def test_to_dict_copies_nested_values():
+    settings = OrganizationSettings(id='A', settings={'domains': ['a.com']})
+
+    result = settings.to_dict()
+    result['settings']['domains'].append('b.com')
+
+    assert settings.settings == {'domains': ['a.com']}
+
+
+def test_pickle():
+    organization = create_organization('A')
+    payload = pickle.dumps(organization)
+
+    assert pickle.loads(payload) == organization
+    # Field values are pickled without their names
+    assert b'subdomain' not in payload
+
+
+def test_unpickle_previous_versions():
+    organization = create_organization('A')
+
+    class LegacyPickler(pickle.Pickler):
+        def reducer_override(self, obj):
+            if isinstance(obj, Organization):
+                return copyreg.__newobj__, (Organization,), obj.to_dict()
+            return NotImplemented
+
+    file = io.BytesIO()
+    LegacyPickler(file).dump(organization)
+
+    assert pickle.loads(file.getvalue()) == organization
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_to_json(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(models, 'orjson', None)
+
+    organization = create_organization('A')
+
+    assert json.loads(organization.to_json()) == dict(
+        organization.to_dict(), created_at='2021-01-01T00:00:00',
+        updated_at='2021-01-01T00:00:00')
+    assert OrganizationSettings(id='Ä', settings={}).to_json() == (
+        '{"id":"Ä","settings":{}}'.encode('utf-8'))
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_encode_models(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(models, 'orjson', None)
+
+    organizations = [
+        Organization(id=i, name=i, subdomain=i, status='FINISHED',
+                     created_at='2022-02-09T09:44:58Z',
+                     updated_at='2022-10-28T03:59:10Z')
+        for i in 'AB'
+    ]
+
+    data = encode_models(organizations)
+
+    assert json.loads(data)[1]['id'] == 'B'
+    assert decode_models(Organization, data) == organizations
+    assert decode_models(Organization, encode_models([])) == []
+
+
+def test_decode_nested_models():
+    settings = [
+        OrganizationSettings(
+            id='A',
+            settings=OrganizationSettingsContent(
+                allow_recipient_registration=True,
+                attach_completion_certificate=False,
+                require_electronic_signature_consent=True,
+                allow_reusable_flow=False,
+                verified_domains=['example.com'],
+            ),
+        ),
+    ]
+
+    decoded = decode_models(OrganizationSettings, encode_models(settings))
+
+    assert decoded == settings
+    assert isinstance(decoded[0].settings, OrganizationSettingsContent)
@@ -5,9 +5,12 @@
 # For the full copyright and license information, please view
 # the LICENSE file that was distributed with this source code.
 
+import itertools
+
 import pytest
 
-from airslate.resources import BaseResource
+from airslate.exceptions import InternalServerError
+from airslate.resources import BaseResource, Endpoint, fetch_concurrently
 
 
 @pytest.mark.parametrize(
@@ -22,6 +25,17 @@ def test_resolve_endpoint(provided, expected, client):
     assert resource.resolve_endpoint(provided) == expected
 
 
+def test_resolve_endpoint_template(client):
+    resource = BaseResource(client)
+    endpoint = resource.resolve_endpoint('organizations/{org_id}/settings',
+                                         org_id='ABC')
+
+    assert isinstance(endpoint, Endpoint)
+    assert endpoint == '/v1/organizations/ABC/settings'
+    assert endpoint.template == '/v1/organizations/{org_id}/settings'
+    assert resource.resolve_endpoint('foo').template == '/v1/foo'
+
+
 @pytest.mark.parametrize(
     'api_version,expected',
     [
@@ -35,3 +49,20 @@ def test_resolve_endpoint(provided, expected, client):
 def test_custom_api_version(api_version, expected, client):
     resource = BaseResource(client, api_version)
     assert resource.resolve_endpoint('addons-token') == expected
+
+
+def test_fetch_concurrently_backs_off(mocker):
+    sleep = mocker.patch('airslate.resources.time.sleep')
+    calls = itertools.count()
+
+    def fetch(number):
+        if number == 2 and next(calls) < 2:
+            raise InternalServerError()
+        return {'page': number}
+
+    pages = fetch_concurrently(fetch, [1, 2, 3], retries=2, backoff=0.5)
+
+    assert pages == {1: {'page': 1}, 2: {'page': 2}, 3: {'page': 3}}
+    first, second = [call.args[0] for call in sleep.call_args_list]
+    assert 0 <= first <= 0.5
+    assert 0.5 <= second <= max(0.5, first * 3)
@@ -6,12 +6,16 @@
 # the LICENSE file that was distributed with this source code.
 
 import json
+import re
+import threading
+import time
 
 import pytest
 import responses
 from responses import GET
+from responses.matchers import query_param_matcher
 
-from airslate.exceptions import MissingData
+from airslate.exceptions import BadRequest, MissingData
 from .factories import OrganizationFactory
 
 
@@ -82,3 +86,272 @@ def test_settings(client):
 
     expected = json.dumps(expected, sort_keys=True)
     assert actual == expected
+
+
+def add_page(client, page, ids, meta=None):
+    responses.add(
+        GET,
+        f'{client.base_url}/v1/organizations',
+        status=200,
+        json={
+            'meta': meta or {},
+            'data': [OrganizationFactory(id=i) for i in ids],
+        },
+        match=[query_param_matcher({'page': str(page)}, strict_match=False)],
+    )
+
+
+@responses.activate
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_iter_collection(client, prefetch):
+    add_page(client, 1, ['A', 'B'], meta={'last_page': 3})
+    add_page(client, 2, ['C', 'D'], meta={'last_page': 3})
+    add_page(client, 3, ['E'], meta={'last_page': 3})
+
+    organizations = client.organizations.iter_collection(prefetch=prefetch)
+
+    assert [o.id for o in organizations] == ['A', 'B', 'C', 'D', 'E']
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_iter_collection_is_lazy(client):
+    add_page(client, 1, ['A', 'B'])
+    add_page(client, 2, ['C'])
+    add_page(client, 3, [])
+
+    organizations = client.organizations.iter_collection()
+
+    assert next(organizations).id == 'A'
+    assert len(responses.calls) == 1
+
+    assert [o.id for o in organizations] == ['B', 'C']
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_iter_collection_per_page(client):
+    add_page(client, 2, ['C', 'D'])
+    add_page(client, 3, ['E'])
+
+    organizations = client.organizations.iter_collection(page=2, per_page=2)
+
+    assert [o.id for o in organizations] == ['C', 'D', 'E']
+    assert responses.calls[0].request.params == {'page': '2', 'per_page': '2'}
+
+
+@responses.activate
+def test_collection_all(client):
+    meta = {'last_page': 4}
+    add_page(client, 1, ['A', 'B'], meta=meta)
+    add_page(client, 2, ['C', 'D'], meta=meta)
+    add_page(client, 3, ['E', 'F'], meta=meta)
+    add_page(client, 4, ['G'], meta=meta)
+
+    organizations = client.organizations.collection_all(concurrency=3)
+
+    assert [o.id for o in organizations] == list('ABCDEFG')
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_collection_all_retries_failed_pages(client):
+    meta = {'total': 5, 'per_page': 2}
+    add_page(client, 1, ['A', 'B'], meta=meta)
+    responses.add(
+        GET,
+        f'{client.base_url}/v1/organizations',
+        status=400,
+        json={},
+        match=[query_param_matcher({'page': '3'}, strict_match=False)],
+    )
+    add_page(client, 2, ['C', 'D'], meta=meta)
+    add_page(client, 3, ['E'], meta=meta)
+
+    organizations = client.organizations.collection_all()
+
+    assert [o.id for o in organizations] == list('ABCDE')
+    pages = [c.request.params['page'] for c in responses.calls]
+    assert sorted(pages) == ['1', '2', '3', '3']
+
+
+@responses.activate
+def test_collection_all_raises_error(client):
+    add_page(client, 1, ['A', 'B'], meta={'last_page': 2})
+    responses.add(
+        GET,
+        f'{client.base_url}/v1/organizations',
+        status=400,
+        json={},
+        match=[query_param_matcher({'page': '2'}, strict_match=False)],
+    )
+
+    with pytest.raises(BadRequest):
+        client.organizations.collection_all(page_retries=1)
+
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_collection_all_without_metadata(client):
+    add_page(client, 1, ['A', 'B'])
+    add_page(client, 2, ['C'])
+    add_page(client, 3, [])
+
+    organizations = client.organizations.collection_all()
+
+    assert [o.id for o in organizations] == list('ABC')
+
+
+@responses.activate
+def test_stream_collection(client):
+    add_page(client, 1, ['A', 'B', 'C'])
+
+    organizations = client.organizations.stream_collection(page=1)
+
+    assert [o.id for o in organizations] == ['A', 'B', 'C']
+    assert responses.calls[0].request.params == {'page': '1'}
+
+
+@responses.activate
+def test_stream_collection_missing_data(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, status=200, json={'meta': {}})
+
+    with pytest.raises(MissingData):
+        list(client.organizations.stream_collection())
+
+
+@responses.activate
+def test_collection_batch(client):
+    add_page(client, 1, ['A', 'B'], meta={'last_page': 2})
+    add_page(client, 2, ['C'], meta={'last_page': 2})
+
+    batch = client.organizations.collection_batch(page=1)
+    assert batch.column('id') == ['A', 'B']
+
+    batch = client.organizations.collection_batch(all_pages=True)
+    assert batch.column('id') == ['A', 'B', 'C']
+    assert batch[2].id == 'C'
+
+
+def settings_data(org_id):
+    return {
+        'id': org_id,
+        'settings': {
+            'allow_recipient_registration': True,
+            'attach_completion_certificate': True,
+            'require_electronic_signature_consent': False,
+            'allow_reusable_flow': True,
+            'verified_domains': [],
+        }
+    }
+
+
+def add_settings(client, org_id, status=200):
+    responses.add(
+        GET,
+        f'{client.base_url}/v1/organizations/{org_id}/settings',
+        status=status,
+        json=settings_data(org_id) if status == 200 else {},
+    )
+
+
+@responses.activate
+def test_settings_many(client):
+    for org_id in 'ABC':
+        add_settings(client, org_id)
+    add_settings(client, 'X', status=400)
+
+    results = client.organizations.settings_many(
+        ['C', 'X', 'A', 'B', 'A'], concurrency=2)
+
+    assert list(results) == ['C', 'X', 'A', 'B']
+    assert [r.ok for r in results.values()] == [True, False, True, True]
+    assert results['A'].unwrap().id == 'A'
+    assert isinstance(results['X'].error, BadRequest)
+    with pytest.raises(BadRequest):
+        results['X'].unwrap()
+
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_settings_many_load_error(client):
+    add_settings(client, 'A')
+    responses.add(GET, f'{client.base_url}/v1/organizations/B/settings',
+                  body='not json')
+
+    results = client.organizations.settings_many(['A', 'B'])
+
+    assert results['A'].ok
+    assert isinstance(results['B'].error, ValueError)
+
+
+@responses.activate
+def test_settings_many_uses_client_executor(client):
+    threads = []
+
+    def callback(request):
+        threads.append(threading.current_thread().name)
+        org_id = request.url.split('/')[-2]
+        return 200, {}, json.dumps(settings_data(org_id))
+
+    responses.add_callback(
+        GET,
+        re.compile(f'{client.base_url}/v1/organizations/.+/settings'),
+        callback=callback,
+    )
+
+    client.organizations.settings_many(['A', 'B', 'C'])
+    assert all(name.startswith('airslate_') for name in threads)
+
+    # Once the client pool is shut down the calls run in a pool of their own
+    client.shutdown()
+    client.organizations.settings_many(['D'])
+    assert not threads[-1].startswith('airslate_')
+
+
+@responses.activate
+def test_settings_many_async(client):
+    # The background call does not wait for the calls queued behind it
+    client.options['background_workers'] = 1
+    for org_id in 'AB':
+        add_settings(client, org_id)
+
+    future = client.organizations.settings_many_async(['A', 'B'])
+    results = future.result(timeout=5)
+
+    assert [r.unwrap().id for r in results.values()] == ['A', 'B']
+
+
+@responses.activate
+@pytest.mark.parametrize('concurrency', [3, 8])
+def test_iter_settings_concurrency(client, concurrency):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def callback(request):
+        with lock:
+            running.append(request)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(request)
+        org_id = request.url.split('/')[-2]
+        return 200, {}, json.dumps(settings_data(org_id))
+
+    responses.add_callback(
+        GET,
+        re.compile(f'{client.base_url}/v1/organizations/.+/settings'),
+        callback=callback,
+    )
+
+    org_ids = [str(i) for i in range(concurrency * 2)]
+    results = client.organizations.iter_settings(iter(org_ids),
+                                                 concurrency=concurrency)
+
+    assert sorted(r.key for r in results) == sorted(org_ids)
+    # Not capped by the 4 threads of the client pool
+    assert max(peak) == concurrency
@@ -0,0 +1,106 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import pytest
+
+from airslate.cache import (
+    BaseCache,
+    CacheEntry,
+    FileCache,
+    MemoryCache,
+    create_cache,
+)
+
+URL = 'https://api.airslate.io/v1/organizations'
+
+
+def create_entry(content=b'{}', **headers):
+    return CacheEntry(
+        url=URL,
+        status_code=200,
+        headers=headers,
+        content=content,
+        encoding='utf-8',
+    )
+
+
+def test_memory_cache_lru():
+    cache = MemoryCache(maxsize=2)
+    cache.set(URL, f'{URL}?page=1', create_entry(b'1'))
+    cache.set(URL, f'{URL}?page=2', create_entry(b'2'))
+
+    # Make the first page the most recently used one
+    assert cache.get(URL, f'{URL}?page=1').content == b'1'
+    cache.set(URL, f'{URL}?page=3', create_entry(b'3'))
+
+    assert len(cache) == 2
+    assert cache.get(URL, f'{URL}?page=2') is None
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.parametrize('cache_factory', [
+    lambda tmp_path: MemoryCache(maxsize=10),
+    lambda tmp_path: FileCache(str(tmp_path)),
+])
+def test_invalidate(tmp_path, cache_factory):
+    cache = cache_factory(tmp_path)
+    other = f'{URL}/1/settings'
+
+    cache.set(URL, f'{URL}?page=1', create_entry())
+    cache.set(URL, f'{URL}?page=2', create_entry())
+    cache.set(other, other, create_entry())
+
+    cache.invalidate(URL)
+
+    assert cache.get(URL, f'{URL}?page=1') is None
+    assert cache.get(URL, f'{URL}?page=2') is None
+    assert cache.get(other, other) is not None
+
+    cache.clear()
+    assert cache.get(other, other) is None
+
+
+def test_file_cache(tmp_path):
+    entry = create_entry(b'{"data": []}', ETag='"v1"')
+    FileCache(str(tmp_path)).set(URL, URL, entry)
+
+    # Entries are shared by cache instances using the same directory
+    cached = FileCache(str(tmp_path)).get(URL, URL)
+
+    assert cached == entry
+    assert cached.to_response().json() == {'data': []}
+    assert cached.validators() == {'If-None-Match': '"v1"'}
+
+
+def test_freshness():
+    cache = MemoryCache(ttl=60.0)
+    entry = create_entry()
+    assert cache.is_fresh(entry)
+
+    entry.stored_at -= 60.0
+    assert not cache.is_fresh(entry)
+
+
+def test_create_cache(tmp_path):
+    options = {'cache_maxsize': 0, 'cache_ttl': 0.0, 'cache_dir': None}
+    assert create_cache(options) is None
+
+    cache = create_cache(dict(options, cache_maxsize=10))
+    assert isinstance(cache, MemoryCache)
+    assert cache.maxsize == 10
+
+    cache = create_cache(dict(options, cache_dir=str(tmp_path)))
+    assert isinstance(cache, FileCache)
+
+
+def test_incomplete_cache():
+    class IncompleteCache(BaseCache):
+        def get(self, url, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()
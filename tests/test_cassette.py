@@ -0,0 +1,127 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import pytest
+import responses
+from responses import GET
+
+from airslate import exceptions
+from airslate.exceptions import BaseError
+from airslate.cassette import (
+    RECORD,
+    Cassette,
+    CassetteAdapter,
+    CassetteMiss,
+    Interaction,
+)
+from airslate.client import Client
+from airslate.sessions import RetrySession
+from tests.resources.factories import OrganizationFactory
+
+BASE_URL = 'http://localhost.localdomain'
+
+
+def replay_client(cassette, **faults):
+    session = RetrySession()
+    CassetteAdapter(cassette, **faults).mount(session)
+    return Client(session, base_url=BASE_URL)
+
+
+def interaction(url, body=b'{}', status=200):
+    return Interaction(method='GET', url=url, status=status, reason='OK',
+                       headers=(('Content-Type', 'application/json'),),
+                       body=body)
+
+
+@responses.activate
+def test_record_and_replay(tmp_path):
+    url = f'{BASE_URL}/v1/organizations'
+    responses.add(GET, url, json={'data': [OrganizationFactory()]})
+
+    path = str(tmp_path / 'organizations.json.gz')
+    session = RetrySession()
+    CassetteAdapter(Cassette(path=path), RECORD).mount(session)
+
+    with Client(session, base_url=BASE_URL) as client:
+        recorded = client.organizations.collection()
+
+    responses.reset()
+    cassette = Cassette.load(path)
+    assert len(cassette) == 1
+
+    with replay_client(cassette) as client:
+        replayed = client.organizations.collection()
+
+    assert [o.id for o in replayed] == [o.id for o in recorded]
+    assert len(responses.calls) == 0
+
+
+def test_replay_cycles_captured_responses():
+    url = f'{BASE_URL}/v1/organizations'
+    cassette = Cassette([interaction(url, b'{"n": 1}'),
+                         interaction(url, b'{"n": 2}')])
+    client = replay_client(cassette)
+
+    bodies = [client.get('/v1/organizations').json()['n'] for _ in range(3)]
+
+    assert bodies == [1, 2, 1]
+
+
+def test_replay_miss():
+    client = replay_client(Cassette())
+
+    with pytest.raises(CassetteMiss) as exc_info:
+        client.get('/v1/organizations')
+
+    assert isinstance(exc_info.value, BaseError)
+
+
+def test_record_wraps_mounted_adapter():
+    session = RetrySession()
+    mounted = session.get_adapter('https://')
+    adapter = CassetteAdapter(Cassette(), RECORD).mount(session)
+
+    assert adapter.adapter is mounted
+    assert session.get_adapter('https://') is adapter
+    assert session.get_adapter('http://') is adapter
+
+
+def test_binary_body_round_trip(tmp_path):
+    path = str(tmp_path / 'binary.json')
+    body = bytes(range(256))
+    Cassette([interaction(f'{BASE_URL}/file', body)], path=path).save()
+
+    loaded = Cassette.load(path)
+
+    assert loaded.find('get', f'{BASE_URL}/file').body == body
+
+
+def test_injected_faults():
+    url = f'{BASE_URL}/v1/organizations'
+    cassette = Cassette([interaction(url)])
+
+    with pytest.raises(exceptions.InternalServerError):
+        replay_client(cassette, error_rate=1.0).get('/v1/organizations')
+
+    response = replay_client(cassette, throttle_rate=1.0, retry_after=2).get(
+        '/v1/organizations')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '2'
+
+
+def test_injected_faults_are_reproducible():
+    url = f'{BASE_URL}/v1/organizations'
+    cassette = Cassette([interaction(url)])
+
+    def statuses():
+        client = replay_client(cassette, throttle_rate=0.5, seed=42)
+        return [client.get('/v1/organizations').status_code
+                for _ in range(20)]
+
+    first = statuses()
+    assert first == statuses()
+    assert set(first) == {200, 429}
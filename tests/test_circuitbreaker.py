@@ -0,0 +1,187 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import asyncio
+
+import httpx
+import pytest
+import responses
+from responses import GET
+
+from airslate import exceptions
+from airslate.aio.client import AsyncClient
+from airslate.aio.sessions import AsyncRetrySession
+from airslate.circuitbreaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    create_circuit_breakers,
+)
+from airslate.client import Client, status_errors
+
+
+def trip(breaker):
+    for _ in range(breaker.MIN_CALLS):
+        breaker.record(True, 0.0)
+
+
+def test_opens_on_failure_rate():
+    breaker = CircuitBreaker('api.airslate.io', failure_rate=0.5)
+
+    for i in range(breaker.MIN_CALLS):
+        breaker.record(i % 3 == 0, 0.0)
+    assert breaker.state == CLOSED
+
+    for _ in range(breaker.MIN_CALLS):
+        breaker.record(True, 0.0)
+    assert breaker.state == OPEN
+
+    with pytest.raises(exceptions.CircuitOpenError) as exc_info:
+        breaker.allow()
+
+    assert exc_info.value.host == 'api.airslate.io'
+    assert exc_info.value.status == 503
+    assert 0 < exc_info.value.retry_after <= 30.0
+
+
+def test_opens_on_slow_calls():
+    breaker = CircuitBreaker('api.airslate.io', slow_call=1.0)
+
+    for _ in range(breaker.MIN_CALLS):
+        breaker.record(False, 2.0)
+
+    assert breaker.state == OPEN
+
+
+def test_half_open_trial():
+    breaker = CircuitBreaker('api.airslate.io', recovery_timeout=0.0)
+    trip(breaker)
+    assert breaker.state == HALF_OPEN
+
+    # Only one trial request is let through at once
+    breaker.allow()
+    with pytest.raises(exceptions.CircuitOpenError):
+        breaker.allow()
+
+    breaker.record(True, 0.0)
+    assert breaker.state == HALF_OPEN
+    assert breaker._state == OPEN
+
+    breaker.allow()
+    breaker.record(False, 0.0)
+    assert breaker.state == CLOSED
+
+
+def test_stale_outcomes_are_ignored():
+    breaker = CircuitBreaker('api.airslate.io', recovery_timeout=0.0)
+    # Let through while closed, completed once the circuit is half-open
+    stale = [breaker.allow() for _ in range(3)]
+    trip(breaker)
+
+    trial = breaker.allow()
+    for generation in stale:
+        breaker.record(False, 0.0, generation)
+
+    assert breaker._state == HALF_OPEN
+    assert breaker._trials == 1
+    with pytest.raises(exceptions.CircuitOpenError):
+        breaker.allow()
+
+    breaker.record(False, 0.0, trial)
+    assert breaker.state == CLOSED
+
+
+def test_call_classifies_errors():
+    breaker = CircuitBreaker('api.airslate.io')
+
+    def fail(error):
+        raise error
+
+    for _ in range(breaker.MIN_CALLS):
+        with pytest.raises(exceptions.NotFoundError):
+            breaker.call(fail, exceptions.NotFoundError())
+    assert breaker.state == CLOSED
+
+    for _ in range(breaker.MIN_CALLS):
+        with pytest.raises(exceptions.InternalServerError):
+            breaker.call(fail, exceptions.InternalServerError())
+    assert breaker.state == OPEN
+
+
+def test_create_circuit_breakers():
+    options = dict(Client.DEFAULT_OPTIONS)
+    assert create_circuit_breakers(options) is None
+
+    breakers = create_circuit_breakers(dict(options, circuit_breaker=True))
+    breaker = breakers.get('https://api.airslate.io/v1/organizations')
+
+    assert breakers.get('https://api.airslate.io/v1/other') is breaker
+    assert breaker.failure_rate == 0.5
+    assert breakers.states() == {'api.airslate.io': CLOSED}
+
+
+@responses.activate
+def test_client_fails_fast():
+    client = Client(base_url='http://localhost.localdomain',
+                    circuit_breaker=True, max_retries=0)
+    url = 'http://localhost.localdomain/v1/organizations'
+    responses.add(GET, url, status=500, json={})
+
+    for _ in range(CircuitBreaker.MIN_CALLS):
+        with pytest.raises(exceptions.RetryApiError):
+            client.get('/v1/organizations')
+
+    with pytest.raises(exceptions.CircuitOpenError):
+        client.get('/v1/organizations')
+
+    assert len(responses.calls) == CircuitBreaker.MIN_CALLS
+    assert client.circuit_breakers.states() == {'localhost.localdomain': OPEN}
+
+
+def test_async_client_fails_fast():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500, json={})
+
+    async def main():
+        session = AsyncRetrySession(transport=httpx.MockTransport(handler),
+                                    max_retries=0)
+        client = AsyncClient(session, circuit_breaker=True)
+        for _ in range(CircuitBreaker.MIN_CALLS):
+            with pytest.raises(exceptions.RetryApiError):
+                await client.get('/v1/organizations')
+
+        await client.get('/v1/organizations')
+
+    with pytest.raises(exceptions.CircuitOpenError):
+        asyncio.run(main())
+
+    assert len(calls) == CircuitBreaker.MIN_CALLS
+
+
+def test_async_rate_limit_wait_is_not_slow_call():
+    def handler(_request):
+        return httpx.Response(200, json={})
+
+    async def main():
+        session = AsyncRetrySession(transport=httpx.MockTransport(handler))
+        # Each request waits for the limiter longer than a slow call takes
+        client = AsyncClient(session, circuit_breaker=True,
+                             circuit_slow_call=0.02, rate_limit=40,
+                             rate_limit_burst=1)
+        for _ in range(CircuitBreaker.MIN_CALLS):
+            await client.get('/v1/organizations')
+        return client.circuit_breakers.states()
+
+    assert asyncio.run(main()) == {'api.airslate.io': CLOSED}
+
+
+def test_circuit_open_error_is_not_mapped():
+    assert exceptions.CircuitOpenError not in status_errors().values()
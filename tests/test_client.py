@@ -5,11 +5,23 @@
 # For the full copyright and license information, please view
 # the LICENSE file that was distributed with this source code.
 
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 import responses
-from responses import POST
+from responses import GET, PATCH, POST
 
-from airslate.client import Client
+from airslate import exceptions
+from airslate.client import Client, status_errors
 from airslate.utils import default_headers
+from tests.resources.factories import OrganizationFactory
 
 
 @responses.activate
@@ -76,24 +88,174 @@ def test_collection_response(client):
 def test_custom_options():
     client = Client()
     assert client.options == {
+        'background_workers': 4,
         'base_url': 'https://api.airslate.io',
+        'cache_dir': None,
+        'cache_maxsize': 0,
+        'cache_ttl': 0.0,
+        'circuit_breaker': False,
+        'circuit_failure_rate': 0.5,
+        'circuit_recovery_timeout': 30.0,
+        'circuit_slow_call': None,
+        'coalesce': False,
+        'hedge': False,
+        'hedge_delay': None,
+        'hedge_ratio': 0.05,
+        'keep_alive': True,
         'max_retries': 3,
+        'metrics': False,
+        'pool_connections': 10,
+        'pool_idle_timeout': 60.0,
+        'pool_maxsize': 10,
+        'rate_limit': None,
+        'rate_limit_burst': None,
+        'retry_budget': None,
         'timeout': 5.0,
         'version': 'v1'
     }
 
     client = Client(foo='1', bar='2', baz='3')
     assert client.options == {
+        'background_workers': 4,
         'bar': '2',
         'base_url': 'https://api.airslate.io',
         'baz': '3',
+        'cache_dir': None,
+        'cache_maxsize': 0,
+        'cache_ttl': 0.0,
+        'circuit_breaker': False,
+        'circuit_failure_rate': 0.5,
+        'circuit_recovery_timeout': 30.0,
+        'circuit_slow_call': None,
+        'coalesce': False,
         'foo': '1',
+        'hedge': False,
+        'hedge_delay': None,
+        'hedge_ratio': 0.05,
+        'keep_alive': True,
         'max_retries': 3,
+        'metrics': False,
+        'pool_connections': 10,
+        'pool_idle_timeout': 60.0,
+        'pool_maxsize': 10,
+        'rate_limit': None,
+        'rate_limit_burst': None,
+        'retry_budget': None,
         'timeout': 5.0,
         'version': 'v1'
     }
 
 
+@responses.activate
+def test_modified_options(client):
+    responses.add(GET, 'http://localhost.localdomain/v1/organizations',
+                  json={})
+    responses.add(GET, 'http://api.localdomain/v1/organizations', json={})
+
+    client.get('/v1/organizations')
+    client.options['per_page'] = 5
+    client.get('/v1/organizations')
+    client.get('/v1/organizations', base_url='http://api.localdomain')
+
+    urls = [call.request.url for call in responses.calls]
+    assert urls == [
+        'http://localhost.localdomain/v1/organizations',
+        'http://localhost.localdomain/v1/organizations?per_page=5',
+        'http://api.localdomain/v1/organizations?per_page=5',
+    ]
+
+
+@responses.activate
+def test_reassigned_options(client):
+    responses.add(GET, 'http://localhost.localdomain/v1/organizations',
+                  json={})
+    responses.add(GET, 'http://api.localdomain/v1/organizations', json={})
+
+    client.get('/v1/organizations')
+    client.options = dict(client.options, base_url='http://api.localdomain',
+                          timeout=2.5)
+    client.get('/v1/organizations')
+
+    calls = [(call.request.url, call.request.req_kwargs['timeout'])
+             for call in responses.calls]
+    assert calls == [
+        ('http://localhost.localdomain/v1/organizations', 5.0),
+        ('http://api.localdomain/v1/organizations', 2.5),
+    ]
+
+
+@responses.activate
+def test_header_names_are_case_insensitive(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, json={})
+
+    client.get('/v1/organizations', headers={'user-agent': 'Test'})
+
+    headers = responses.calls[0].request.headers
+    assert headers['User-Agent'] == 'Test'
+    assert 'Content-Type' not in headers
+
+
+def test_lazy_imports():
+    script = (
+        'import sys, airslate.client; '
+        'print(*sorted({"jwt", "marshmallow", "opentelemetry", '
+        '"requests_oauthlib"} & '
+        'set(sys.modules)))'
+    )
+    output = subprocess.run([sys.executable, '-c', script], check=True,
+                            capture_output=True, text=True).stdout
+
+    assert output.strip() == ''
+
+
+def test_status_errors_are_shared():
+    first, second = Client(), Client()
+
+    assert first.statuses == second.statuses == status_errors()
+    assert first.statuses is not second.statuses
+    assert status_errors()[404] is exceptions.NotFoundError
+
+
+def test_pool_options():
+    client = Client(
+        pool_connections=2,
+        pool_maxsize=20,
+        pool_idle_timeout=None,
+    )
+    adapter = client.session.adapters['https://']
+
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 20
+    assert adapter.idle_timeout is None
+
+
+@responses.activate
+def test_keep_alive(client, mocker):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(POST, url, status=200, body='{}')
+
+    close = mocker.spy(client.session, 'close')
+
+    client.post('/v1/organizations', {})
+    client.post('/v1/organizations', {})
+    assert close.call_count == 0
+    assert responses.calls[1].request.headers['Connection'] == 'keep-alive'
+
+    # The shared session is not closed, the server is asked to close the
+    # connection instead
+    client.post('/v1/organizations', {}, keep_alive=False)
+    assert close.call_count == 0
+    assert responses.calls[2].request.headers['Connection'] == 'close'
+
+
+def test_context_manager(mocker):
+    with Client() as client:
+        close = mocker.spy(client.session, 'close')
+
+    close.assert_called_once_with()
+
+
 def test_parse_parameter_options(client):
     assert {} == client._parse_parameter_options({})
     assert {'foo': 'bar'} == client._parse_parameter_options({'foo': 'bar'})
@@ -128,3 +290,240 @@ def test_parse_request_options(client):
 
     expected = {'headers': {'a': 'b'}, 'timeout': 5.0}
     assert expected == client._parse_request_options({'headers': {'a': 'b'}})
+
+
+@responses.activate
+def test_cached_get():
+    client = Client(base_url='http://localhost.localdomain', cache_maxsize=2)
+    url = 'http://localhost.localdomain/v1/organizations'
+
+    responses.add(GET, url, status=200, json={'data': [1]},
+                  headers={'ETag': '"v1"'})
+    responses.add(GET, url, status=304)
+
+    assert client.get('/v1/organizations').json() == {'data': [1]}
+    assert client.get('/v1/organizations').json() == {'data': [1]}
+
+    assert 'If-None-Match' not in responses.calls[0].request.headers
+    assert responses.calls[1].request.headers['If-None-Match'] == '"v1"'
+    assert client.cache.stats.to_dict() == {
+        'hits': 1,
+        'misses': 1,
+        'revalidations': 1,
+        'evictions': 0,
+    }
+
+
+@responses.activate
+def test_cached_get_ttl():
+    client = Client(base_url='http://localhost.localdomain',
+                    cache_maxsize=2, cache_ttl=60.0)
+    url = 'http://localhost.localdomain/v1/organizations'
+    responses.add(GET, url, status=200, json={'data': []})
+
+    client.get('/v1/organizations', page=1)
+    client.get('/v1/organizations', page=1)
+    client.get('/v1/organizations', page=2)
+    client.get('/v1/organizations', page=3)
+
+    assert len(responses.calls) == 3
+    assert client.cache.stats.hits == 1
+    assert client.cache.stats.evictions == 1
+
+
+@responses.activate
+def test_cache_invalidation():
+    client = Client(base_url='http://localhost.localdomain',
+                    cache_maxsize=2, cache_ttl=60.0)
+    url = 'http://localhost.localdomain/v1/organizations'
+    responses.add(GET, url, status=200, json={'data': []})
+    responses.add(PATCH, url, status=200, json={})
+
+    client.get('/v1/organizations')
+    client.patch('/v1/organizations', {})
+    client.get('/v1/organizations')
+
+    assert [c.request.method for c in responses.calls] == [
+        'GET', 'PATCH', 'GET']
+
+
+@responses.activate
+def test_coalesced_get():
+    client = Client(base_url='http://localhost.localdomain', coalesce=True)
+    url = 'http://localhost.localdomain/v1/organizations'
+    release = threading.Event()
+
+    def callback(_request):
+        release.wait(5.0)
+        return 200, {}, '{"data": []}'
+
+    responses.add_callback(GET, url, callback=callback)
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(client.get, '/v1/organizations')
+                   for _ in range(8)]
+        while client.single_flight.coalesced < 7:
+            time.sleep(0.001)
+        release.set()
+
+    assert len(responses.calls) == 1
+    assert len({id(f.result()) for f in futures}) == 1
+
+    # Requests with different query are not coalesced
+    client.get('/v1/organizations', page=1)
+    client.get('/v1/organizations', page=2)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_request_headers_do_not_leak(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, status=200, json={})
+
+    client.get('/v1/organizations', headers={'X-Request-Id': '1'})
+    client.get('/v1/organizations')
+
+    assert responses.calls[0].request.headers['X-Request-Id'] == '1'
+    assert 'X-Request-Id' not in responses.calls[1].request.headers
+    assert 'X-Request-Id' not in client.session.headers
+
+
+@responses.activate
+def test_retry_budget_exhausted():
+    client = Client(base_url='http://localhost.localdomain', retry_budget=0.0)
+    budget = client.session.adapters['http://'].max_retries.budget
+    budget.min_retries = 0
+
+    responses.add(GET, 'http://localhost.localdomain/v1/organizations',
+                  status=503, json={})
+
+    with pytest.raises(exceptions.RetryApiError) as exc_info:
+        client.get('/v1/organizations')
+
+    assert exc_info.value.message == 'Retry budget exhausted'
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_submit():
+    client = Client(base_url='http://localhost.localdomain')
+    url = 'http://localhost.localdomain/v1/organizations'
+    release = threading.Event()
+
+    def callback(_request):
+        release.wait(5.0)
+        return 200, {}, '{"data": []}'
+
+    responses.add_callback(GET, url, callback=callback)
+    responses.add(POST, url, status=201, json={})
+
+    # Both calls are in flight at once
+    first = client.submit('get', '/v1/organizations')
+    second = client.submit('GET', '/v1/organizations', page=2)
+    assert not first.done() and not second.done()
+    release.set()
+
+    assert first.result(5.0).json() == {'data': []}
+    assert second.result(5.0).status_code == 200
+    assert client.submit('post', '/v1/organizations', {}).result(
+        5.0).status_code == 201
+
+    client.close()
+    with pytest.raises(RuntimeError):
+        client.submit('get', '/v1/organizations')
+
+
+@responses.activate
+def test_submit_cancel():
+    client = Client(base_url='http://localhost.localdomain',
+                    background_workers=1)
+    url = 'http://localhost.localdomain/v1/organizations'
+    release = threading.Event()
+
+    def callback(_request):
+        release.wait(5.0)
+        return 200, {}, '{"data": []}'
+
+    responses.add_callback(GET, url, callback=callback)
+
+    running = client.submit('get', '/v1/organizations')
+    queued = client.submit('get', '/v1/organizations')
+
+    assert queued.cancel()
+    release.set()
+    client.shutdown()
+
+    assert running.result().status_code == 200
+    assert queued.cancelled()
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_resource_background_methods(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, json={'data': [OrganizationFactory(id='A')]})
+
+    future = client.organizations.collection_async()
+
+    assert [o.id for o in future.result(5.0)] == ['A']
+    assert 'in the background' in type(
+        client.organizations).collection_async.__doc__
+
+
+def test_pickle():
+    client = Client(auth=('user', 'secret'), base_url='http://example.com',
+                    headers={'X-Tenant': 'acme'}, timeout=5.0)
+    client.headers['X-Trace'] = '1'
+
+    copy = pickle.loads(pickle.dumps(client))
+
+    assert copy.options == client.options
+    assert copy.auth == ('user', 'secret')
+    assert copy.headers == {'X-Tenant': 'acme', 'X-Trace': '1'}
+    assert copy.organizations.client is copy
+    assert copy.session.adapters['https://'].max_retries.total == (
+        client.session.adapters['https://'].max_retries.total)
+
+
+def test_rebuilt_after_fork(mocker):
+    client = Client(base_url='http://localhost.localdomain')
+    adapter = client.session.adapters['http://']
+    poolmanager = adapter.poolmanager
+    executor = client.executor
+
+    mocker.patch('airslate.client.os.getpid', return_value=os.getpid() + 1)
+
+    assert client.executor is not executor
+    assert adapter.poolmanager is not poolmanager
+    client.close()
+    executor.shutdown()
+
+
+def _get_in_child(client, queue):
+    response = client.submit('get', '/v1/organizations').result(5.0)
+    queue.put(response.json())
+
+
+@pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(),
+    reason='fork() is not available')
+@responses.activate
+def test_forked_child():
+    client = Client(base_url='http://localhost.localdomain')
+    url = 'http://localhost.localdomain/v1/organizations'
+    responses.add(GET, url, json={'data': []})
+
+    # The parent threads and connections are not inherited by the child
+    assert client.submit('get', '/v1/organizations').result(5.0).ok
+
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=_get_in_child, args=(client, queue))
+    process.start()
+    try:
+        assert queue.get(timeout=10.0) == {'data': []}
+    finally:
+        process.join(10.0)
+        client.close()
+
+    assert process.exitcode == 0
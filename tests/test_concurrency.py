@@ -0,0 +1,137 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from airslate.concurrency import AsyncSingleFlight, SingleFlight
+
+
+def run_concurrently(flight, func, callers=8):
+    """Call the function through the flight once all callers are waiting."""
+    release = threading.Event()
+
+    def call():
+        return flight.do('key', func, release)
+
+    with ThreadPoolExecutor(callers) as executor:
+        futures = [executor.submit(call) for _ in range(callers)]
+        while flight.coalesced < callers - 1:
+            time.sleep(0.001)
+        release.set()
+
+    return futures
+
+
+def test_single_flight():
+    calls = []
+
+    def func(release):
+        calls.append(1)
+        release.wait()
+        return object()
+
+    flight = SingleFlight()
+    futures = run_concurrently(flight, func)
+
+    assert len(calls) == 1
+    assert len({id(f.result()) for f in futures}) == 1
+
+    # Finished calls are not reused
+    assert flight.do('key', lambda: 'other') == 'other'
+
+
+def test_single_flight_error():
+    error = ValueError('Boom')
+
+    def func(release):
+        release.wait()
+        raise error
+
+    futures = run_concurrently(SingleFlight(), func)
+
+    for future in futures:
+        assert future.exception() is error
+
+
+def test_async_single_flight():
+    calls = []
+
+    async def func(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main():
+        flight = AsyncSingleFlight()
+        results = await asyncio.gather(
+            *[flight.do('key', func, i) for i in range(5)],
+            flight.do('other', func, 'other'),
+        )
+        return flight, results
+
+    flight, results = asyncio.run(main())
+
+    assert results == [0, 0, 0, 0, 0, 'other']
+    assert calls == [0, 'other']
+    assert flight.coalesced == 4
+
+
+def test_async_single_flight_error():
+    async def func():
+        await asyncio.sleep(0.01)
+        raise ValueError('Boom')
+
+    async def main():
+        flight = AsyncSingleFlight()
+        return await asyncio.gather(
+            *[flight.do('key', func) for _ in range(3)],
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(main())
+
+    assert len({id(e) for e in errors}) == 1
+    with pytest.raises(ValueError):
+        raise errors[0]
+
+
+def test_async_single_flight_cancelled_leader():
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'ok'
+
+    async def main():
+        flight = AsyncSingleFlight()
+        leader = asyncio.ensure_future(flight.do('key', func))
+        follower = asyncio.ensure_future(flight.do('key', func))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        result = await follower
+
+        # The call is cancelled once nobody waits for it
+        abandoned = asyncio.ensure_future(flight.do('other', func))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+
+        return leader, result, flight
+
+    leader, result, flight = asyncio.run(main())
+
+    assert leader.cancelled()
+    assert result == 'ok'
+    assert calls == [1, 1]
+    assert flight._calls == {}
@@ -0,0 +1,270 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import asyncio
+import itertools
+import threading
+import time
+
+import httpx
+import pytest
+import responses
+from responses import GET
+
+from airslate import exceptions
+from airslate.aio.client import AsyncClient
+from airslate.aio.sessions import AsyncRetrySession
+from airslate.client import Client
+from airslate.hedging import HedgePolicy, LatencyTracker, create_hedge_policy
+
+
+def slow_first(results=('slow', 'fast'), delay=1.0):
+    """Create a function whose first call is slow."""
+    calls = itertools.count()
+    release = threading.Event()
+
+    def func():
+        number = next(calls)
+        if number == 0:
+            release.wait(delay)
+        return results[min(number, len(results) - 1)]
+
+    return func, release
+
+
+def test_percentile():
+    tracker = LatencyTracker(size=10)
+    assert tracker.percentile(0.95) is None
+
+    for i in range(20):
+        tracker.add(float(i))
+
+    assert len(tracker) == 10
+    assert tracker.percentile(0.5) == 14.0
+    assert tracker.percentile(0.95) == 19.0
+
+
+def test_fast_request_is_not_hedged():
+    policy = HedgePolicy(delay=0.5, ratio=1.0)
+
+    assert policy.call('/v1/foo', lambda: 'ok') == 'ok'
+    assert policy.stats.to_dict() == {'requests': 1, 'hedged': 0, 'wins': 0}
+
+
+def test_slow_request_is_hedged():
+    policy = HedgePolicy(delay=0.01, ratio=1.0)
+    func, release = slow_first()
+
+    try:
+        assert policy.call('/v1/foo', func) == 'fast'
+    finally:
+        release.set()
+        policy.shutdown()
+
+    assert policy.stats.to_dict() == {'requests': 1, 'hedged': 1, 'wins': 1}
+
+
+def test_ratio_caps_hedges():
+    policy = HedgePolicy(delay=0.0, ratio=0.25)
+
+    def func():
+        time.sleep(0.01)
+        return 'ok'
+
+    for _ in range(8):
+        policy.call('/v1/foo', func)
+    policy.shutdown()
+
+    assert policy.stats.requests == 8
+    assert policy.stats.hedged == 2
+
+
+def test_unhedged_requests_run_inline():
+    threads = []
+
+    def func():
+        threads.append(threading.current_thread())
+        return 'ok'
+
+    # The cap does not allow any hedge
+    policy = HedgePolicy(delay=0.0, ratio=0.0)
+    assert policy.call('/v1/foo', func) == 'ok'
+
+    # All the threads of the policy are busy
+    policy = HedgePolicy(delay=0.0, ratio=1.0, max_workers=0)
+    assert policy.call('/v1/foo', func) == 'ok'
+
+    assert threads == [threading.current_thread()] * 2
+    assert policy.stats.to_dict() == {'requests': 1, 'hedged': 0, 'wins': 0}
+
+
+def test_hedge_needs_idle_thread():
+    policy = HedgePolicy(delay=0.01, ratio=1.0, max_workers=1)
+    func, release = slow_first()
+
+    try:
+        assert policy.call('/v1/foo', func) == 'slow'
+    finally:
+        release.set()
+        policy.shutdown()
+
+    assert policy.stats.to_dict() == {'requests': 1, 'hedged': 0, 'wins': 0}
+
+
+def test_waits_for_percentile():
+    policy = HedgePolicy(ratio=1.0)
+    assert policy.delay_for('/v1/foo') is None
+
+    for _ in range(policy.MIN_SAMPLES):
+        policy.call('/v1/foo', lambda: 'ok')
+
+    assert policy.stats.hedged == 0
+    assert 0 <= policy.delay_for('/v1/foo') < 0.1
+    assert policy.delay_for('/v1/bar') is None
+
+
+def test_failed_request_waits_for_other():
+    policy = HedgePolicy(delay=0.01, ratio=1.0)
+    calls = itertools.count()
+
+    def func():
+        if next(calls) == 0:
+            time.sleep(0.05)
+            raise exceptions.InternalServerError()
+        time.sleep(0.1)
+        return 'ok'
+
+    assert policy.call('/v1/foo', func) == 'ok'
+
+    def fail():
+        time.sleep(0.05)
+        raise exceptions.InternalServerError()
+
+    with pytest.raises(exceptions.InternalServerError):
+        policy.call('/v1/foo', fail)
+    policy.shutdown()
+
+
+def test_create_hedge_policy():
+    assert create_hedge_policy(Client().options) is None
+
+    policy = create_hedge_policy(
+        Client(hedge=True, hedge_delay=0.2, hedge_ratio=0.1).options)
+
+    assert policy.delay == 0.2
+    assert policy.ratio == 0.1
+    assert policy.max_workers == 10
+
+    policy = create_hedge_policy(
+        Client(hedge=True, pool_maxsize=64).options)
+    assert policy.max_workers == 64
+
+
+def test_async_slow_request_is_hedged():
+    policy = HedgePolicy(delay=0.01, ratio=1.0)
+    calls = itertools.count()
+    cancelled = []
+
+    async def func():
+        if next(calls) == 0:
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return 'slow'
+        return 'fast'
+
+    async def main():
+        result = await policy.call_async('/v1/foo', func)
+        # Let the loser handle its cancellation
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(main()) == 'fast'
+    assert cancelled == [True]
+    assert policy.stats.to_dict() == {'requests': 1, 'hedged': 1, 'wins': 1}
+
+
+@responses.activate
+def test_hedged_get():
+    client = Client(base_url='http://localhost.localdomain', hedge=True,
+                    hedge_delay=0.01, hedge_ratio=1.0)
+    url = 'http://localhost.localdomain/v1/organizations'
+    release = threading.Event()
+    calls = itertools.count()
+
+    def callback(_):
+        if next(calls) == 0:
+            release.wait(1.0)
+            return 200, {}, '{"data": "slow"}'
+        return 200, {}, '{"data": "fast"}'
+
+    responses.add_callback(GET, url, callback=callback)
+
+    try:
+        response = client.get('/v1/organizations')
+    finally:
+        release.set()
+        client.close()
+
+    assert response.json() == {'data': 'fast'}
+    assert client.hedging.stats.wins == 1
+
+
+@responses.activate
+def test_rate_limit_wait_is_not_hedged():
+    client = Client(base_url='http://localhost.localdomain', hedge=True,
+                    hedge_delay=0.2, hedge_ratio=1.0, rate_limit=2,
+                    rate_limit_burst=1)
+    url = 'http://localhost.localdomain/v1/organizations'
+
+    responses.add(GET, url, json={'data': []})
+    try:
+        for _ in range(2):
+            client.get('/v1/organizations')
+    finally:
+        client.close()
+
+    assert client.hedging.stats.to_dict() == {
+        'requests': 2, 'hedged': 0, 'wins': 0}
+
+
+@responses.activate
+def test_get_hedging_disabled_per_request():
+    client = Client(base_url='http://localhost.localdomain', hedge=True,
+                    hedge_delay=0.0, hedge_ratio=1.0)
+    url = 'http://localhost.localdomain/v1/organizations'
+
+    responses.add(GET, url, json={'data': []})
+    client.get('/v1/organizations', hedge=False)
+
+    assert client.hedging.stats.requests == 0
+    assert 'hedge' not in responses.calls[0].request.url
+
+
+def test_async_hedged_get():
+    calls = itertools.count()
+
+    async def handler(_):
+        if next(calls) == 0:
+            await asyncio.sleep(1.0)
+            return httpx.Response(200, json={'data': 'slow'})
+        return httpx.Response(200, json={'data': 'fast'})
+
+    session = AsyncRetrySession(transport=httpx.MockTransport(handler))
+    client = AsyncClient(session, base_url='http://localhost.localdomain',
+                         hedge=True, hedge_delay=0.01, hedge_ratio=1.0)
+
+    async def main():
+        async with client:
+            return await client.get('/v1/organizations')
+
+    response = asyncio.run(main())
+
+    assert response.json() == {'data': 'fast'}
+    assert client.hedging.stats.wins == 1
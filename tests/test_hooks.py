@@ -0,0 +1,304 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import asyncio
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import responses
+from responses import GET
+
+from airslate import exceptions
+from airslate.aio.client import AsyncClient
+from airslate.aio.sessions import AsyncRetrySession
+from airslate.client import Client
+from airslate.hooks import (
+    BODY,
+    ERROR,
+    EVENTS,
+    LOADED,
+    REQUEST,
+    RESPONSE,
+    RETRY,
+    Hooks,
+    OpenTelemetryHooks,
+)
+from airslate.sessions import RetrySession
+from tests.resources.factories import OrganizationFactory
+
+
+def record(hooks, names=EVENTS):
+    """Subscribe to the events collecting them into a list."""
+    events = []
+    for name in names:
+        hooks.subscribe(name, events.append)
+    return events
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Fail the first request, then reply with a page of Organizations."""
+
+    protocol_version = 'HTTP/1.1'
+    calls = itertools.count()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if next(self.calls) == 0:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = json.dumps({'data': [OrganizationFactory()]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.calls = itertools.count()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_subscribe():
+    hooks = Hooks()
+    assert not hooks
+
+    callback = hooks.subscribe(REQUEST, print)
+    assert callback is print
+    assert hooks
+
+    hooks.unsubscribe(REQUEST, print)
+    assert not hooks
+
+    with pytest.raises(ValueError):
+        hooks.subscribe('unknown', print)
+
+
+@responses.activate
+def test_untraced_request(client):
+    responses.add(GET, f'{client.base_url}/v1/organizations', json={})
+
+    response = client.get('/v1/organizations')
+
+    assert response.request.hooks == {'response': []}
+
+
+@responses.activate
+def test_request_events(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, json={'data': [OrganizationFactory()]})
+    events = record(client.hooks)
+
+    organizations = client.organizations.collection()
+
+    assert len(organizations) == 1
+    assert [e.name for e in events] == [REQUEST, RESPONSE, BODY, LOADED]
+    assert {e.url for e in events} == {url}
+    assert events[0].method == 'GET'
+    assert events[1].status == 200
+
+    # All the events of a request share the context
+    assert len({id(e.context) for e in events}) == 1
+
+    timings = events[-1].timings
+    assert timings.ttfb > 0
+    assert timings.decode > 0
+    assert timings.load > 0
+
+
+@responses.activate
+def test_error_event(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, status=404, json={})
+    events = record(client.hooks)
+
+    with pytest.raises(exceptions.NotFoundError):
+        client.get('/v1/organizations')
+
+    assert [e.name for e in events] == [REQUEST, RESPONSE, ERROR]
+    assert events[-1].status == 404
+    assert isinstance(events[-1].error, exceptions.NotFoundError)
+
+
+def test_retry_and_connection_timings(flaky_server):
+    session = RetrySession(max_retries=1, backoff_factor=0.01)
+    client = Client(session, base_url=flaky_server)
+    events = record(client.hooks)
+
+    with client:
+        client.organizations.collection()
+
+    assert [e.name for e in events] == [
+        REQUEST, RETRY, RESPONSE, BODY, LOADED]
+    assert events[1].attempt == 1
+    assert events[2].status == 200
+
+    timings = events[-1].timings
+    assert timings.connect > 0
+    assert timings.pool > 0
+    assert timings.ttfb >= timings.connect
+
+
+def test_async_request_events():
+    calls = itertools.count()
+
+    def handler(_):
+        if next(calls) == 0:
+            return httpx.Response(503)
+        return httpx.Response(200, json={'data': [OrganizationFactory()]})
+
+    session = AsyncRetrySession(transport=httpx.MockTransport(handler),
+                                max_retries=1, backoff_factor=0.01)
+    client = AsyncClient(session, base_url='http://localhost.localdomain')
+    events = record(client.hooks)
+
+    async def main():
+        async with client:
+            return await client.organizations.collection()
+
+    assert len(asyncio.run(main())) == 1
+    assert [e.name for e in events] == [
+        REQUEST, RETRY, RESPONSE, BODY, LOADED]
+    assert events[2].status == 200
+    assert events[-1].timings.load > 0
+
+
+class FakeSpan:
+    def __init__(self, name, attributes=None, **kwargs):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.options = kwargs
+        self.events = []
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, name, value):
+        self.attributes[name] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def add_event(self, name, attributes=None):
+        self.events.append((name, attributes))
+
+    def record_exception(self, exc):
+        self.exceptions.append(exc)
+
+    def end(self):
+        self.ended = True
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, **kwargs):
+        span = FakeSpan(name, **kwargs)
+        self.spans.append(span)
+        return span
+
+
+@responses.activate
+def test_opentelemetry_spans(client):
+    url = f'{client.base_url}/v1/organizations'
+    responses.add(GET, url, json={'data': [OrganizationFactory()]})
+    responses.add(GET, url + '/0/settings', status=400, json={})
+
+    tracer = FakeTracer()
+    OpenTelemetryHooks(tracer).install(client.hooks)
+
+    client.organizations.collection()
+    with pytest.raises(exceptions.BadRequest):
+        client.get('/v1/organizations/0/settings')
+
+    request, load, failed = tracer.spans
+    assert all(span.ended for span in tracer.spans)
+
+    assert request.name == 'HTTP GET'
+    assert request.attributes['url.full'] == url
+    assert request.attributes['http.response.status_code'] == 200
+    assert request.attributes['airslate.timings.ttfb'] > 0
+
+    assert load.name == 'airslate.load'
+    assert load.attributes['airslate.timings.load'] > 0
+
+    assert failed.attributes['http.response.status_code'] == 400
+    assert failed.attributes['error.type'] == 'BadRequest'
+    assert len(failed.exceptions) == 1
+
+
+@responses.activate
+def test_streamed_request_ends_span(client):
+    url = f'{client.base_url}/v1/organizations'
+    body = json.dumps({'data': [OrganizationFactory()]})
+    responses.add(GET, url, body=body)
+
+    tracer = FakeTracer()
+    OpenTelemetryHooks(tracer).install(client.hooks)
+    events = record(client.hooks, (BODY,))
+
+    assert len(list(client.organizations.stream_collection())) == 1
+    assert [(s.name, s.ended) for s in tracer.spans] == [('HTTP GET', True)]
+    assert events[0].received == len(body)
+
+    # A streamed response closed before its body has been read
+    client.get('/v1/organizations', stream=True).close()
+    assert all(span.ended for span in tracer.spans)
+    assert len(events) == 2
+
+
+def test_async_streamed_request_events():
+    class Chunks(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b'{"data": '
+            yield b'[]}'
+
+    def handler(_):
+        return httpx.Response(200, stream=Chunks())
+
+    session = AsyncRetrySession(transport=httpx.MockTransport(handler))
+    client = AsyncClient(session, base_url='http://localhost.localdomain')
+    events = record(client.hooks)
+
+    async def main():
+        async with client:
+            response = await client.get('/v1/organizations', stream=True)
+            assert [e.name for e in events] == [REQUEST, RESPONSE]
+            return b''.join([chunk async for chunk in response.aiter_bytes()])
+
+    assert asyncio.run(main()) == b'{"data": []}'
+    assert [e.name for e in events] == [REQUEST, RESPONSE, BODY]
+    assert events[-1].received == len(b'{"data": []}')
+
+
+def test_opentelemetry_uninstall():
+    hooks = Hooks()
+    adapter = OpenTelemetryHooks(FakeTracer())
+
+    adapter.install(hooks)
+    assert hooks
+
+    adapter.uninstall(hooks)
+    assert not hooks
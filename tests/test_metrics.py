@@ -0,0 +1,143 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import pytest
+import responses
+from responses import GET, POST
+
+from airslate import exceptions
+from airslate.client import Client
+from airslate.hooks import RETRY, Event, Timings
+from airslate.metrics import Histogram, Metrics
+
+SETTINGS = '/v1/organizations/{org_id}/settings'
+
+
+def settings(org_id):
+    return {
+        'id': org_id,
+        'settings': {
+            'allow_recipient_registration': True,
+            'attach_completion_certificate': True,
+            'require_electronic_signature_consent': False,
+            'allow_reusable_flow': True,
+            'verified_domains': [],
+        }
+    }
+
+
+def test_histogram():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [(0.1, 1), (1.0, 2), (float('inf'), 3)]
+    assert histogram.count == 3
+    assert histogram.sum == pytest.approx(2.6)
+
+
+def test_disabled_by_default():
+    client = Client()
+
+    assert client.metrics is None
+    assert not client.hooks
+
+
+@responses.activate
+def test_metrics_per_endpoint_template():
+    client = Client(base_url='http://localhost.localdomain', metrics=True)
+    base_url = client.options['base_url']
+
+    for org_id in ('A', 'B', 'C'):
+        responses.add(GET, f'{base_url}/v1/organizations/{org_id}/settings',
+                      json=settings(org_id))
+        client.organizations.settings(org_id)
+
+    responses.add(GET, f'{base_url}/v1/organizations/D/settings',
+                  status=404, json={})
+    with pytest.raises(exceptions.NotFoundError):
+        client.organizations.settings('D')
+
+    responses.add(POST, f'{base_url}/v1/organizations', json={})
+    client.post('/v1/organizations', {'name': 'Acme'})
+
+    metrics = client.metrics
+    assert set(metrics.durations) == {
+        ('GET', SETTINGS),
+        ('POST', '/v1/organizations'),
+    }
+    assert metrics.durations[('GET', SETTINGS)].count == 4
+    assert metrics.responses == {
+        ('GET', SETTINGS, '200'): 3,
+        ('GET', SETTINGS, '404'): 1,
+        ('POST', '/v1/organizations', '200'): 1,
+    }
+    assert metrics.received[('GET', SETTINGS)] > 0
+    assert metrics.sent[('POST', '/v1/organizations')] == len(
+        '{"name": "Acme"}')
+
+    text = metrics.export()
+    assert '# TYPE airslate_request_duration_seconds histogram\n' in text
+    assert ('airslate_request_duration_seconds_count{method="GET",'
+            'endpoint="/v1/organizations/{org_id}/settings"} 4\n') in text
+    assert ('airslate_request_duration_seconds_bucket{method="GET",'
+            'endpoint="/v1/organizations/{org_id}/settings",le="+Inf"} 4\n'
+            ) in text
+    assert ('airslate_responses_total{method="GET",'
+            'endpoint="/v1/organizations/{org_id}/settings",status="404"} 1\n'
+            ) in text
+    assert 'airslate_retries_total' not in text
+
+    metrics.clear()
+    assert metrics.export() == ''
+
+
+@responses.activate
+def test_load_error_is_accounted_once():
+    client = Client(base_url='http://localhost.localdomain', metrics=True)
+    base_url = client.options['base_url']
+
+    responses.add(GET, f'{base_url}/v1/organizations', json={'meta': {}})
+    with pytest.raises(exceptions.MissingData):
+        client.organizations.collection()
+
+    metrics = client.metrics
+    labels = ('GET', '/v1/organizations')
+    assert metrics.durations[labels].count == 1
+    assert metrics.responses == {labels + ('200',): 1}
+    assert metrics.received[labels] == len('{"meta": {}}')
+
+
+def test_retries_and_connection_errors():
+    metrics = Metrics(prefix='api')
+
+    def event(name, status=None):
+        return Event(name=name, method='GET', url='http://localhost/v1/foo',
+                     timings=Timings(), endpoint='/v1/foo', status=status,
+                     elapsed=0.2)
+
+    metrics.on_retry(event(RETRY))
+    metrics.on_complete(event('error'))
+
+    assert metrics.retries == {('GET', '/v1/foo'): 1}
+    assert metrics.responses == {('GET', '/v1/foo', 'error'): 1}
+
+    text = metrics.export()
+    assert 'api_retries_total{method="GET",endpoint="/v1/foo"} 1\n' in text
+    assert 'api_request_duration_seconds_sum{method="GET",' in text
+
+
+def test_shared_between_clients():
+    metrics = Metrics()
+    first, second = Client(), Client()
+
+    metrics.install(first.hooks)
+    metrics.install(second.hooks)
+    assert first.hooks and second.hooks
+
+    metrics.uninstall(first.hooks)
+    assert not first.hooks
@@ -0,0 +1,128 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import time
+
+import pytest
+import responses
+from responses import GET
+
+from airslate import exceptions
+from airslate.client import Client
+from airslate.ratelimit import RateLimiter, create_rate_limiter, pacing
+from airslate.sessions import JitteredRetry
+
+
+def test_burst_then_pace():
+    limiter = RateLimiter(rate=10, burst=2)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+
+    # Requests waiting in parallel are spread over time
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+    stats = limiter.stats.to_dict()
+    assert stats['requests'] == 4
+    assert stats['delayed'] == 2
+    assert stats['wait_time'] == pytest.approx(0.3, abs=0.02)
+    assert stats['max_wait'] == pytest.approx(0.2, abs=0.01)
+
+
+def test_acquire_waits():
+    limiter = RateLimiter(rate=20, burst=1)
+    limiter.acquire()
+
+    started = time.monotonic()
+    waited = limiter.acquire()
+
+    assert waited > 0
+    assert time.monotonic() - started >= waited * 0.9
+
+
+def test_retry_after_pauses():
+    limiter = RateLimiter(rate=100)
+    limiter.update(429, {'Retry-After': '2'})
+
+    assert limiter.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+@pytest.mark.parametrize('headers', [
+    lambda: {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '3'},
+    lambda: {'RateLimit-Remaining': '0', 'RateLimit-Reset': '3'},
+    lambda: {'X-RateLimit-Remaining': '0',
+             'X-RateLimit-Reset': str(int(time.time()) + 3)},
+])
+def test_exhausted_limit_pauses(headers):
+    limiter = RateLimiter(rate=100)
+    limiter.update(200, headers())
+
+    assert 1.5 < limiter.reserve() <= 3.0
+
+
+def test_remaining_limits_burst():
+    limiter = RateLimiter(rate=10, burst=10)
+    limiter.update(200, {'X-RateLimit-Remaining': '1'})
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() > 0
+
+
+def test_create_rate_limiter():
+    assert create_rate_limiter({'rate_limit': None}) is None
+
+    limiter = create_rate_limiter({'rate_limit': 2.5,
+                                   'rate_limit_burst': None})
+    assert limiter.rate == 2.5
+    assert limiter.burst == 3
+
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+@responses.activate
+def test_client_rate_limit():
+    client = Client(base_url='http://localhost.localdomain', rate_limit=100)
+    responses.add(GET, 'http://localhost.localdomain/v1/organizations',
+                  status=200, json={},
+                  headers={'X-RateLimit-Remaining': '0',
+                           'X-RateLimit-Reset': '0.05'})
+
+    client.get('/v1/organizations')
+    client.get('/v1/organizations')
+
+    assert client.rate_limiter.stats.requests == 2
+    assert client.rate_limiter.stats.delayed == 1
+    assert client.rate_limiter.stats.wait_time > 0
+
+
+@responses.activate
+def test_client_rate_limit_retried_responses():
+    client = Client(base_url='http://localhost.localdomain', rate_limit=100,
+                    max_retries=2)
+    responses.add(GET, 'http://localhost.localdomain/v1/organizations',
+                  status=429, json={}, headers={'Retry-After': '5'})
+
+    with pytest.raises(exceptions.RetryApiError):
+        client.get('/v1/organizations')
+
+    # urllib3 has retried the 429 responses, the client has not seen them
+    assert len(responses.calls) == 3
+    assert client.rate_limiter._paused_until > time.monotonic() + 4
+
+
+def test_retries_are_paced():
+    limiter = RateLimiter(rate=100)
+    limiter.pause(0.05)
+
+    started = time.monotonic()
+    with pacing(limiter):
+        JitteredRetry(total=1).sleep()
+
+    assert time.monotonic() - started >= 0.04
+    assert limiter.stats.requests == 1
@@ -0,0 +1,105 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import pytest
+from marshmallow import ValidationError, fields, validate
+
+from airslate import schemas
+from airslate.models import Organization, OrganizationSettings
+from tests.resources.factories import OrganizationFactory
+
+SETTINGS = {
+    'allow_recipient_registration': True,
+    'attach_completion_certificate': False,
+    'require_electronic_signature_consent': True,
+    'allow_reusable_flow': False,
+    'verified_domains': ['airslate.com'],
+}
+
+
+def load_both(schema_cls, data):
+    """Load data by marshmallow and by the fast loader."""
+    results = []
+    for load in (schema_cls().load, schemas.get_loader(schema_cls).load):
+        try:
+            results.append(load(data))
+        except ValidationError as exc:
+            results.append(exc.messages)
+        except TypeError as exc:
+            results.append(str(exc))
+    return results
+
+
+def test_loader_is_cached():
+    loader = schemas.get_loader(schemas.OrganizationSchema)
+    assert loader is schemas.get_loader(schemas.OrganizationSchema)
+    assert loader.compiled
+
+
+@pytest.mark.parametrize('data', [
+    OrganizationFactory(),
+    OrganizationFactory(category=None, size=None),
+    OrganizationFactory(unknown_field='value'),
+    {k: v for k, v in OrganizationFactory().items() if k != 'size'},
+    {k: v for k, v in OrganizationFactory().items() if k != 'id'},
+    OrganizationFactory(id=None),
+    OrganizationFactory(id=42),
+    OrganizationFactory(name=b'bytes'),
+    [],
+    'string',
+])
+def test_organization_semantics(data):
+    expected, actual = load_both(schemas.OrganizationSchema, data)
+    assert actual == expected
+
+
+@pytest.mark.parametrize('data', [
+    {'id': 'org', 'settings': SETTINGS},
+    {'id': 'org', 'settings': dict(SETTINGS, allow_reusable_flow='true')},
+    {'id': 'org', 'settings': dict(SETTINGS, allow_reusable_flow='maybe')},
+    {'id': 'org', 'settings': dict(SETTINGS, verified_domains=('a', 'b'))},
+    {'id': 'org', 'settings': dict(SETTINGS, verified_domains=[1])},
+    {'id': 'org', 'settings': dict(SETTINGS, unknown_field=True)},
+    {'id': 'org', 'settings': None},
+    {'id': 'org', 'settings': SETTINGS, 'unknown_field': True},
+    {'id': 'org'},
+])
+def test_settings_semantics(data):
+    expected, actual = load_both(schemas.OrganizationSettingSchema, data)
+    assert actual == expected
+
+
+def test_load_many():
+    items = [OrganizationFactory(id=str(i)) for i in range(3)]
+    loader = schemas.get_loader(schemas.OrganizationSchema)
+
+    organizations = loader.load_many(items)
+
+    assert all(isinstance(o, Organization) for o in organizations)
+    assert [o.id for o in organizations] == ['0', '1', '2']
+    assert organizations == [schemas.OrganizationSchema().load(i)
+                             for i in items]
+
+
+def test_nested_model():
+    loader = schemas.get_loader(schemas.OrganizationSettingSchema)
+    settings = loader.load({'id': 'org', 'settings': SETTINGS})
+
+    assert isinstance(settings, OrganizationSettings)
+    assert settings.to_dict() == {'id': 'org', 'settings': SETTINGS}
+
+
+def test_unsupported_schema_uses_marshmallow():
+    class ValidatedSchema(schemas.OrganizationSchema):
+        name = fields.Str(required=True, validate=validate.Length(max=3))
+
+    loader = schemas.get_loader(ValidatedSchema)
+    assert not loader.compiled
+
+    with pytest.raises(ValidationError):
+        loader.load(OrganizationFactory(name='Acme, Inc.'))
+    assert loader.load(OrganizationFactory(name='Acm')).name == 'Acm'
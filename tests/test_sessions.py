@@ -5,15 +5,22 @@
 # For the full copyright and license information, please view
 # the LICENSE file that was distributed with this source code.
 
+import pickle
+import threading
+import time
+
 import pytest
 import responses
 from requests.adapters import HTTPAdapter
 from requests.models import Response
-from responses import POST
+from responses import GET, POST
+from urllib3.exceptions import MaxRetryError
 from urllib3.util.retry import Retry
 
 from airslate import sessions
+from airslate.client import Client
 from airslate.exceptions import ApiError
+from airslate.tokens import FileTokenStore, MemoryTokenStore
 
 
 def test_retry_default_params():
@@ -37,6 +44,49 @@ def test_retry_default_params():
     assert retry.backoff_factor == 1.0
 
 
+def test_retry_methods_param_is_probed_once(mocker):
+    sessions.retry_methods_param.cache_clear()
+    probe = mocker.spy(sessions, 'Retry')
+
+    first = sessions.RetryMixin().create_retry()
+    second = sessions.RetryMixin().create_retry()
+
+    assert probe.call_count == 1
+    assert first.allowed_methods == second.allowed_methods
+
+
+def test_pooling_adapter_reap_idle(mocker):
+    adapter = sessions.PoolingAdapter(idle_timeout=10.0)
+    clear = mocker.spy(adapter.poolmanager, 'clear')
+
+    assert adapter.reap_idle() is False
+
+    adapter.last_used -= 11.0
+    assert adapter.reap_idle() is True
+    clear.assert_called_once_with()
+
+
+def test_pooling_adapter_never_reap():
+    adapter = sessions.PoolingAdapter()
+    adapter.last_used -= 3600.0
+
+    assert adapter.reap_idle() is False
+
+
+def test_retry_session_pool_params():
+    session = sessions.RetrySession(
+        pool_connections=4,
+        pool_maxsize=16,
+        pool_idle_timeout=30.0,
+    )
+
+    adapter = session.adapters['https://']  # type: sessions.PoolingAdapter
+    assert adapter is session.adapters['http://']
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 16
+    assert adapter.idle_timeout == 30.0
+
+
 def test_jwt_default_params(monkeypatch, private_key):
     def get_token(*_args):
         return {'access_token': 'abc', 'expires_in': 123}
@@ -57,6 +107,7 @@ def test_jwt_default_params(monkeypatch, private_key):
     assert isinstance(session.adapters['http://'], HTTPAdapter)
     assert isinstance(session.adapters['https://'], HTTPAdapter)
     assert session.adapters['http://'] == session.adapters['https://']
+    assert session.auth.adapters['https://'] == session.adapters['https://']
 
     adapter = session.adapters['http://']  # type: HTTPAdapter
     assert isinstance(adapter.max_retries, Retry)
@@ -158,3 +209,254 @@ def test_exception_when_get_token(private_key):
 
     assert 'Max retries exceeded with url:' in str(exc_info.value)
     assert 503 == exc_info.value.status
+
+
+def create_jwt_session(private_key, **kwargs):
+    return sessions.JWTSession(
+        client_id='00000000-0000-0000-0000-000000000000',
+        user_id='11111111-1111-1111-1111-111111111111',
+        key=private_key,
+        **kwargs,
+    )
+
+
+def test_load_signing_key(private_key):
+    key = sessions.load_signing_key(private_key)
+    assert sessions.load_signing_key(private_key) is key
+
+
+def test_jwt_concurrent_renewal(monkeypatch, private_key):
+    calls = []
+
+    def get_token(*_args):
+        calls.append(1)
+        time.sleep(0.05)
+        return {'access_token': f'token{len(calls)}', 'expires_in': 3600}
+
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', get_token)
+    session = create_jwt_session(private_key)
+    assert not session.token_expired()
+
+    session.token_refresh_at = time.time() - 1
+    threads = [threading.Thread(target=session.ensure_token)
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 2
+    assert session.auth.token['access_token'] == 'token2'
+
+
+def test_jwt_refresh_ahead(monkeypatch, private_key):
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', lambda *_: {
+        'access_token': 'abc', 'expires_in': 3600})
+
+    session = create_jwt_session(private_key, refresh_ahead=120.0)
+    assert 3470 < session.token_refresh_at - time.time() <= 3480
+
+    session.update_token({'access_token': 'abc', 'expires_in': 100})
+    assert 40 < session.token_refresh_at - time.time() <= 50
+
+
+@pytest.mark.parametrize('store_factory', [
+    lambda tmp_path: MemoryTokenStore(),
+    lambda tmp_path: FileTokenStore(str(tmp_path)),
+])
+def test_jwt_token_store(monkeypatch, private_key, tmp_path, store_factory):
+    calls = []
+
+    def get_token(*_args):
+        calls.append(1)
+        return {'access_token': f'token{len(calls)}', 'expires_in': 3600}
+
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', get_token)
+    store = store_factory(tmp_path)
+
+    first = create_jwt_session(private_key, token_store=store)
+    second = create_jwt_session(private_key, token_store=store)
+
+    assert len(calls) == 1
+    assert second.auth.token == first.auth.token
+    assert second.token_refresh_at == first.token_refresh_at
+
+    # The token renewed by one session is picked up by the other one
+    key = first.token_key()
+    store.save(key, dict(store.load(key), expires_at=time.time()))
+    first.token_refresh_at = time.time() - 1
+    first.ensure_token()
+    second.token_refresh_at = time.time() - 1
+    second.ensure_token()
+
+    assert len(calls) == 2
+    assert second.auth.token == {'access_token': 'token2', 'expires_in': 3600}
+
+
+@responses.activate
+def test_jwt_renewal_before_request(monkeypatch, private_key):
+    tokens = iter(['first', 'second'])
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', lambda *_: {
+        'access_token': next(tokens), 'expires_in': 3600})
+
+    url = 'https://api.airslate.io/v1/organizations'
+    responses.add(GET, url, status=200, json={'data': []})
+
+    client = Client(create_jwt_session(private_key))
+    client.session.token_refresh_at = time.time() - 1
+    client.get('/v1/organizations')
+
+    assert responses.calls[0].request.headers['Authorization'] == (
+        'Bearer second')
+
+
+def test_jwt_background_refresh(monkeypatch, private_key):
+    renewed = threading.Event()
+    calls = []
+
+    def get_token(*_args):
+        calls.append(1)
+        if len(calls) > 1:
+            renewed.set()
+        return {'access_token': 'abc', 'expires_in': 0.2}
+
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', get_token)
+
+    session = create_jwt_session(private_key, background_refresh=True)
+    try:
+        assert renewed.wait(5.0)
+    finally:
+        session.close()
+
+    session.refresher.join(5.0)
+    assert not session.refresher.is_alive()
+
+
+def test_jwt_background_refresh_survives_errors(monkeypatch, private_key):
+    renewed = threading.Event()
+    failures = []
+
+    class FailingStore(MemoryTokenStore):
+        def save(self, key, record):
+            # Fail the first two renewals made by the background thread
+            if threading.current_thread().name.endswith('refresher'):
+                if len(failures) < 2:
+                    failures.append(1)
+                    raise OSError('No space left on device')
+                renewed.set()
+            super().save(key, record)
+
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', lambda *_: {
+        'access_token': 'abc', 'expires_in': 0.2})
+    monkeypatch.setattr(sessions.TokenRefresher, 'RETRY_DELAY', 0.01)
+
+    session = create_jwt_session(private_key, background_refresh=True,
+                                 token_store=FailingStore())
+    try:
+        assert renewed.wait(5.0)
+    finally:
+        session.close()
+
+    assert len(failures) == 2
+
+
+def test_jwt_session_pickle(monkeypatch, private_key):
+    calls = []
+
+    def get_token(*_args):
+        calls.append(1)
+        return {'access_token': 'abc', 'expires_in': 3600}
+
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', get_token)
+    session = create_jwt_session(private_key, max_retries=5)
+
+    copy = pickle.loads(pickle.dumps(session))
+
+    assert len(calls) == 1
+    assert copy.auth.token == session.auth.token
+    assert copy.token_refresh_at == session.token_refresh_at
+    assert copy.key == private_key
+    assert copy.adapters['https://'].max_retries.total == 5
+    assert copy.auth.adapters['https://'] is copy.adapters['https://']
+    assert copy.refresher is None
+
+
+def test_reset_after_fork(monkeypatch, private_key):
+    monkeypatch.setattr(sessions.JWTSession, 'get_token', lambda *_: {
+        'access_token': 'abc', 'expires_in': 3600})
+    session = create_jwt_session(private_key, pool_maxsize=16)
+    adapter = session.adapters['https://']
+    poolmanager = adapter.poolmanager
+    token_lock = session._token_lock
+
+    sessions.reset_after_fork(session)
+
+    assert session.adapters['https://'] is adapter
+    assert adapter.poolmanager is not poolmanager
+    assert adapter._pool_maxsize == 16
+    assert session._token_lock is not token_lock
+
+
+def test_token_store_pickle(tmp_path):
+    store = FileTokenStore(str(tmp_path))
+    store.save('key', {'access_token': 'abc'})
+
+    copy = pickle.loads(pickle.dumps(store))
+
+    assert copy.load('key') == {'access_token': 'abc'}
+
+
+def test_jittered_backoff():
+    retry = sessions.RetryMixin().create_retry(max_retries=5)
+    assert isinstance(retry, sessions.JitteredRetry)
+    assert retry.get_backoff_time() == 0
+
+    retry = retry.increment('GET', '/')
+    assert 0 <= retry.get_backoff_time() <= 1.0
+
+    for _ in range(4):
+        previous = retry.get_backoff_time()
+        retry = retry.increment('GET', '/')
+        assert 1.0 <= retry.get_backoff_time() <= max(1.0, previous * 3)
+
+
+def test_retry_budget():
+    budget = sessions.RetryBudget(ratio=0.5, min_retries=1)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    for _ in range(4):
+        budget.deposit()
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_retry_budget_window():
+    budget = sessions.RetryBudget(ratio=0, min_retries=1, window=0.05)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    # Retries older than the window no longer count
+    time.sleep(0.06)
+    assert budget.withdraw()
+
+
+def test_retry_budget_exhausted():
+    budget = sessions.RetryBudget(ratio=0, min_retries=0)
+    retry = sessions.RetryMixin().create_retry(budget=budget)
+
+    with pytest.raises(MaxRetryError) as exc_info:
+        retry.increment('GET', '/')
+
+    assert isinstance(exc_info.value.reason, sessions.RetryBudgetExhausted)
+
+
+def test_retry_budget_is_shared():
+    session = sessions.RetrySession(retry_budget=0.1)
+    budget = session.adapters['https://'].max_retries.budget
+
+    assert isinstance(budget, sessions.RetryBudget)
+    assert budget.ratio == 0.1
+    assert session.adapters['http://'].max_retries.budget is budget
@@ -0,0 +1,74 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import json
+
+import pytest
+
+from airslate.exceptions import MissingData
+from airslate.streaming import iter_data
+
+
+def split(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+DOCUMENT = {
+    'meta': {'total': 3, 'tags': ['a', {'b': [1, 2.5, None]}]},
+    'data': [
+        {'id': 'A', 'name': 'Acme, Inc. ☃', 'size': 12345},
+        {'id': 'B', 'name': '"quoted" [brackets] {braces}', 'size': -1e3},
+        {'id': 'C', 'active': True, 'category': None},
+    ],
+    'links': {'next': None},
+}
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 4096])
+def test_iter_data_chunks(size):
+    body = json.dumps(DOCUMENT, indent=2, ensure_ascii=False).encode()
+    assert list(iter_data(split(body, size))) == DOCUMENT['data']
+
+
+def test_iter_data_numbers_across_chunks():
+    chunks = [b'{"data": [1', b'23, 4', b'5.6', b'7]}']
+    assert list(iter_data(chunks)) == [123, 45.67]
+
+
+def test_iter_data_is_lazy():
+    def chunks():
+        yield b'{"data": [{"id": 1}, '
+        raise AssertionError('Read too far')
+
+    items = iter_data(chunks())
+    assert next(items) == {'id': 1}
+
+
+@pytest.mark.parametrize('body', [
+    b'{}',
+    b'{"meta": {}}',
+    b' { "meta" : [1, 2, 3] } ',
+])
+def test_iter_data_missing(body):
+    with pytest.raises(MissingData):
+        list(iter_data([body]))
+
+
+@pytest.mark.parametrize('body', [
+    b'',
+    b'[]',
+    b'{"data": {}}',
+    b'{"data": [1, 2',
+    b'{"data": [1 2]}',
+])
+def test_iter_data_invalid(body):
+    with pytest.raises(ValueError):
+        list(iter_data([body]))
+
+
+def test_iter_data_empty():
+    assert list(iter_data([b'{"data": []}'])) == []
@@ -0,0 +1,82 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+"""Stress tests of a Client shared by many threads."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from airslate.client import Client
+
+THREADS = 64
+REQUESTS_PER_THREAD = 10
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Reply with the request headers."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = json.dumps(dict(self.headers)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_shared_client(echo_server):
+    client = Client(base_url=echo_server, pool_maxsize=THREADS)
+    client.headers['X-Client'] = 'shared'
+
+    def work(worker):
+        leaks = []
+        for i in range(REQUESTS_PER_THREAD):
+            request_id = f'{worker}-{i}'
+            headers = {'X-Request-Id': request_id}
+            if i % 2:
+                headers[f'X-Worker-{worker}'] = 'yes'
+
+            echoed = client.get('/v1/echo', headers=headers).json()
+
+            if echoed.get('X-Request-Id') != request_id:
+                leaks.append(echoed)
+            if echoed.get('X-Client') != 'shared':
+                leaks.append(echoed)
+
+            # Headers of other calls never show up
+            extra = {k for k in echoed if k.startswith('X-Worker-')}
+            if extra - ({f'X-Worker-{worker}'} if i % 2 else set()):
+                leaks.append(echoed)
+        return leaks
+
+    with client, ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(work, range(THREADS)))
+
+    assert [leak for leaks in results for leak in leaks] == []
+    assert dict(client.session.headers) == dict(Client().session.headers)
@@ -0,0 +1,52 @@
+# This file is part of the airslate.
+#
+# Copyright (c) 2021-2023 airSlate, Inc.
+#
+# For the full copyright and license information, please view
+# the LICENSE file that was distributed with this source code.
+
+import os
+import stat
+
+import pytest
+
+from airslate.tokens import FileTokenStore, MemoryTokenStore, TokenStore
+
+
+def test_memory_token_store():
+    store = MemoryTokenStore()
+    assert store.load('key') is None
+
+    with store.lock('key'):
+        store.save('key', {'token': {'access_token': 'abc'}})
+
+    assert store.load('key') == {'token': {'access_token': 'abc'}}
+
+
+def test_file_token_store(tmp_path):
+    directory = str(tmp_path / 'tokens')
+    record = {'token': {'access_token': 'abc'}, 'expires_at': 123.0}
+
+    store = FileTokenStore(directory)
+    assert store.load('key') is None
+
+    with store.lock('key'):
+        store.save('key', record)
+
+    # Records are shared by stores using the same directory
+    assert FileTokenStore(directory).load('key') == record
+    assert FileTokenStore(directory).load('other') is None
+
+    for name in os.listdir(directory):
+        if name.endswith('.json'):
+            mode = os.stat(os.path.join(directory, name)).st_mode
+            assert stat.S_IMODE(mode) == 0o600
+
+
+def test_incomplete_token_store():
+    class IncompleteStore(TokenStore):
+        def load(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteStore()